@@ -0,0 +1,7 @@
+"""
+Benchmarks for the main loop variants, run on the simulated board.
+
+    python -m benchmarks.run [-k PATTERN] [--compare [REVISION]]
+
+See benchmarks/run.py.
+"""
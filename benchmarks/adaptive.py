@@ -0,0 +1,127 @@
+"""
+Adaptive Sampling Benchmark
+===========================
+
+Six hours of a simulated room: flat temperature and humidity with sensor
+noise, a heater ramp (+3 C in 5 minutes) and a door opening (+10 %RH in
+20 s, back over 10 minutes). The fixed 5 s loop is compared with
+loopkit.adaptive.AdaptiveSampler (deadband 0.1 C / 0.5 %RH), read every
+1..5 s ("adaptive", the default bound) and every 1..30 s ("relaxed",
+fewer reads but a transient can go unseen for 30 s). Each variant runs
+PHASES times with the transients shifted across one fixed interval, so
+the worst case does not depend on where the reads happen to fall.
+
+    reads_per_hour_*        sensor reads
+    stored_per_hour_*       samples passed downstream (storage/publish)
+    temp_error_c_*          |true temperature - last stored value|,
+                            checked every CHECK_STEP s (p99 and max, all
+                            phases; a whole-second grid would only look
+                            right at the fixed loop's reads)
+    humidity_error_max_*    same for humidity (%RH, max over all phases)
+    humidity_error_excess_adaptive
+                            humidity_error_max_adaptive minus the fixed
+                            loop's (budget: 0, never worse)
+"""
+
+import math
+import random
+
+from loopkit.adaptive import AdaptiveSampler
+
+from .harness import benchmark, budget, percentile
+
+
+DURATION = 6 * 3600.0
+FIXED_INTERVAL = 5.0
+NOISE = (0.02, 0.1)  # C, %RH standard deviation
+HEATER_AT = 2 * 3600.0
+DOOR_AT = 4 * 3600.0
+SEED = 23
+PHASES = 5
+CHECK_STEP = 0.25
+MAX_INTERVAL = {"adaptive": None, "relaxed": 30.0}  # None: the 5 s start interval
+
+budget("sensor.adaptive", "humidity_error_excess_adaptive", 0.0)
+
+
+def truth(t):
+    """Noise-free (temperature, humidity) at t."""
+    temperature = 21.5 + 3.0 * min(max((t - HEATER_AT) / 300.0, 0.0), 1.0)
+    humidity = 42.0
+    if t >= DOOR_AT:
+        rise = min((t - DOOR_AT) / 20.0, 1.0)
+        decay = math.exp(-max(t - DOOR_AT - 20.0, 0.0) / 600.0)
+        humidity += 10.0 * rise * decay
+    return temperature, humidity
+
+
+def tracking_errors(stored, phase):
+    """Errors of a sample-and-hold of the stored samples, every CHECK_STEP."""
+    temp_errors, humidity_errors = [], []
+    index = 0
+    for step in range(int(stored[0][0] / CHECK_STEP) + 1, int(DURATION / CHECK_STEP)):
+        t = step * CHECK_STEP
+        while index + 1 < len(stored) and stored[index + 1][0] <= t:
+            index += 1
+        temperature, humidity = truth(t + phase)
+        held = stored[index][1]
+        temp_errors.append(abs(temperature - held[0]))
+        humidity_errors.append(abs(humidity - held[1]))
+    return temp_errors, humidity_errors
+
+
+def run(label, rng, phase):
+    """(reads, stored samples, temperature errors, humidity errors)."""
+    now = 0.0
+    stored = []
+
+    def read():
+        temperature, humidity = truth(now + phase)
+        return temperature + rng.gauss(0, NOISE[0]), humidity + rng.gauss(0, NOISE[1])
+
+    reads = 0
+    if label == "fixed":
+        while now < DURATION:
+            now += FIXED_INTERVAL
+            stored.append((now, read()))
+            reads += 1
+    else:
+        sampler = AdaptiveSampler(read, min_interval=1.0, interval=FIXED_INTERVAL,
+                                  max_interval=MAX_INTERVAL[label],
+                                  deadband=(0.1, 0.5), clock=lambda: now)
+        while True:
+            now = sampler.deadline
+            if now >= DURATION:
+                break
+            values = sampler.sample(now)
+            if values is not None:
+                stored.append((now, values))
+        reads = sampler.reads
+
+    return (reads, len(stored)) + tracking_errors(stored, phase)
+
+
+@benchmark("sensor.adaptive")
+def adaptive_sampling():
+    results = {}
+    hours = PHASES * DURATION / 3600
+    for label in ("fixed", "adaptive", "relaxed"):
+        reads = stored = 0
+        temp_errors, humidity_errors = [], []
+        for k in range(PHASES):
+            runs = run(label, random.Random(SEED + k), k * FIXED_INTERVAL / PHASES)
+            reads += runs[0]
+            stored += runs[1]
+            temp_errors += runs[2]
+            humidity_errors += runs[3]
+        results.update({
+            f"reads_per_hour_{label}": reads / hours,
+            f"stored_per_hour_{label}": stored / hours,
+            f"temp_error_c_p99_{label}": percentile(temp_errors, 99),
+            f"temp_error_c_max_{label}": max(temp_errors),
+            f"humidity_error_max_{label}": max(humidity_errors),
+        })
+    results["humidity_error_excess_adaptive"] = (
+        results["humidity_error_max_adaptive"] - results["humidity_error_max_fixed"]
+    )
+    return results
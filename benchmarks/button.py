@@ -0,0 +1,111 @@
+"""
+Button State Machine Benchmark
+==============================
+
+Feeds loopkit.button.ButtonMachine with samples of a bouncing simulated
+pin (PinTimeline with bounce) and checks the events against the script:
+
+    spurious_presses        PRESS events beyond the scripted presses
+    naive_spurious_presses  same for the README two-sample comparison
+    press_latency_*         contact -> PRESS (ms)
+    long_hold_error_ms      |LONG_HOLD - (contact + bounce + hold_time)|
+    missed_double_clicks    scripted double clicks not reported
+    update_us               CPU time of one update() call
+"""
+
+import random
+import time
+
+from loopkit.button import DOUBLE_CLICK, LONG_HOLD, PRESS, ButtonMachine
+from loopkit.sim import PinTimeline
+
+from .harness import benchmark, distribution
+
+
+SAMPLE_PERIOD = 0.005
+BOUNCE = 0.008
+GESTURES = 200
+SEED = 17
+
+
+def script(rng):
+    """Timeline of single clicks, double clicks and long holds."""
+    timeline = PinTimeline()
+    presses, doubles, holds = [], [], []
+    t = 1.0
+    for _ in range(GESTURES):
+        kind = rng.choice(("click", "double", "hold"))
+        if kind == "hold":
+            timeline.press(t, 2.5, bounce=BOUNCE)
+            holds.append(t)
+            presses.append(t)
+            t += 4.0
+        else:
+            timeline.press(t, rng.uniform(0.06, 0.15), bounce=BOUNCE)
+            presses.append(t)
+            if kind == "double":
+                second = t + 0.22
+                timeline.press(second, rng.uniform(0.06, 0.12), bounce=BOUNCE)
+                presses.append(second)
+                doubles.append(t)
+            t += 1.5
+    return timeline, presses, doubles, holds, t
+
+
+@benchmark("button.machine", tolerances={"update_us": 0.5})
+def button_machine():
+    rng = random.Random(SEED)
+    timeline, presses, doubles, holds, end = script(rng)
+    machine = ButtonMachine()
+
+    samples = []
+    t = rng.uniform(0, SAMPLE_PERIOD)
+    while t < end:
+        samples.append((t, timeline.value_at(t)))
+        t += SAMPLE_PERIOD * rng.uniform(0.9, 1.1)
+
+    events = []
+    start = time.perf_counter()
+    for t, value in samples:
+        mask = machine.update(value, t)
+        if mask:
+            events.append((t, mask))
+    update_time = (time.perf_counter() - start) / len(samples)
+
+    naive, last = 0, True
+    for _, value in samples:
+        if last and not value:
+            naive += 1
+        last = value
+
+    press_times = [t for t, mask in events if mask & PRESS]
+    latencies = []
+    for contact in presses:
+        after = [t for t in press_times if contact <= t < contact + 0.2]
+        if after:
+            latencies.append(after[0] - contact)
+
+    hold_events = [t for t, mask in events if mask & LONG_HOLD]
+    hold_errors = []
+    for contact in holds:
+        expected = contact + BOUNCE + machine.hold_time
+        near = [t for t in hold_events if abs(t - expected) < 0.5]
+        if near:
+            hold_errors.append(abs(near[0] - expected))
+
+    double_events = [t for t, mask in events if mask & DOUBLE_CLICK]
+    missed_doubles = sum(
+        1 for first in doubles if not any(first < t < first + 0.6 for t in double_events)
+    )
+
+    metrics = distribution("press_latency", latencies)
+    metrics.update({
+        "spurious_presses": len(press_times) - len(latencies),
+        "naive_spurious_presses": naive - len(presses),
+        "missed_presses": len(presses) - len(latencies),
+        "long_hold_error_ms": max(hold_errors) * 1000 if hold_errors else None,
+        "missed_long_holds": len(holds) - len(hold_errors),
+        "missed_double_clicks": missed_doubles,
+        "update_us": update_time * 1e6,
+    })
+    return metrics
@@ -0,0 +1,172 @@
+"""
+Benchmark Registry and Result Store
+===================================
+
+A benchmark is a function returning a flat dict of metrics. Every metric
+is "lower is better" (latencies, errors, CPU time, missed presses), so
+comparing two runs only needs a tolerance for the metrics measured in
+real (noisy) time, declared with the benchmark:
+
+    @benchmark("loop.reference", tolerances={"cpu_ms_per_hour": 0.5})
+
+A tolerance is the smallest relative change counted as a regression for
+that metric; a key also covers the p50/p90/p99/max metrics of a
+distribution() with that prefix.
+
+Results are stored as .benchmarks/<git revision>.json and compared
+against an earlier run to catch regressions between commits. A budget
+puts a fixed upper limit on one metric.
+"""
+
+import json
+import math
+import subprocess
+import time
+from pathlib import Path
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+RESULTS_DIR = REPO_ROOT / ".benchmarks"
+
+# Differences smaller than this are noise whatever the relative change.
+ABSOLUTE_TOLERANCE = 1e-3
+
+BENCHMARKS = {}
+BUDGETS = {}
+TOLERANCES = {}  # benchmark name -> {metric or distribution prefix: relative tolerance}
+
+
+def benchmark(name, tolerances=None):
+    """Register func as benchmark name, with per-metric relative tolerances."""
+    def register(func):
+        BENCHMARKS[name] = func
+        TOLERANCES[name] = dict(tolerances or {})
+        return func
+    return register
+
+
+def tolerance(name, metric):
+    """Relative tolerance of metric of benchmark name (0.0 when none)."""
+    tolerances = TOLERANCES.get(name, {})
+    if metric in tolerances:
+        return tolerances[metric]
+    prefix, _, suffix = metric.rpartition("_")
+    if suffix in ("p50", "p90", "p99", "max"):
+        return tolerances.get(prefix, 0.0)
+    return 0.0
+
+
+def budget(name, metric, limit):
+    """Fail the run when metric of benchmark name exceeds limit."""
+    BUDGETS[(name, metric)] = limit
+
+
+def over_budget(results):
+    """(benchmark, metric, value, limit) for every exceeded budget."""
+    exceeded = []
+    for (name, metric), limit in BUDGETS.items():
+        value = results.get(name, {}).get(metric)
+        if value is not None and value > limit:
+            exceeded.append((name, metric, value, limit))
+    return exceeded
+
+
+# ---------------------------------------------------------------------------
+# Statistics
+# ---------------------------------------------------------------------------
+def percentile(values, p):
+    """Nearest-rank percentile of values (None when empty)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(p / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def distribution(prefix, values, scale=1000.0):
+    """p50/p90/p99/max of values, scaled (seconds -> ms by default)."""
+    return {
+        f"{prefix}_{name}": None if value is None else value * scale
+        for name, value in (
+            ("p50", percentile(values, 50)),
+            ("p90", percentile(values, 90)),
+            ("p99", percentile(values, 99)),
+            ("max", max(values) if values else None),
+        )
+    }
+
+
+def cpu_time(func, repeat=5):
+    """Smallest process CPU time of repeat calls, with the last result."""
+    best, result = None, None
+    for _ in range(repeat):
+        start = time.process_time()
+        result = func()
+        elapsed = time.process_time() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+# ---------------------------------------------------------------------------
+# Storage
+# ---------------------------------------------------------------------------
+def git_revision(root=REPO_ROOT):
+    """Short hash of HEAD, suffixed with -dirty when the tree has changes."""
+    try:
+        revision = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=root,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], cwd=root,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return f"{revision}-dirty" if dirty else revision
+
+
+def save(results, revision, directory=RESULTS_DIR):
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{revision}.json"
+    record = {"revision": revision, "created": time.time(), "results": results}
+    path.write_text(json.dumps(record, indent=2, sort_keys=True) + "\n")
+    return path
+
+
+def load(revision=None, directory=RESULTS_DIR, exclude=None):
+    """
+    Stored record for revision, or the most recent one (other than
+    exclude) when revision is None. Returns None when there is none.
+    """
+    directory = Path(directory)
+    if revision is not None:
+        path = directory / f"{revision}.json"
+        return json.loads(path.read_text()) if path.exists() else None
+
+    records = []
+    for path in directory.glob("*.json"):
+        record = json.loads(path.read_text())
+        if record.get("revision") != exclude:
+            records.append(record)
+    return max(records, key=lambda r: r.get("created", 0), default=None)
+
+
+def compare(current, baseline, threshold):
+    """
+    (benchmark, metric, old, new) for every metric that got worse by more
+    than threshold (relative, at least the metric's tolerance) and
+    ABSOLUTE_TOLERANCE.
+    """
+    regressions = []
+    for name, metrics in current.items():
+        old_metrics = baseline.get(name, {})
+        for metric, new in metrics.items():
+            old = old_metrics.get(metric)
+            if old is None or new is None:
+                continue
+            limit = max(threshold, tolerance(name, metric))
+            if new - old > max(abs(old) * limit, ABSOLUTE_TOLERANCE):
+                regressions.append((name, metric, old, new))
+    return regressions
@@ -0,0 +1,67 @@
+"""
+Input Group Benchmark
+=====================
+
+Polls a 16-button panel on the simulated board every 50 ms through the
+per-pin digitalio backend and the one-call bulk backend of
+loopkit.inputs, and checks that both see the same masks.
+
+    reads_per_poll_*        GPIO reads per poll
+    poll_us_*               CPU time of one poll()
+    mask_mismatches         polls where the two backends disagree
+
+Both backends run on simulated pins (the bulk one on SimLines), so
+reads_per_poll and poll_us show the Python-side cost of each backend,
+not GPIO access times on a Pi. GpiodLines itself is covered by
+loopkit/tests/test_inputs.py against a stand-in libgpiod.
+"""
+
+import random
+import time
+
+from loopkit.inputs import DigitalioPins, InputGroup
+from loopkit.sim import PinTimeline, SimHardware, SimLines, simulate
+
+from .harness import benchmark
+
+
+LINES = (4, 5, 6, 12, 13, 16, 17, 18, 19, 20, 21, 22, 23, 24, 25, 26)
+POLL_PERIOD = 0.05
+DURATION = 600.0
+SEED = 18
+
+
+@benchmark("inputs.group16", tolerances={"poll_us_digitalio": 0.5, "poll_us_bulk": 0.5})
+def input_group():
+    rng = random.Random(SEED)
+    hw = SimHardware()
+    for line in LINES:
+        timeline = hw.pins.setdefault(line, PinTimeline())
+        for _ in range(40):
+            timeline.press(rng.uniform(0, DURATION), rng.uniform(0.05, 1.0))
+
+    with simulate(hw):
+        pins = DigitalioPins(LINES)
+        per_pin = InputGroup(pins, len(LINES))
+        bulk = InputGroup(SimLines(hw, LINES), len(LINES))
+
+        polls, mismatches = 0, 0
+        per_pin_time = bulk_time = 0.0
+        while hw.clock.now < DURATION:
+            start = time.perf_counter()
+            per_pin.poll()
+            middle = time.perf_counter()
+            bulk.poll()
+            bulk_time += time.perf_counter() - middle
+            per_pin_time += middle - start
+            mismatches += per_pin.state != bulk.state
+            polls += 1
+            hw.clock.advance(POLL_PERIOD)
+
+    return {
+        "reads_per_poll_digitalio": sum(io.reads for io in pins.pins) / polls,
+        "reads_per_poll_bulk": bulk.backend.reads / polls,
+        "poll_us_digitalio": per_pin_time / polls * 1e6,
+        "poll_us_bulk": bulk_time / polls * 1e6,
+        "mask_mismatches": mismatches,
+    }
@@ -0,0 +1,93 @@
+"""
+Logging Benchmark
+=================
+
+Ten simulated minutes of loop events written to a slow console (each
+write() call blocks WRITE_LATENCY, like a serial console or a busy
+journald): a button press every PRESS_PERIOD seconds and, with the
+sensor unplugged, an "Erreur lecture" every SENSOR_INTERVAL seconds.
+
+    print       print() in the loop, as the reference program does
+    logger      loopkit.log.Logger: log() in the loop, drain() before it
+                sleeps (as loopkit.scheduled and loopkit.aio do)
+
+    hot_us_*_p50/p99/max    real time the loop spends per event, drain()
+                            included
+    lines_*                 lines written to the console
+
+print() makes two write() calls per line (text, then newline). drain()
+writes its lines in one call, and the rate limit keeps most repeated
+errors off the console.
+"""
+
+import io
+import time
+
+from loopkit.log import Logger
+
+from .harness import benchmark, distribution
+
+
+DURATION = 600.0
+PRESS_PERIOD = 7.0
+SENSOR_INTERVAL = 5.0
+WRITE_LATENCY = 0.001
+
+
+class SlowConsole(io.TextIOBase):
+    """Text stream whose every write() blocks WRITE_LATENCY seconds."""
+
+    def __init__(self):
+        self.lines = 0
+
+    def write(self, text):
+        time.sleep(WRITE_LATENCY)
+        self.lines += text.count("\n")
+        return len(text)
+
+
+def events():
+    """(virtual time, kind) of every event, in order."""
+    timeline = [(k * PRESS_PERIOD, "press") for k in range(1, int(DURATION / PRESS_PERIOD) + 1)]
+    timeline += [(k * SENSOR_INTERVAL, "error") for k in range(1, int(DURATION / SENSOR_INTERVAL) + 1)]
+    return sorted(timeline)
+
+
+def run_print(console):
+    hot = []
+    for _, kind in events():
+        start = time.perf_counter()
+        if kind == "press":
+            print("Bouton appuye!", file=console)
+        else:
+            print("Erreur lecture: [Errno 121] Remote I/O error", file=console)
+        hot.append(time.perf_counter() - start)
+    return hot
+
+
+def run_logger(console):
+    now = 0.0
+    log = Logger(stream=console, clock=lambda: now, wall_clock=lambda: 0.0)
+    error = OSError(121, "Remote I/O error")
+    hot = []
+    for now, kind in events():
+        start = time.perf_counter()
+        if kind == "press":
+            log.info("Bouton appuye!")
+        else:
+            log.warn("Erreur lecture: %s", error)
+        log.drain()
+        hot.append(time.perf_counter() - start)
+    log.close()
+    return hot
+
+
+@benchmark("log.slow_console", tolerances={"hot_us_print": 1.0, "hot_us_logger": 1.0})
+def slow_console():
+    results = {}
+    for label, variant in (("print", run_print), ("logger", run_logger)):
+        console = SlowConsole()
+        hot = variant(console)
+        results.update(distribution(f"hot_us_{label}", hot, scale=1e6))
+        results[f"lines_{label}"] = console.lines
+    return results
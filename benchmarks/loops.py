@@ -0,0 +1,140 @@
+"""
+Main Loop Benchmarks
+====================
+
+The same scripted hour runs against each loop variant on the simulated
+board:
+
+    reference   README program, fixed 50 ms polling  (loopkit.reference)
+    deadline    Scheduler, waits on the button edge until the next deadline
+                and polls only while the button is down  (loopkit.scheduled)
+    polling     the same without libgpiod v2: button polled every 50 ms
+    edge        deadline, with the waiter passed to main() (SimEdgeWaiter)
+    asyncio     coroutines, sensor read in an executor   (loopkit.aio)
+
+The *_slow_sensor cases make each sensor property read take
+SLOW_SENSOR_LATENCY seconds (a struggling I2C bus), which blocks the
+single-loop variants but not the asyncio one.
+
+The scenario: PRESSES short presses (150-600 ms) spread over the hour,
+then a 3 s hold that must stop the program HOLD_TIME after it starts.
+Reported, per variant:
+
+    press_latency_*         press -> "Bouton appuye!" (ms)
+    missed_presses          presses never reported
+    hold_stop_error_ms      |stop time - (hold start + 2 s)|
+    sensor_interval_error_ms, sensor_jitter_ms
+                            mean error and standard deviation of the
+                            time between two sensor reads
+    wakeups_per_hour        sleeps/waits per simulated hour
+    cpu_ms_per_hour         process CPU time per simulated hour (for
+                            asyncio this includes the simulator's real
+                            hand-offs to the executor threads)
+"""
+
+import bisect
+import random
+import statistics
+
+from loopkit.sim import SimEdgeWaiter, SimHardware, run_program
+
+from .harness import benchmark, cpu_time, distribution
+
+
+DURATION = 3600.0
+PRESSES = 60
+HOLD_TIME = 2.0
+SENSOR_INTERVAL = 5.0
+EDGE_LATENCY = 0.0002  # kernel edge -> userspace wake-up
+SLOW_SENSOR_LATENCY = 0.5  # per property, so 1 s per read_sensor()
+SEED = 4
+TOLERANCES = {"cpu_ms_per_hour": 0.5}  # real process time
+
+
+def scenario(seed=SEED, sensor_latency=None, edges=True):
+    """Hardware with the scripted presses; returns (hw, press starts, hold start)."""
+    hw = SimHardware()
+    hw.edges = edges
+    hw.edge_latency = EDGE_LATENCY
+    if sensor_latency is not None:
+        hw.sensor.latency = sensor_latency
+    rng = random.Random(seed)
+    slot = DURATION / PRESSES
+    starts = []
+    for i in range(PRESSES):
+        start = i * slot + rng.uniform(1.0, slot - 2.0)
+        hw.button.press(at=start, hold=rng.uniform(0.15, 0.6))
+        starts.append(start)
+    hw.button.press(at=DURATION, hold=3.0)
+    return hw, starts, DURATION
+
+
+def measure(module, make_args=lambda hw: (), sensor_latency=None, edges=True):
+    def once():
+        hw, starts, hold_start = scenario(sensor_latency=sensor_latency, edges=edges)
+        args = make_args(hw)
+        output = run_program(hw, module, until=hold_start + 10, args=args)
+        return hw, starts, hold_start, args, output
+
+    cpu, (hw, starts, hold_start, args, output) = cpu_time(once)
+    hours = hw.clock.now / 3600
+
+    detections = output.times("Bouton appuye!")
+    latencies = []
+    for start in starts + [hold_start]:
+        i = bisect.bisect_left(detections, start)
+        if i < len(detections) and detections[i] - start < 2.5:
+            latencies.append(detections[i] - start)
+
+    stops = output.times("Arret demande (bouton maintenu)")
+    if not stops:
+        raise RuntimeError(f"{module}: the 2 s hold did not stop the program")
+
+    reads = output.times("Temperature")
+    intervals = [b - a for a, b in zip(reads, reads[1:])]
+
+    metrics = distribution("press_latency", latencies)
+    metrics.update({
+        "missed_presses": len(starts) + 1 - len(latencies),
+        "hold_stop_error_ms": abs(stops[0] - (hold_start + HOLD_TIME)) * 1000,
+        "sensor_interval_error_ms": abs(statistics.mean(intervals) - SENSOR_INTERVAL) * 1000,
+        "sensor_jitter_ms": statistics.pstdev(intervals) * 1000,
+        "wakeups_per_hour": (hw.clock.sleeps + hw.clock.waits) / hours,
+        "cpu_ms_per_hour": cpu * 1000 / hours,
+    })
+    return metrics
+
+
+@benchmark("loop.reference", tolerances=TOLERANCES)
+def loop_reference():
+    return measure("loopkit.reference")
+
+
+@benchmark("loop.deadline", tolerances=TOLERANCES)
+def loop_deadline():
+    return measure("loopkit.scheduled")
+
+
+@benchmark("loop.polling", tolerances=TOLERANCES)
+def loop_polling():
+    return measure("loopkit.scheduled", edges=False)
+
+
+@benchmark("loop.edge", tolerances=TOLERANCES)
+def loop_edge():
+    return measure("loopkit.scheduled", lambda hw: (SimEdgeWaiter(hw, latency=EDGE_LATENCY),))
+
+
+@benchmark("loop.asyncio", tolerances=TOLERANCES)
+def loop_asyncio():
+    return measure("loopkit.aio")
+
+
+@benchmark("loop.reference_slow_sensor", tolerances=TOLERANCES)
+def loop_reference_slow_sensor():
+    return measure("loopkit.reference", sensor_latency=SLOW_SENSOR_LATENCY)
+
+
+@benchmark("loop.asyncio_slow_sensor", tolerances=TOLERANCES)
+def loop_asyncio_slow_sensor():
+    return measure("loopkit.aio", sensor_latency=SLOW_SENSOR_LATENCY)
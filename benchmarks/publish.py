@@ -0,0 +1,52 @@
+"""
+Publisher Benchmark
+===================
+
+Publishes SAMPLES samples from the "main loop" to a LocalBroker with
+BROKER_LATENCY per message and an outage in the middle, in real time
+(about a second):
+
+    publish_us_*            time spent in publish() by the loop
+    lost_samples            samples that never reached the broker
+    out_of_order            samples received out of order
+    connections_opened      connections used for the whole run
+"""
+
+import tempfile
+import time
+
+from loopkit.publish import LocalBroker, Publisher
+
+from .harness import benchmark, distribution
+
+
+SAMPLES = 400
+PERIOD = 0.002
+BROKER_LATENCY = 0.02
+OUTAGE = (100, 250)  # samples published while the broker is offline
+
+
+@benchmark("publish.outbox", tolerances={"publish_us": 1.0})
+def publish_outbox():
+    broker = LocalBroker(latency=BROKER_LATENCY)
+    with tempfile.TemporaryDirectory() as spill_dir:
+        publisher = Publisher(broker.connect, max_batch=10, max_age=0.1,
+                              outbox_size=50, spill_dir=spill_dir, retry=0.05)
+        durations = []
+        for i in range(SAMPLES):
+            broker.online = not OUTAGE[0] <= i < OUTAGE[1]
+            start = time.perf_counter()
+            publisher.publish({"i": i})
+            durations.append(time.perf_counter() - start)
+            time.sleep(PERIOD)
+        publisher.flush(10.0)
+        publisher.close()
+
+    received = [sample["i"] for sample in broker.samples()]
+    metrics = distribution("publish_us", durations, scale=1e6)
+    metrics.update({
+        "lost_samples": SAMPLES - len(set(received)),
+        "out_of_order": sum(1 for a, b in zip(received, received[1:]) if b < a),
+        "connections_opened": broker.connections,
+    })
+    return metrics
@@ -0,0 +1,73 @@
+"""
+Unplugged Sensor Benchmark
+==========================
+
+The AHTx0 is unplugged for OUTAGE seconds in the middle of a run, and
+each read of the missing sensor costs a BUS_TIMEOUT I2C timeout:
+
+    reference   README program: read_sensor() every interval, catches
+                and prints the error                  (loopkit.reference)
+    resilient   Scheduler + loopkit.resilience.ResilientReader: backoff,
+                circuit breaker, bus scan before retrying (loopkit.scheduled,
+                retry jitter seeded with SEED)
+
+    blocked_ms_per_hour     virtual time spent inside failed reads
+    error_lines             "Erreur lecture" lines printed
+    recovery_s              sensor plugged back -> first good read
+    missed_presses          0.2 s presses never reported (they fell
+                            inside a blocked read)
+"""
+
+import bisect
+import random
+
+from loopkit.sim import SimHardware, run_program
+
+from .harness import benchmark
+
+
+DURATION = 1800.0
+OUTAGE = (300.0, 1200.0)
+BUS_TIMEOUT = 1.0
+PRESS_PERIOD = 7.3  # presses every few seconds, out of phase with the reads
+SEED = 24
+
+
+def measure(module, args=()):
+    hw = SimHardware()
+    hw.sensor.timeout = BUS_TIMEOUT
+    hw.sensor.unplug(*OUTAGE)
+    starts = []
+    t = 1.0
+    while t < DURATION - 5:
+        hw.button.press(at=t, hold=0.2)
+        starts.append(t)
+        t += PRESS_PERIOD
+    output = run_program(hw, module, until=DURATION, args=args)
+
+    detections = output.times("Bouton appuye!")
+    missed = 0
+    for start in starts:
+        i = bisect.bisect_left(detections, start)
+        if i == len(detections) or detections[i] - start > PRESS_PERIOD / 2:
+            missed += 1
+
+    reads = output.times("Temperature")
+    after = [t for t in reads if t >= OUTAGE[1]]
+    failed_reads = hw.sensor.errors
+    return {
+        "blocked_ms_per_hour": failed_reads * BUS_TIMEOUT * 1000 / (DURATION / 3600),
+        "error_lines": len(output.times("Erreur lecture")),
+        "recovery_s": after[0] - OUTAGE[1] if after else None,
+        "missed_presses": missed,
+    }
+
+
+@benchmark("sensor.unplugged_reference")
+def unplugged_reference():
+    return measure("loopkit.reference")
+
+
+@benchmark("sensor.unplugged_resilient")
+def unplugged_resilient():
+    return measure("loopkit.scheduled", args=(None, random.Random(SEED)))
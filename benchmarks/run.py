@@ -0,0 +1,98 @@
+"""
+Benchmark Runner
+================
+
+Run the registered benchmarks, print their metrics, store them under
+.benchmarks/<git revision>.json and optionally compare with an earlier
+run.
+
+Usage:
+    python -m benchmarks.run                     # run all, save
+    python -m benchmarks.run -k loop             # only names containing "loop"
+    python -m benchmarks.run --compare           # vs. the most recent other run
+    python -m benchmarks.run --compare 1754ff6   # vs. a given revision
+
+The exit status is 1 when a metric is over its budget or, with
+--compare, got worse by more than --threshold (relative, 20 % by
+default).
+"""
+
+import argparse
+import sys
+
+from . import adaptive, button, inputs, log, loops, publish, resilience, sensors, startup  # noqa: F401  (registers the benchmarks)
+from .harness import BENCHMARKS, RESULTS_DIR, compare, git_revision, load, over_budget, save
+
+
+def format_value(value):
+    if value is None:
+        return "-"
+    if isinstance(value, int):
+        return str(value)
+    return f"{value:.3f}"
+
+
+def print_results(results, baseline=None):
+    for name, metrics in results.items():
+        print(name)
+        old = (baseline or {}).get(name, {})
+        for metric, value in metrics.items():
+            line = f"  {metric:<28} {format_value(value):>12}"
+            if metric in old:
+                line += f"   (was {format_value(old[metric])})"
+            print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Loop latency and CPU benchmarks")
+    parser.add_argument("-k", dest="pattern", default="",
+                        help="only run benchmarks whose name contains PATTERN")
+    parser.add_argument("--compare", nargs="?", const="", default=None, metavar="REVISION",
+                        help="compare with a stored run (default: the most recent other one)")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="relative increase counted as a regression (default: 0.2)")
+    parser.add_argument("--no-save", action="store_true", help="do not store the results")
+    parser.add_argument("--results-dir", default=str(RESULTS_DIR))
+    args = parser.parse_args(argv)
+
+    selected = {name: func for name, func in BENCHMARKS.items() if args.pattern in name}
+    if not selected:
+        parser.error(f"no benchmark matches {args.pattern!r}")
+
+    revision = git_revision()
+    results = {}
+    for name, func in selected.items():
+        print(f"running {name}...", file=sys.stderr)
+        results[name] = func()
+
+    baseline = None
+    if args.compare is not None:
+        record = load(args.compare or None, args.results_dir, exclude=revision)
+        if record is None:
+            print("No stored run to compare with.", file=sys.stderr)
+        else:
+            baseline = record["results"]
+            print(f"Compared with {record['revision']}")
+
+    print_results(results, baseline)
+
+    if not args.no_save:
+        path = save(results, revision, args.results_dir)
+        print(f"Saved {path}")
+
+    status = 0
+    for name, metric, value, limit in over_budget(results):
+        print(f"OVER BUDGET {name} {metric}: {format_value(value)} > {format_value(limit)}")
+        status = 1
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold)
+        for name, metric, old, new in regressions:
+            print(f"REGRESSION {name} {metric}: {format_value(old)} -> {format_value(new)}")
+        if regressions:
+            status = 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
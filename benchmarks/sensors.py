@@ -0,0 +1,122 @@
+"""
+Sensor Fan-out Benchmark
+========================
+
+Four sensors with different conversion times and rates share the
+simulated I2C bus (each transfer holds it TRANSFER_TIME), next to a
+button polled every 50 ms, for DURATION seconds of virtual time. Two
+ways of reading them:
+
+    blocking    each due sensor is triggered, waited for and fetched in
+                turn, as the reference read_sensor() does
+    registry    loopkit.sensors.SensorRegistry: trigger and fetch are
+                separate scheduler tasks, conversions overlap
+
+Metrics (suffixed _blocking / _registry):
+    button_gap_ms_max       longest time between two button polls
+    read_latency_ms_*       sensor deadline to values available
+    bus_hold_ms_max         longest single hold of the bus
+    missed_reads            expected reads that produced no values
+"""
+
+import functools
+import math
+
+from loopkit.aht import AHTx0Reader
+from loopkit.scheduler import STOP, Scheduler
+from loopkit.sensors import SensorRegistry
+from loopkit.sim import SensorModel, SimHardware, SimI2CDevice
+
+from .harness import benchmark, distribution
+
+
+SENSORS = (
+    # name, conversion time (s), read interval (s)
+    ("aht20", 0.08, 1.0),
+    ("sht40", 0.009, 0.5),
+    ("bme280", 0.04, 2.0),
+    ("veml7700", 0.1, 5.0),
+)
+INTERVALS = {name: interval for name, _, interval in SENSORS}
+TRANSFER_TIME = 0.0005  # one short transfer at 100 kHz
+BUTTON_POLL = 0.05
+DURATION = 600.0
+
+
+def make_readers(hw):
+    readers = {}
+    for name, conversion_time, _ in SENSORS:
+        model = SensorModel(conversion_time=conversion_time, transfer_time=TRANSFER_TIME)
+        device = SimI2CDevice(hw, model)
+        readers[name] = AHTx0Reader(device, conversion_time, clock=hw.clock.monotonic)
+    return readers
+
+
+def deadline(name, now):
+    """Deadline of the read of sensor name completing at now."""
+    interval = INTERVALS[name]
+    return math.floor(now / interval + 1e-9) * interval
+
+
+def expected_reads():
+    return sum(int(DURATION / interval) for _, _, interval in SENSORS)
+
+
+def run_scheduler(hw, scheduler, polls):
+    def poll_button(now):
+        polls.append(now)
+
+    scheduler.every(BUTTON_POLL, poll_button)
+    scheduler.call_at(DURATION + 0.5, lambda now: STOP, name="end")
+    scheduler.run()
+
+
+def blocking(hw):
+    clock = hw.clock
+    readers = make_readers(hw)
+    scheduler = Scheduler(clock=clock.monotonic, sleep=clock.sleep)
+    latencies, holds, polls = [], [], []
+
+    def read(name, now):
+        reader = readers[name]
+        start = clock.now
+        reader.trigger(clock.now)
+        clock.advance(reader.conversion_time)
+        if reader.poll(clock.now) is not None:
+            latencies.append(clock.now - deadline(name, now))
+        holds.append(clock.now - start)
+
+    for name, _, interval in SENSORS:
+        scheduler.every(interval, functools.partial(read, name), name=name)
+    run_scheduler(hw, scheduler, polls)
+    return latencies, holds, polls
+
+
+def registry(hw):
+    clock = hw.clock
+    scheduler = Scheduler(clock=clock.monotonic, sleep=clock.sleep)
+    sensors = SensorRegistry(i2c=object(), clock=clock.monotonic)
+    for name, reader in make_readers(hw).items():
+        sensors.add(name, reader, INTERVALS[name])
+    latencies, polls = [], []
+
+    def on_reading(name, values, now):
+        latencies.append(clock.now - deadline(name, now))
+
+    sensors.attach(scheduler, on_reading)
+    run_scheduler(hw, scheduler, polls)
+    holds = [sensor.stats.hold_max for sensor in sensors.sensors.values()]
+    return latencies, holds, polls
+
+
+@benchmark("sensors.fanout")
+def sensor_fanout():
+    results = {}
+    for label, variant in (("blocking", blocking), ("registry", registry)):
+        latencies, holds, polls = variant(SimHardware())
+        gaps = [b - a for a, b in zip(polls, polls[1:])]
+        results[f"button_gap_ms_max_{label}"] = max(gaps) * 1000
+        results.update(distribution(f"read_latency_ms_{label}", latencies))
+        results[f"bus_hold_ms_max_{label}"] = max(holds) * 1000
+        results[f"missed_reads_{label}"] = expected_reads() - len(latencies)
+    return results
@@ -0,0 +1,89 @@
+"""
+Startup Benchmark
+=================
+
+Time until each program watches the button, in a fresh interpreter
+(python -m benchmarks.startup MODULE runs one probe): its first
+button.value read, or its first wait on the button edge.
+
+    first_poll_virtual_ms   simulated hardware time before the button is
+                            watched (sensor reset/calibration)
+    first_poll_real_ms      real time from importing the program to the
+                            button being watched (imports + setup)
+
+The simulated board, digitalio and adafruit_ahtx0 modules import
+instantly, so first_poll_real_ms only covers the program's own imports
+and setup; Blinka's import cost on a Pi is shown by
+``validate_pi.py --startup-report``. loopkit is byte-compiled first, as
+it is on a Pi after the first run: without .pyc files the probe mostly
+times the compiler, more so for the programs built from several modules.
+
+The budgets below are checked by benchmarks.run. first_poll_real_ms is
+about 1 ms for startup.scheduled (0.3 ms for the single-module
+reference); 3 ms catches an extra eager import on the path to the first
+poll.
+"""
+
+import compileall
+import json
+import subprocess
+import sys
+import time
+
+from .harness import REPO_ROOT, benchmark, budget
+
+
+RUNS = 5
+
+budget("startup.scheduled", "first_poll_virtual_ms", 5.0)
+budget("startup.scheduled", "first_poll_real_ms", 3.0)
+budget("startup.aio", "first_poll_virtual_ms", 5.0)  # sensor created at the first read
+
+
+def probe(module):
+    """Run module until it first watches the button; return (virtual s, real s)."""
+    from loopkit.sim import SimHardware, run_program
+
+    hw = SimHardware()
+    start = time.perf_counter()
+    run_program(hw, module, until=0.001)
+    firsts = [i.first_read for i in hw.inputs] + [w.first_wait for w in hw.waiters]
+    virtual, real = min(first for first in firsts if first is not None)
+    return virtual, real - start
+
+
+def measure(module):
+    compileall.compile_dir(REPO_ROOT / "loopkit", quiet=1)
+    virtual, real = [], []
+    for _ in range(RUNS):
+        result = subprocess.run(
+            [sys.executable, "-m", "benchmarks.startup", module],
+            cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+        )
+        data = json.loads(result.stdout)
+        virtual.append(data["virtual"])
+        real.append(data["real"])
+    return {
+        "first_poll_virtual_ms": min(virtual) * 1000,
+        "first_poll_real_ms": min(real) * 1000,
+    }
+
+
+@benchmark("startup.reference")
+def startup_reference():
+    return measure("loopkit.reference")
+
+
+@benchmark("startup.scheduled")
+def startup_scheduled():
+    return measure("loopkit.scheduled")
+
+
+@benchmark("startup.aio")
+def startup_aio():
+    return measure("loopkit.aio")
+
+
+if __name__ == "__main__":
+    virtual, real = probe(sys.argv[1])
+    print(json.dumps({"virtual": virtual, "real": real}))
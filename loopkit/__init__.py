@@ -0,0 +1,11 @@
+"""
+loopkit - building blocks around the timer-in-loop pattern
+==========================================================
+
+Helpers used by validate_pi.py and by the teaching team to measure and
+extend the single-loop program of Formatif F4 (timer with
+time.monotonic(), button polling with digitalio).
+
+Your main.py does not need any of this: the milestones only check the
+structure described in the README.
+"""
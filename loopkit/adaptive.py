@@ -0,0 +1,186 @@
+"""
+Adaptive sampling interval with deadband filtering
+==================================================
+
+SENSOR_INTERVAL is fixed at 5 s: while temperature and humidity are flat
+most reads are redundant, and during a fast transient 5 s is too coarse.
+AdaptiveSampler wraps the read and picks the next interval from how fast
+the values have been changing:
+
+    sampler = AdaptiveSampler(lambda: read_sensor(sensor),
+                              min_interval=1, interval=SENSOR_INTERVAL,
+                              deadband=(0.1, 0.5))   # C, %RH
+    while True:
+        current_time = time.monotonic()
+        if sampler.due(current_time):
+            values = sampler.sample(current_time)
+            if values is not None:                 # changed enough: keep it
+                writer.append(time.time(), *values)
+        ...
+
+read() returns a tuple of numbers (or None when the read failed).
+
+Interval. Every change is measured in deadbands per second (the largest
+channel wins). An exponential moving average of that rate and of its
+variance over about ``window`` reads gives a pessimistic rate, mean +
+2 standard deviations, and the target interval is the time for it to
+move one deadband. A shorter target is applied at once, and a read
+``transient`` deadbands or more (half of one by default) away from the
+moving average of the values drops the interval straight to
+min_interval, so a transient is sampled at full speed from the next read
+on, before the rate average has caught up. A longer
+target grows the interval by at most ``growth`` per read, so one quiet
+read does not slow it down. The interval always stays between
+min_interval and max_interval.
+
+max_interval defaults to the starting interval (the fixed loop's
+SENSOR_INTERVAL). A transient that starts between two reads is only seen
+on the next one, so the worst tracking error is max_interval times the
+fastest slope: with the default it is no worse than the fixed loop's,
+and the savings are in the samples passed downstream (noise that
+crosses the transient threshold costs some extra reads). A larger
+max_interval also saves reads, at the cost of that onset error.
+
+Deadband. sample() returns the values only when a channel moved at least
+its deadband away from the last returned values, or heartbeat seconds
+after it (so downstream still sees the sensor is alive); otherwise the
+read is counted as suppressed and sample() returns None.
+
+stats(now) reports reads, emitted and suppressed samples, the achieved
+read and emit rates (per hour) and the suppression ratio.
+"""
+
+import math
+import time
+
+
+class AdaptiveSampler:
+    """Read at an interval following the signal's rate of change."""
+
+    def __init__(self, read, min_interval=1.0, max_interval=None, interval=5.0,
+                 deadband=(0.1, 0.5), heartbeat=300.0, window=8, growth=1.5,
+                 transient=0.5, clock=None):
+        if max_interval is None:
+            max_interval = max(interval, min_interval)
+        if not 0 < min_interval <= max_interval:
+            raise ValueError("need 0 < min_interval <= max_interval")
+        if any(band <= 0 for band in deadband):
+            raise ValueError("deadbands must be positive")
+        self.read = read
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.interval = min(max(interval, min_interval), max_interval)
+        self.deadband = tuple(deadband)
+        self.heartbeat = heartbeat
+        self.alpha = 2.0 / (window + 1)
+        self.growth = growth
+        self.transient = transient
+        self.clock = clock or time.monotonic
+
+        self.started = self.clock()
+        self.deadline = self.started + self.interval
+        self.last = None          # (time, values) of the last good read
+        self.emitted = None       # (time, values) last returned by sample()
+        self.rate = 0.0           # deadbands per second, moving average
+        self.variance = 0.0
+        self.level = None         # moving average of the values
+        self.reads = 0
+        self.errors = 0
+        self.emits = 0
+        self.suppressed = 0
+        self.scheduler = None
+        self.on_sample = None
+
+    def due(self, now=None):
+        """True when the next read is due (sample() moves the deadline)."""
+        return (self.clock() if now is None else now) >= self.deadline
+
+    def sample(self, now=None):
+        """Read now; return the values when they pass the deadband, else None."""
+        now = self.clock() if now is None else now
+        values = self.read()
+        self.reads += 1
+        if values is None:
+            self.errors += 1
+            self.deadline = now + self.interval
+            return None
+
+        if self.last is None:
+            self.level = list(values)
+        else:
+            self._adapt(now, values)
+        self.last = (now, values)
+        self.deadline = now + self.interval
+
+        if self.emitted is None or self._changed(values) or now - self.emitted[0] >= self.heartbeat:
+            self.emitted = (now, values)
+            self.emits += 1
+            return values
+        self.suppressed += 1
+        return None
+
+    def _changed(self, values):
+        last = self.emitted[1]
+        return any(abs(v - old) >= band for v, old, band in zip(values, last, self.deadband))
+
+    def _adapt(self, now, values):
+        then, previous = self.last
+        elapsed = now - then
+        if elapsed <= 0:
+            return
+        change = max(abs(v - old) / band for v, old, band in zip(values, previous, self.deadband))
+        rate = change / elapsed
+        # Distance from the smoothed level, for the transient test: less
+        # noisy than the read-to-read change.
+        jump = max(abs(v - old) / band for v, old, band in zip(values, self.level, self.deadband))
+        self.level = [old + self.alpha * (v - old) for v, old in zip(values, self.level)]
+
+        # Exponentially weighted mean and variance of the rate.
+        delta = rate - self.rate
+        self.rate += self.alpha * delta
+        self.variance = (1 - self.alpha) * (self.variance + self.alpha * delta * delta)
+
+        bound = self.rate + 2 * math.sqrt(self.variance)
+        target = 1.0 / bound if bound > 0 else self.max_interval
+        if jump >= self.transient:
+            # A transient: sample it as fast as allowed until the average
+            # rate catches up.
+            interval = self.min_interval
+        elif target < self.interval:
+            interval = target
+        else:
+            interval = min(target, self.interval * self.growth)
+        self.interval = min(max(interval, self.min_interval), self.max_interval)
+
+    # -- Scheduler ---------------------------------------------------------
+    def attach(self, scheduler, on_sample=None):
+        """
+        Run on a loopkit.scheduler.Scheduler: each read reschedules the
+        next one at the new interval. on_sample(values, now) runs for
+        every sample that passes the deadband (returning STOP stops it).
+        """
+        self.scheduler = scheduler
+        self.on_sample = on_sample
+        scheduler.call_at(self.deadline, self._run, name="adaptive_sample")
+
+    def _run(self, now):
+        values = self.sample(now)
+        self.scheduler.call_at(self.deadline, self._run, name="adaptive_sample")
+        if values is not None and self.on_sample is not None:
+            return self.on_sample(values, now)
+        return None
+
+    # -- report ------------------------------------------------------------
+    def stats(self, now=None):
+        now = self.clock() if now is None else now
+        hours = max(now - self.started, 1e-9) / 3600
+        return {
+            "interval": self.interval,
+            "reads": self.reads,
+            "errors": self.errors,
+            "emitted": self.emits,
+            "suppressed": self.suppressed,
+            "reads_per_hour": self.reads / hours,
+            "emitted_per_hour": self.emits / hours,
+            "suppression_ratio": self.suppressed / self.reads if self.reads else 0.0,
+        }
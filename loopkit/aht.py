@@ -0,0 +1,97 @@
+"""
+Non-blocking AHTx0 reads
+========================
+
+With adafruit_ahtx0, ``sensor.temperature`` and ``sensor.relative_humidity``
+each trigger their own measurement and wait for the conversion (~80 ms)
+before returning, so read_sensor() stalls the main loop twice per cycle
+and the button is not polled meanwhile.
+
+AHTx0Reader splits one measurement in two steps on the sensor's I2C
+device: trigger() sends the measurement command and returns at once;
+poll() reads temperature and humidity together from a single 6-byte
+fetch once the conversion time has passed.
+
+    reader = AHTx0Reader(sensor)
+    sensor_timer = PeriodicTimer(SENSOR_INTERVAL)
+    while True:
+        current_time = time.monotonic()
+        if sensor_timer.due(current_time):
+            reader.trigger(current_time)
+        values = reader.poll(current_time)
+        if values is not None:
+            temperature, humidity = values
+        # ... button polling never waits for the sensor ...
+
+I2C errors (OSError) are raised by trigger() and poll() like the
+property reads, so the usual try/except around the read still applies.
+"""
+
+import time
+
+
+AHTX0_ADDRESS = 0x38
+AHTX0_CMD_TRIGGER = (0xAC, 0x33, 0x00)
+AHTX0_STATUS_BUSY = 0x80
+CONVERSION_TIME = 0.08  # seconds, from the AHT20 datasheet
+
+
+def decode(buf):
+    """Temperature (C) and relative humidity (%) from a 6-byte reading."""
+    humidity = ((buf[1] << 12) | (buf[2] << 4) | (buf[3] >> 4)) * 100 / 0x100000
+    temperature = (((buf[3] & 0xF) << 16) | (buf[4] << 8) | buf[5]) * 200 / 0x100000 - 50
+    return temperature, humidity
+
+
+class AHTx0Reader:
+    """Trigger an AHTx0 measurement now, fetch both values later."""
+
+    def __init__(self, sensor, conversion_time=CONVERSION_TIME, clock=None):
+        # Accept an adafruit_ahtx0.AHTx0 or its I2CDevice directly.
+        self.device = getattr(sensor, "i2c_device", sensor)
+        self.conversion_time = conversion_time
+        self.clock = clock or time.monotonic
+        self.triggered_at = None
+        self.temperature = None
+        self.humidity = None
+        self._command = bytearray(AHTX0_CMD_TRIGGER)
+        self._buf = bytearray(6)
+
+    @property
+    def pending(self):
+        return self.triggered_at is not None
+
+    def trigger(self, now=None):
+        """Start a measurement unless one is already in progress."""
+        if self.pending:
+            return
+        with self.device as i2c:
+            i2c.write(self._command)
+        self.triggered_at = self.clock() if now is None else now
+
+    def cancel(self):
+        """Forget the measurement in progress (its result is never fetched)."""
+        self.triggered_at = None
+
+    def ready(self, now=None):
+        """True once the conversion time has elapsed since trigger()."""
+        if not self.pending:
+            return False
+        now = self.clock() if now is None else now
+        return now - self.triggered_at >= self.conversion_time
+
+    def poll(self, now=None):
+        """(temperature, humidity) when a measurement completes, else None."""
+        if not self.ready(now):
+            return None
+        try:
+            with self.device as i2c:
+                i2c.readinto(self._buf)
+        except OSError:
+            self.triggered_at = None
+            raise
+        if self._buf[0] & AHTX0_STATUS_BUSY:
+            return None  # still converting: try again next iteration
+        self.triggered_at = None
+        self.temperature, self.humidity = decode(self._buf)
+        return self.temperature, self.humidity
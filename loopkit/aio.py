@@ -0,0 +1,173 @@
+"""
+Programme de reference en asyncio (une coroutine par tache).
+
+Memes blocs que loopkit/reference.py (read_sensor, polling du bouton,
+arret apres 2 secondes de maintien, Ctrl+C, button.deinit()), mais chaque
+tache est une coroutine:
+
+    sensor_task    lecture capteur toutes les SENSOR_INTERVAL secondes
+    button_task    polling du bouton toutes les BUTTON_POLL secondes
+    publish_task   envoi des mesures (main(publish=...))
+
+Les appels bloquants (lecture I2C, publication reseau) passent par un
+petit ThreadPoolExecutor: pendant une lecture capteur lente, la boucle
+continue de lire le bouton. Lire button.value ne bloque pas (registre
+GPIO), il reste donc dans la boucle.
+
+L'arret (maintien ou Ctrl+C) annule les taches, attend leur fin, puis
+libere le bouton dans le finally de main().
+
+Les messages passent par loopkit.log.Logger (format "plain": memes
+lignes que print), depuis la boucle seulement: chaque tache les met en
+file puis les ecrit (drain) apres son travail, avant de se rendormir.
+Les erreurs capteur et publication sont limitees en debit.
+
+Comme dans loopkit/scheduled.py, le bus I2C et le capteur sont crees a
+la premiere lecture (Deferred), dans un thread de l'executor: le bouton
+est lu des le demarrage, et un capteur absent devient une erreur de
+lecture (nouvel essai a l'echeance suivante).
+
+Cout: button_task se reveille toutes les BUTTON_POLL secondes, et chaque
+reveil traverse la boucle asyncio (timer, selecteur, reprise de la
+coroutine). Pour le meme nombre de reveils (~72 000 par heure), le
+benchmark loop.asyncio mesure environ 2000 ms CPU par heure simulee,
+contre environ 150 pour loop.reference (time.sleep) et 20 pour
+loop.edge (front GPIO, ~1 250 reveils par heure). Sur un Pi sur
+batterie, preferer loopkit/scheduled.py; cette variante sert quand le
+programme a deja d'autres coroutines (reseau, publication).
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import board
+import digitalio
+
+from loopkit.log import Logger
+from loopkit.startup import Deferred, lazy_import
+
+# Configuration
+SENSOR_INTERVAL = 5  # secondes entre lectures
+BUTTON_POLL = 0.05  # secondes entre lectures du bouton
+HOLD_TIME = 2  # secondes de maintien pour arreter
+BUTTON_PIN = board.D17
+WORKERS = 2  # threads pour les appels bloquants
+
+log = Logger(fmt="plain")
+
+
+def read_sensor(sensor):
+    """Lire le capteur (thread de l'executor); les erreurs remontent a sensor_task."""
+    temperature = sensor.temperature
+    humidity = sensor.relative_humidity
+    return {"time": time.time(), "temperature": temperature, "humidity": humidity}
+
+
+async def sensor_task(sensor, executor, queue):
+    """Lecture capteur a echeances fixes, dans un thread de l'executor."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + SENSOR_INTERVAL
+    while True:
+        await asyncio.sleep(max(0.0, deadline - loop.time()))
+        deadline += SENSOR_INTERVAL
+        try:
+            data = await loop.run_in_executor(executor, read_sensor, sensor)
+        except Exception as e:
+            log.warn("Erreur lecture: %s", e)
+            log.drain()
+            continue
+        log.info("Temperature: %.1f C, Humidite: %.1f %%", data["temperature"], data["humidity"])
+        log.drain()
+        if queue is not None:
+            if queue.full():
+                queue.get_nowait()  # publication en retard: garder les plus recentes
+            queue.put_nowait(data)
+
+
+async def button_task(button, stop):
+    """Polling du bouton: transition = appui, maintien HOLD_TIME = arret."""
+    loop = asyncio.get_running_loop()
+    last_button = True
+    press_start = None
+    while True:
+        now = loop.time()
+        current_button = button.value
+        if last_button and not current_button:
+            log.info("Bouton appuye!")
+        last_button = current_button
+
+        if not current_button:
+            if press_start is None:
+                press_start = now
+            elif now - press_start >= HOLD_TIME:
+                log.info("Arret demande (bouton maintenu)...")
+                log.drain()
+                stop.set()
+                return
+        else:
+            press_start = None
+
+        log.drain()
+        await asyncio.sleep(BUTTON_POLL)
+
+
+async def publish_task(publish, executor, queue):
+    """Envoyer chaque mesure avec publish(data), sans bloquer la boucle."""
+    loop = asyncio.get_running_loop()
+    while True:
+        data = await queue.get()
+        try:
+            await loop.run_in_executor(executor, publish, data)
+        except Exception as e:
+            log.warn("Erreur publication: %s", e)
+            log.drain()
+
+
+async def run(sensor, button, executor, publish=None):
+    """Lancer les taches et attendre l'arret; les annuler proprement."""
+    stop = asyncio.Event()
+    queue = asyncio.Queue(maxsize=100) if publish is not None else None
+
+    tasks = [
+        asyncio.create_task(sensor_task(sensor, executor, queue)),
+        asyncio.create_task(button_task(button, stop)),
+    ]
+    if publish is not None:
+        tasks.append(asyncio.create_task(publish_task(publish, executor, queue)))
+
+    try:
+        await stop.wait()
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def main(publish=None):
+    """Fonction principale: coroutines capteur, bouton et publication."""
+    adafruit_ahtx0 = lazy_import("adafruit_ahtx0")
+
+    # Bus et capteur crees a la premiere lecture (thread de l'executor)
+    i2c = Deferred(board.I2C)
+    sensor = Deferred(lambda: adafruit_ahtx0.AHTx0(i2c.get()))
+
+    button = digitalio.DigitalInOut(BUTTON_PIN)
+    button.direction = digitalio.Direction.INPUT
+    button.pull = digitalio.Pull.UP
+
+    executor = ThreadPoolExecutor(max_workers=WORKERS)
+    try:
+        asyncio.run(run(sensor, button, executor, publish))
+    except KeyboardInterrupt:
+        log.info("Arret demande (Ctrl+C)...")
+    finally:
+        # Une lecture en cours se termine en arriere-plan.
+        executor.shutdown(wait=False, cancel_futures=True)
+        button.deinit()
+        log.info("Nettoyage termine.")
+        log.close()
+
+
+if __name__ == "__main__":
+    main()
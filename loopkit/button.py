@@ -0,0 +1,158 @@
+"""
+Debounced multi-gesture button state machine
+============================================
+
+The README loop compares two raw samples (``last_button and not
+current_button``), so contact bounce can report one press several times,
+and each new gesture needs more ad-hoc state. ButtonMachine takes the raw
+samples, debounces them and turns them into gesture events through a
+transition table:
+
+    machine = ButtonMachine()
+    while True:
+        events = machine.update(button.value, time.monotonic())
+        if events & PRESS:
+            print("Bouton appuye!")
+        if events & LONG_HOLD:
+            print("Arret demande (bouton maintenu)...")
+            break
+        time.sleep(0.01)
+
+update() returns an int bit mask of PRESS, RELEASE, CLICK, DOUBLE_CLICK,
+LONG_HOLD and REPEAT (0 when nothing happened). It allocates nothing, so
+it can run on every sample.
+
+Debounce is an integrator: each pressed sample counts up, each released
+one counts down (clamped to 0..samples), and the debounced level only
+flips at the ends. A bounce shorter than ``samples`` samples never
+reaches them.
+
+Event latency, with T the sampling period and N = samples:
+    PRESS / RELEASE  N samples after the level settles: between (N-1)*T
+                     and N*T, plus the bounce time
+    LONG_HOLD        hold_time after the debounced PRESS (+ up to T)
+    REPEAT           every repeat_interval after LONG_HOLD (no drift)
+    CLICK            double_click seconds after the debounced RELEASE,
+                     the time needed to rule out a second click; right
+                     on RELEASE when double_click is 0
+    DOUBLE_CLICK     on the debounced RELEASE of the second press
+"""
+
+
+# Events (bit flags)
+PRESS = 1
+RELEASE = 2
+CLICK = 4
+DOUBLE_CLICK = 8
+LONG_HOLD = 16
+REPEAT = 32
+
+EVENT_NAMES = (
+    (PRESS, "PRESS"),
+    (RELEASE, "RELEASE"),
+    (CLICK, "CLICK"),
+    (DOUBLE_CLICK, "DOUBLE_CLICK"),
+    (LONG_HOLD, "LONG_HOLD"),
+    (REPEAT, "REPEAT"),
+)
+
+# States
+IDLE = 0        # released, nothing pending
+DOWN = 1        # first press, waiting for release or hold_time
+UP_WAIT = 2     # released after a click, waiting for a second press
+DOWN_AGAIN = 3  # second press, a release makes it a double click
+HELD = 4        # long hold reported, repeating until release
+
+# Inputs
+_PRESSED = 0
+_RELEASED = 1
+_TIMEOUT = 2
+
+
+def describe(events):
+    """'PRESS|LONG_HOLD' style text for an event mask (for logs)."""
+    return "|".join(name for flag, name in EVENT_NAMES if events & flag)
+
+
+class ButtonMachine:
+    """Integrator debounce plus a table-driven gesture state machine."""
+
+    def __init__(self, samples=3, hold_time=2.0, double_click=0.3,
+                 repeat_interval=0.5, active_low=True):
+        self.samples = samples
+        self.hold_time = hold_time
+        self.double_click = double_click
+        self.repeat_interval = repeat_interval
+        self.active_low = active_low
+
+        self.level = 0          # integrator, 0..samples
+        self.pressed = False    # debounced state
+        self.state = IDLE
+        self.deadline = None
+        self.pressed_at = None
+
+        # TABLE[state][input] = (next state, events) or None (ignored).
+        release_click = (UP_WAIT, RELEASE) if double_click > 0 else (IDLE, RELEASE | CLICK)
+        self.table = (
+            # IDLE
+            ((DOWN, PRESS), None, None),
+            # DOWN
+            (None, release_click, (HELD, LONG_HOLD)),
+            # UP_WAIT
+            ((DOWN_AGAIN, PRESS), None, (IDLE, CLICK)),
+            # DOWN_AGAIN
+            (None, (IDLE, RELEASE | DOUBLE_CLICK), (HELD, LONG_HOLD)),
+            # HELD
+            (None, (IDLE, RELEASE), (HELD, REPEAT)),
+        )
+        # Timeout armed on entering each state (None: no timeout).
+        self.timeouts = (None, hold_time, double_click, hold_time, repeat_interval)
+
+    def held_for(self, now):
+        """Seconds since the debounced press, or 0 when released."""
+        return now - self.pressed_at if self.pressed else 0.0
+
+    def update(self, sample, now):
+        """Feed one raw sample (button.value) taken at now; return the events."""
+        # A deadline that expired before this sample is handled before its
+        # level change: a press settling after the double-click gap is a
+        # new click, not the second half of a double click.
+        events = 0
+        if self.deadline is not None and now >= self.deadline:
+            events = self._step(_TIMEOUT, now)
+
+        if (not sample) if self.active_low else sample:
+            if self.level < self.samples:
+                self.level += 1
+                if self.level == self.samples and not self.pressed:
+                    self.pressed = True
+                    self.pressed_at = now
+                    events |= self._step(_PRESSED, now)
+        elif self.level > 0:
+            self.level -= 1
+            if self.level == 0 and self.pressed:
+                self.pressed = False
+                events |= self._step(_RELEASED, now)
+        return events
+
+    def _step(self, event, now):
+        transition = self.table[self.state][event]
+        if transition is None:
+            return 0
+        state, events = transition
+        timeout = self.timeouts[state]
+        if timeout is None:
+            self.deadline = None
+        elif event == _TIMEOUT and state == self.state:
+            self.deadline += timeout  # periodic REPEAT: keep the cadence
+        else:
+            self.deadline = now + timeout
+        self.state = state
+        return events
+
+    def reset(self):
+        self.level = 0
+        self.pressed = False
+        self.state = IDLE
+        self.deadline = None
+        self.pressed_at = None
@@ -0,0 +1,148 @@
+"""
+Button press detection: GPIO edge wait with a polling fallback
+==============================================================
+
+Polling button.value every 50 ms can miss presses shorter than the poll
+period and wakes up for the whole wait. When the kernel GPIO character
+device and libgpiod v2 (``pip install gpiod``) are available, the wait
+blocks on the falling edge instead and returns as soon as it happens,
+with the kernel timestamp of the edge.
+
+Both waiters share one interface, so a simulated pin can stand in for
+either of them:
+
+    waiter.mode            "edge" or "poll"
+    waiter.wait(timeout)   latency in seconds (edge -> detection), or None
+    waiter.close()
+
+For the polling waiter the latency is an upper bound: the time since the
+last sample that still read "released".
+"""
+
+import glob
+import time
+
+
+BUTTON_LINE = 17
+POLL_INTERVAL = 0.05
+
+# Labels of the gpiochip that drives the 40-pin header (Pi 5, Pi 4, older).
+GPIO_CHIP_LABELS = ("pinctrl-rp1", "pinctrl-bcm2711", "pinctrl-bcm2835")
+
+
+# ---------------------------------------------------------------------------
+# Polling (digitalio)
+# ---------------------------------------------------------------------------
+class PollingWaiter:
+    """Wait for a press by sampling read() (False = pressed, pull-up)."""
+
+    mode = "poll"
+
+    def __init__(self, read, interval=POLL_INTERVAL, clock=None, sleep=None):
+        self.read = read
+        self.interval = interval
+        self.clock = clock or time.monotonic
+        self.sleep = sleep or time.sleep
+
+    def wait(self, timeout):
+        deadline = self.clock() + timeout
+        last_released = self.clock()
+        while True:
+            now = self.clock()
+            if not self.read():
+                return now - last_released
+            last_released = now
+            if now >= deadline:
+                return None
+            self.sleep(min(self.interval, max(0.0, deadline - now)))
+
+    def close(self):
+        pass
+
+
+# ---------------------------------------------------------------------------
+# Edge Events (libgpiod v2)
+# ---------------------------------------------------------------------------
+class GpiodEdgeWaiter:
+    """Wait for a falling edge on one GPIO line through libgpiod v2."""
+
+    mode = "edge"
+
+    def __init__(self, line=BUTTON_LINE, chip_path=None, consumer="loopkit"):
+        import gpiod
+        from gpiod.line import Bias, Edge
+
+        settings = gpiod.LineSettings(edge_detection=Edge.FALLING, bias=Bias.PULL_UP)
+        self.request = gpiod.request_lines(
+            chip_path or find_gpio_chip(),
+            consumer=consumer,
+            config={line: settings},
+        )
+
+    def wait(self, timeout):
+        if not self.request.wait_edge_events(timeout):
+            return None
+        events = self.request.read_edge_events()
+        # Edge timestamps use CLOCK_MONOTONIC, like time.monotonic_ns().
+        return (time.monotonic_ns() - events[0].timestamp_ns) / 1e9
+
+    def close(self):
+        self.request.release()
+
+
+def find_gpio_chip():
+    """Path of the gpiochip wired to the 40-pin header."""
+    import gpiod
+
+    for path in sorted(glob.glob("/dev/gpiochip*")):
+        try:
+            with gpiod.Chip(path) as chip:
+                if chip.get_info().label in GPIO_CHIP_LABELS:
+                    return path
+        except OSError:
+            continue
+    return "/dev/gpiochip0"
+
+
+def open_edge_waiter(line=BUTTON_LINE):
+    """GpiodEdgeWaiter for line, or None when edge events are unavailable."""
+    try:
+        import gpiod
+    except ImportError:
+        return None
+    if not hasattr(gpiod, "request_lines"):
+        return None  # libgpiod v1 bindings
+    try:
+        return GpiodEdgeWaiter(line)
+    except (OSError, ValueError):
+        return None
+
+
+# ---------------------------------------------------------------------------
+# Press Detection
+# ---------------------------------------------------------------------------
+class PressResult:
+    """Outcome of wait_for_press()."""
+
+    def __init__(self, mode, latency, elapsed):
+        self.mode = mode
+        self.latency = latency
+        self.elapsed = elapsed
+
+    @property
+    def detected(self):
+        return self.latency is not None
+
+    def describe(self):
+        if not self.detected:
+            return f"no press after {self.elapsed:.1f} s ({self.mode})"
+        bound = "" if self.mode == "edge" else "<= "
+        return f"detection latency {bound}{self.latency * 1000:.1f} ms ({self.mode})"
+
+
+def wait_for_press(waiter, timeout, clock=None):
+    """Block until a press or timeout; report mode, latency and wait time."""
+    clock = clock or time.monotonic
+    start = clock()
+    latency = waiter.wait(timeout)
+    return PressResult(waiter.mode, latency, clock() - start)
@@ -0,0 +1,140 @@
+"""
+Memory-mapped reader for logged sensor history
+==============================================
+
+Reads the binary segments written by loopkit.storage.BatchWriter without
+parsing or loading them: each file is memory-mapped and its timestamp,
+temperature and humidity columns are exposed as strided memoryview
+slices over the mapping (zero copy; pages are read on first access).
+
+    with SampleHistory("logs") as history:
+        for part in history.between(start_epoch, end_epoch):
+            temps = part.temperature        # memoryview of float64
+            print(len(part), min(temps), max(temps))
+
+Time ranges are found by binary search on the timestamp column, which
+must be non-decreasing within a segment (BatchWriter appends in order).
+"""
+
+import bisect
+import glob
+import mmap
+import os
+
+from loopkit.storage import HEADER, MAGIC, RECORD, VERSION
+
+
+FIELDS = 3  # timestamp, temperature, humidity
+
+
+class SampleSlice:
+    """Zero-copy column views over a run of records."""
+
+    def __init__(self, timestamps, temperature, humidity):
+        self.timestamps = timestamps
+        self.temperature = temperature
+        self.humidity = humidity
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def __getitem__(self, index):
+        return self.timestamps[index], self.temperature[index], self.humidity[index]
+
+    def between(self, start, end):
+        """Records with start <= timestamp < end, found by binary search."""
+        lo = bisect.bisect_left(self.timestamps, start)
+        hi = bisect.bisect_left(self.timestamps, end, lo)
+        return SampleSlice(self.timestamps[lo:hi], self.temperature[lo:hi], self.humidity[lo:hi])
+
+
+class SampleFile(SampleSlice):
+    """One memory-mapped binary segment."""
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._file = open(self.path, "rb")
+        self._map = None
+        self._views = []
+
+        size = os.fstat(self._file.fileno()).st_size
+        count = max(0, (size - HEADER.size) // RECORD.size)
+        if size >= HEADER.size:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, record_size, _ = HEADER.unpack_from(self._map)
+            if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+                self.close()
+                raise ValueError(f"{self.path}: not a sample segment")
+
+        if count:
+            raw = memoryview(self._map)[HEADER.size:HEADER.size + count * RECORD.size]
+            values = raw.cast("d")
+            self._views = [raw, values]
+            columns = [values[i::FIELDS] for i in range(FIELDS)]
+            self._views += columns
+        else:
+            columns = [memoryview(b"").cast("d")] * FIELDS
+        super().__init__(*columns)
+
+    @property
+    def first(self):
+        return self.timestamps[0] if len(self) else None
+
+    @property
+    def last(self):
+        return self.timestamps[-1] if len(self) else None
+
+    def close(self):
+        """
+        Release the views and unmap the file.
+
+        Slices still held by the caller keep the mapping alive; it is then
+        unmapped when the last of them is garbage collected.
+        """
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        if self._map is not None:
+            try:
+                self._map.close()
+            except BufferError:
+                pass
+            self._map = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class SampleHistory:
+    """All finalized binary segments of a BatchWriter directory, in order."""
+
+    def __init__(self, directory, prefix="samples"):
+        pattern = os.path.join(str(directory), f"{prefix}-*.bin")
+        self.files = [SampleFile(path) for path in sorted(glob.glob(pattern))]
+
+    def __len__(self):
+        return sum(len(f) for f in self.files)
+
+    def between(self, start, end):
+        """SampleSlices covering start <= timestamp < end, segment by segment."""
+        for f in self.files:
+            if not len(f) or f.last < start or f.first >= end:
+                continue
+            part = f.between(start, end)
+            if len(part):
+                yield part
+
+    def close(self):
+        for f in self.files:
+            f.close()
+        self.files = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,170 @@
+"""
+Multi-button input groups read in one operation
+===============================================
+
+Polling a panel of buttons with one DigitalInOut each costs one
+``.value`` property call (and one GPIO read) per button per iteration.
+An InputGroup reads every configured pin at once and returns a bit mask,
+bit i set while button i is pressed:
+
+    BUTTON_PINS = (board.D17, board.D27, board.D22, board.D23)
+
+    buttons = open_input_group(BUTTON_PINS)
+    try:
+        while True:
+            changed = buttons.poll()
+            for i in buttons.bits(changed & buttons.state):
+                print(f"Bouton {i} appuye!")
+            time.sleep(0.05)
+    finally:
+        buttons.close()
+
+Backends (same read() -> mask interface):
+    GpiodLines      one libgpiod v2 line request; read() is a single
+                    get_values() call for all the lines
+    DigitalioPins   one digitalio.DigitalInOut per pin (fallback)
+
+Changes are found with XOR against the previous mask, so a poll with
+nothing new costs one read and one integer operation.
+"""
+
+from loopkit.edge import find_gpio_chip
+
+
+def pin_number(pin):
+    """GPIO line number of a board pin (board.D17 -> 17) or an int."""
+    return pin if isinstance(pin, int) else pin.id
+
+
+# ---------------------------------------------------------------------------
+# Backends
+# ---------------------------------------------------------------------------
+class GpiodLines:
+    """All the lines in one libgpiod v2 request, pull-up, active low."""
+
+    mode = "bulk"
+
+    def __init__(self, lines, chip_path=None, consumer="loopkit"):
+        import gpiod
+        from gpiod.line import Bias, Direction, Value
+
+        self.lines = tuple(lines)
+        self.active = Value.ACTIVE
+        settings = gpiod.LineSettings(direction=Direction.INPUT, bias=Bias.PULL_UP, active_low=True)
+        self.request = gpiod.request_lines(
+            chip_path or find_gpio_chip(),
+            consumer=consumer,
+            config={self.lines: settings},
+        )
+
+    def read(self):
+        mask = 0
+        bit = 1
+        active = self.active
+        for value in self.request.get_values(self.lines):
+            if value == active:
+                mask |= bit
+            bit <<= 1
+        return mask
+
+    def close(self):
+        self.request.release()
+
+
+class DigitalioPins:
+    """One digitalio.DigitalInOut per pin, pull-up (pressed reads False)."""
+
+    mode = "digitalio"
+
+    def __init__(self, pins):
+        import board
+        import digitalio
+
+        self.pins = []
+        for pin in pins:
+            if isinstance(pin, int):
+                pin = getattr(board, f"D{pin}")
+            io = digitalio.DigitalInOut(pin)
+            io.direction = digitalio.Direction.INPUT
+            io.pull = digitalio.Pull.UP
+            self.pins.append(io)
+
+    def read(self):
+        mask = 0
+        bit = 1
+        for io in self.pins:
+            if not io.value:
+                mask |= bit
+            bit <<= 1
+        return mask
+
+    def close(self):
+        for io in self.pins:
+            io.deinit()
+
+
+# ---------------------------------------------------------------------------
+# Input Group
+# ---------------------------------------------------------------------------
+class InputGroup:
+    """Bit mask state of a set of buttons, with XOR change detection."""
+
+    def __init__(self, backend, size):
+        self.backend = backend
+        self.size = size
+        self.state = 0
+        self.polls = 0
+
+    @property
+    def mode(self):
+        return self.backend.mode
+
+    def poll(self):
+        """Read all the pins; return the mask of buttons that changed."""
+        mask = self.backend.read()
+        changed = mask ^ self.state
+        self.state = mask
+        self.polls += 1
+        return changed
+
+    def pressed(self, changed):
+        """Buttons in changed that are now pressed."""
+        return changed & self.state
+
+    def released(self, changed):
+        """Buttons in changed that are now released."""
+        return changed & ~self.state
+
+    def is_pressed(self, index):
+        return bool(self.state >> index & 1)
+
+    @staticmethod
+    def bits(mask):
+        """Indexes of the set bits of mask, lowest first."""
+        index = 0
+        while mask:
+            if mask & 1:
+                yield index
+            mask >>= 1
+            index += 1
+
+    def close(self):
+        self.backend.close()
+
+
+def open_input_group(pins, chip_path=None):
+    """
+    InputGroup over pins (board pins or line numbers): one gpiod line
+    request when libgpiod v2 is usable, else one DigitalInOut per pin.
+    """
+    pins = tuple(pins)
+    try:
+        import gpiod
+    except ImportError:
+        gpiod = None
+    if gpiod is not None and hasattr(gpiod, "request_lines"):
+        try:
+            return InputGroup(GpiodLines([pin_number(p) for p in pins], chip_path), len(pins))
+        except (OSError, ValueError):
+            pass
+    return InputGroup(DigitalioPins(pins), len(pins))
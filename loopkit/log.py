@@ -0,0 +1,229 @@
+"""
+Buffered, rate-limited logging for the main loop
+================================================
+
+print() in the loop is a synchronous write to stdout: under journald or a
+slow serial console each call blocks the loop for as long as the write
+takes, and a failing sensor prints the same error at every interval.
+Logger keeps the calls in the loop cheap:
+
+    log = Logger()                                # text on sys.stdout
+    ...
+    log.warn("Erreur lecture: %s", e)             # stored, not formatted
+    ...
+    log.drain()                                   # after the timing-critical part
+    ...
+    finally:
+        log.close()
+
+log(level, msg, *args) stores (time, level, msg, args) in a ring of
+``size`` preallocated slots; the message is formatted (``msg % args``,
+as in the logging module) and written only by drain(), in one write.
+When the ring is full the oldest records are overwritten and the next
+drain() says how many were lost. log() and drain() are meant to be
+called from the same thread (the main loop).
+
+Rate limiting: at limit_level (WARN) and above, each message template
+(or the key= argument) may log ``burst`` records per ``period`` seconds.
+Further records are counted, and the first record of that key after the
+period carries "(suppressed N)". close() writes a last "(suppressed N)"
+record for the keys still holding suppressed messages.
+
+Formats:
+    text    ``[PASS]``/``[FAIL]``/``[WARN]``/``[INFO]`` lines, in the
+            validate_pi.py colors when color is on (default: when the
+            stream is a terminal)
+    plain   the message alone, as print() would write it (the loop
+            programs in loopkit, whose output matches the README's)
+    json    one JSON object per line:
+            {"t": 1700000000.123, "level": "warn", "msg": "...", "suppressed": 3}
+
+write(level, msg, *args) formats and writes at once, without the ring or
+the rate limit, for code outside the loop such as validate_pi.py.
+"""
+
+import sys
+import time
+
+from loopkit.startup import lazy_import
+
+json = lazy_import("json")  # only needed by the json format
+
+
+DEBUG = 10
+INFO = 20
+PASS = 25
+WARN = 30
+FAIL = 40
+
+NAMES = {DEBUG: "DEBUG", INFO: "INFO", PASS: "PASS", WARN: "WARN", FAIL: "FAIL"}
+COLORS = {DEBUG: "", INFO: "\033[94m", PASS: "\033[92m", WARN: "\033[93m", FAIL: "\033[91m"}
+END = "\033[0m"
+
+FORMATS = ("text", "plain", "json")
+MAX_KEYS = 256  # rate-limit entries kept before starting over
+
+
+class Logger:
+    """Ring-buffered records, formatted on drain(), rate-limited per message."""
+
+    def __init__(self, size=256, stream=None, fmt="text", color=None, level=INFO,
+                 burst=5, period=60.0, limit_level=WARN, clock=None, wall_clock=None):
+        if fmt not in FORMATS:
+            raise ValueError(f"unknown log format: {fmt!r}")
+        self.size = size
+        self.stream = stream  # None: sys.stdout at write time
+        self.format = fmt
+        self.color = color
+        self.level = level
+        self.burst = burst
+        self.period = period
+        self.limit_level = limit_level
+        self.clock = clock or time.monotonic
+        self.offset = (wall_clock or time.time)() - self.clock()  # monotonic -> epoch
+
+        self._times = [0.0] * size
+        self._levels = [0] * size
+        self._msgs = [None] * size
+        self._args = [None] * size
+        self._suppressed = [0] * size
+        self._head = 0
+        self._pending = 0
+        self._limits = {}  # key -> [window start, count, suppressed, level, msg, args]
+
+        self.lost = 0
+        self.suppressed = 0
+        self.written = 0
+
+    # -- recording (main loop) ---------------------------------------------
+    def log(self, level, msg, *args, key=None):
+        """Queue a record; msg % args is only formatted by drain()."""
+        if level < self.level:
+            return
+        now = self.clock()
+        suppressed = 0
+        if self.burst and level >= self.limit_level:
+            key = msg if key is None else key
+            limit = self._limits.get(key)
+            if limit is None:
+                if len(self._limits) >= MAX_KEYS:
+                    self._limits.clear()
+                self._limits[key] = [now, 1, 0, level, msg, args]
+            elif now - limit[0] >= self.period:
+                suppressed = limit[2]
+                limit[0], limit[1], limit[2] = now, 1, 0
+            elif limit[1] < self.burst:
+                limit[1] += 1
+            else:
+                limit[2] += 1
+                limit[3], limit[4], limit[5] = level, msg, args
+                self.suppressed += 1
+                return
+
+        i = self._head
+        self._times[i] = now
+        self._levels[i] = level
+        self._msgs[i] = msg
+        self._args[i] = args
+        self._suppressed[i] = suppressed
+        self._head = (i + 1) % self.size
+        if self._pending == self.size:
+            self.lost += 1  # overwrote the oldest record
+        else:
+            self._pending += 1
+
+    def debug(self, msg, *args, key=None):
+        self.log(DEBUG, msg, *args, key=key)
+
+    def info(self, msg, *args, key=None):
+        self.log(INFO, msg, *args, key=key)
+
+    def success(self, msg, *args, key=None):
+        self.log(PASS, msg, *args, key=key)
+
+    def warn(self, msg, *args, key=None):
+        self.log(WARN, msg, *args, key=key)
+
+    def fail(self, msg, *args, key=None):
+        self.log(FAIL, msg, *args, key=key)
+
+    @property
+    def pending(self):
+        return self._pending
+
+    # -- output (outside the critical section) -----------------------------
+    def drain(self, limit=None):
+        """Format and write up to limit queued records (all by default)."""
+        if not self._pending and not self.lost:
+            return 0  # called once per loop pass: keep the idle case cheap
+        lines = []
+        if self.lost:
+            lines.append(self._line(self.clock(), WARN,
+                                    f"{self.lost} log records lost (buffer full)", 0))
+            self.lost = 0
+
+        count = self._pending if limit is None else min(limit, self._pending)
+        start = (self._head - self._pending) % self.size
+        for k in range(count):
+            i = (start + k) % self.size
+            text = self._text(self._msgs[i], self._args[i])
+            lines.append(self._line(self._times[i], self._levels[i], text, self._suppressed[i]))
+            self._msgs[i] = self._args[i] = None
+        self._pending -= count
+
+        self._emit(lines)
+        return count
+
+    def write(self, level, msg, *args):
+        """Format and write one record now (no ring, no rate limit)."""
+        if level >= self.level:
+            self._emit([self._line(self.clock(), level, self._text(msg, args), 0)])
+
+    def close(self):
+        """Drain, then report what the rate limit still holds back."""
+        self.drain()
+        now = self.clock()
+        lines = []
+        for limit in self._limits.values():
+            if limit[2]:
+                text = self._text(limit[4], limit[5])
+                lines.append(self._line(now, limit[3], text, limit[2]))
+                limit[2] = 0
+        self._emit(lines)
+        stream = self.stream or sys.stdout
+        stream.flush()
+
+    # -- formatting --------------------------------------------------------
+    @staticmethod
+    def _text(msg, args):
+        if not args:
+            return str(msg)
+        try:
+            return msg % args
+        except (TypeError, ValueError):
+            return f"{msg} {args!r}"
+
+    def _line(self, t, level, text, suppressed):
+        name = NAMES.get(level, str(level))
+        if self.format == "json":
+            record = {"t": round(t + self.offset, 6), "level": name.lower(), "msg": text}
+            if suppressed:
+                record["suppressed"] = suppressed
+            return json.dumps(record) + "\n"
+        line = text if self.format == "plain" else f"[{name}] {text}"
+        if suppressed:
+            line += f" (suppressed {suppressed})"
+        if self.format == "text" and self._use_color():
+            line = f"{COLORS.get(level, '')}{line}{END}"
+        return line + "\n"
+
+    def _use_color(self):
+        if self.color is not None:
+            return self.color
+        isatty = getattr(self.stream or sys.stdout, "isatty", None)
+        return bool(isatty and isatty())
+
+    def _emit(self, lines):
+        if lines:
+            (self.stream or sys.stdout).write("".join(lines))
+            self.written += len(lines)
@@ -0,0 +1,119 @@
+"""
+Drift-free periodic timer
+=========================
+
+The README loop does ``previous_sensor = current_time`` after each read,
+so every cycle starts late by the read duration plus loop jitter and the
+schedule drifts. PeriodicTimer schedules against absolute deadlines
+(start + k * interval) instead:
+
+    sensor_timer = PeriodicTimer(SENSOR_INTERVAL)
+    while True:
+        current_time = time.monotonic()
+        if sensor_timer.due(current_time):
+            read_sensor(sensor)
+        ...
+
+When the loop overruns one or more deadlines, the policy decides what
+happens: SKIP fires once and jumps to the next future deadline (keeping
+the phase), CATCH_UP fires once per missed deadline.
+
+Lateness (firing time minus deadline) is tracked: drift is its mean,
+jitter its standard deviation.
+"""
+
+import math
+import time
+
+
+SKIP = "skip"
+CATCH_UP = "catch_up"
+
+
+class PeriodicTimer:
+    """Fire every interval seconds on absolute time.monotonic() deadlines."""
+
+    def __init__(self, interval, start=None, policy=SKIP, clock=None):
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        if policy not in (SKIP, CATCH_UP):
+            raise ValueError(f"unknown policy: {policy!r}")
+        self.interval = interval
+        self.policy = policy
+        self.clock = clock or time.monotonic
+        self.start = self.clock() if start is None else start
+        self.deadline = self.start + interval
+        self.fired = 0
+        self.skipped = 0
+        self.max_lateness = 0.0
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    @classmethod
+    def aligned(cls, interval, policy=SKIP, clock=None, wall_clock=None):
+        """Timer whose deadlines fall on wall-clock multiples of interval,
+        so devices with synchronized clocks sample at the same instants."""
+        clock = clock or time.monotonic
+        wall_clock = wall_clock or time.time
+        now = clock()
+        start = now - (wall_clock() % interval)
+        return cls(interval, start=start, policy=policy, clock=clock)
+
+    def due(self, now=None):
+        """True when a deadline has passed; advances to the next one."""
+        if now is None:
+            now = self.clock()
+        if now < self.deadline:
+            return False
+
+        lateness = now - self.deadline
+        self._record(lateness)
+
+        if self.policy == CATCH_UP:
+            self.deadline += self.interval
+        else:
+            missed = int(lateness // self.interval)
+            self.skipped += missed
+            self.deadline += (missed + 1) * self.interval
+        return True
+
+    def remaining(self, now=None):
+        """Seconds until the next deadline (negative when overdue)."""
+        if now is None:
+            now = self.clock()
+        return self.deadline - now
+
+    def reset(self, now=None):
+        """Restart the schedule from now, keeping the statistics."""
+        self.start = self.clock() if now is None else now
+        self.deadline = self.start + self.interval
+
+    # -- statistics --------------------------------------------------------
+    def _record(self, lateness):
+        self.fired += 1
+        delta = lateness - self._mean
+        self._mean += delta / self.fired
+        self._m2 += delta * (lateness - self._mean)
+        if lateness > self.max_lateness:
+            self.max_lateness = lateness
+
+    @property
+    def drift(self):
+        """Mean lateness in seconds."""
+        return self._mean
+
+    @property
+    def jitter(self):
+        """Standard deviation of lateness in seconds."""
+        return math.sqrt(self._m2 / self.fired) if self.fired else 0.0
+
+    def stats(self):
+        return {
+            "interval": self.interval,
+            "policy": self.policy,
+            "fired": self.fired,
+            "skipped": self.skipped,
+            "drift": self.drift,
+            "jitter": self.jitter,
+            "max_lateness": self.max_lateness,
+        }
@@ -0,0 +1,191 @@
+"""
+Loop timing instrumentation
+===========================
+
+LoopProfiler records, into preallocated HDR-style histograms:
+
+- the duration of each loop iteration,
+- the lateness of each periodic task (when it ran vs. its deadline),
+- the latency of each sensor read,
+- free-form counters (errors, retries...).
+
+    profiler = LoopProfiler(enabled=True)
+    try:
+        while True:
+            profiler.begin()
+            ...
+            profiler.sensor(read_duration)
+            profiler.end()
+    finally:
+        button.deinit()
+        profiler.dump()                     # text summary
+        Path("loop.json").write_text(profiler.to_json())
+
+A disabled profiler replaces its hooks with a no-op, so leaving the calls
+in the loop costs well under 1 us per iteration.
+
+Histograms are log-linear: 16 sub-buckets per power of two of
+microseconds (about 6 % resolution) from 1 us to about 36 minutes, in one
+fixed array('Q'). Longer durations land in the last bucket, whose
+percentiles report the recorded maximum. Recording never allocates.
+"""
+
+import sys
+import time
+from array import array
+
+from loopkit.startup import lazy_import
+
+json = lazy_import("json")  # only needed by to_json()
+
+
+SUB_BUCKETS = 16
+MAX_SHIFT = 26  # top bucket ends at 32 << 26 us ~ 36 minutes
+BUCKETS = (MAX_SHIFT + 2) * SUB_BUCKETS
+
+
+def _noop(*args):
+    pass
+
+
+# ---------------------------------------------------------------------------
+# Histogram
+# ---------------------------------------------------------------------------
+class Histogram:
+    """Fixed-size log-linear histogram of durations in seconds."""
+
+    def __init__(self):
+        self.counts = array("Q", bytes(8 * BUCKETS))
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    @staticmethod
+    def index(micros):
+        if micros < 2 * SUB_BUCKETS:
+            return micros if micros > 0 else 0
+        shift = micros.bit_length() - 5
+        return min((shift + 1) * SUB_BUCKETS + (micros >> shift) - SUB_BUCKETS, BUCKETS - 1)
+
+    @staticmethod
+    def lower_bound(index):
+        """Smallest value (us) that falls in bucket index."""
+        if index < 2 * SUB_BUCKETS:
+            return index
+        shift = index // SUB_BUCKETS - 1
+        return (index % SUB_BUCKETS + SUB_BUCKETS) << shift
+
+    def record(self, seconds):
+        self.counts[self.index(int(seconds * 1e6))] += 1
+        self.count += 1
+        self.total += seconds
+        if self.min is None or seconds < self.min:
+            self.min = seconds
+        if self.max is None or seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, p):
+        """Upper edge (seconds) of the bucket holding the p-th percentile."""
+        if not self.count:
+            return None
+        rank = max(1, int(round(p / 100 * self.count)))
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                if i == BUCKETS - 1:
+                    return self.max  # overflow bucket: no upper edge
+                return min(self.lower_bound(i + 1) / 1e6, self.max)
+        return self.max
+
+    def summary(self):
+        if not self.count:
+            return {"count": 0}
+        return {
+            "count": self.count,
+            "mean": self.total / self.count,
+            "min": self.min,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "max": self.max,
+        }
+
+
+# ---------------------------------------------------------------------------
+# Profiler
+# ---------------------------------------------------------------------------
+class LoopProfiler:
+    """Per-iteration, per-task and sensor timing for the main loop."""
+
+    def __init__(self, enabled=True, clock=None, tasks=()):
+        self.enabled = enabled
+        self.clock = clock or time.perf_counter
+        self.iterations = Histogram()
+        self.sensor_reads = Histogram()
+        self.tasks = {name: Histogram() for name in tasks}
+        self.counters = {}
+        self._start = None
+        if not enabled:
+            self.begin = self.end = self.sensor = self.lateness = self.count = _noop
+
+    # -- hooks -------------------------------------------------------------
+    def begin(self):
+        """Mark the start of a loop iteration."""
+        self._start = self.clock()
+
+    def end(self):
+        """Mark the end of a loop iteration."""
+        if self._start is not None:
+            self.iterations.record(self.clock() - self._start)
+            self._start = None
+
+    def lateness(self, task, seconds):
+        """Record how late task ran relative to its deadline."""
+        histogram = self.tasks.get(task)
+        if histogram is None:
+            histogram = self.tasks[task] = Histogram()
+        histogram.record(max(seconds, 0.0))
+
+    def sensor(self, seconds):
+        """Record the duration of one sensor read."""
+        self.sensor_reads.record(seconds)
+
+    def count(self, name, n=1):
+        """Add n to counter name."""
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    # -- export ------------------------------------------------------------
+    def snapshot(self):
+        return {
+            "iterations": self.iterations.summary(),
+            "sensor_reads": self.sensor_reads.summary(),
+            "task_lateness": {name: h.summary() for name, h in self.tasks.items()},
+            "counters": dict(self.counters),
+        }
+
+    def to_json(self):
+        return json.dumps(self.snapshot(), indent=2)
+
+    def dump(self, file=None):
+        """Print a short human-readable summary (for the finally: block)."""
+        file = file or sys.stdout
+
+        def line(label, summary):
+            if not summary["count"]:
+                return f"  {label:<22} -"
+            return (
+                f"  {label:<22} n={summary['count']:<7} "
+                f"p50={summary['p50'] * 1000:.3f}ms p99={summary['p99'] * 1000:.3f}ms "
+                f"max={summary['max'] * 1000:.3f}ms"
+            )
+
+        snapshot = self.snapshot()
+        print("Profil de la boucle:", file=file)
+        print(line("iteration", snapshot["iterations"]), file=file)
+        print(line("lecture capteur", snapshot["sensor_reads"]), file=file)
+        for name, summary in snapshot["task_lateness"].items():
+            print(line(f"retard {name}", summary), file=file)
+        for name, value in snapshot["counters"].items():
+            print(f"  {name:<22} {value}", file=file)
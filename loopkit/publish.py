@@ -0,0 +1,405 @@
+"""
+Non-blocking publish path for sensor samples
+============================================
+
+Opening a connection per sample, or publishing synchronously from the
+timer loop, stalls button handling for a network round trip. Publisher
+moves all of it to one background thread:
+
+    publisher = Publisher(LocalBroker().connect, topic="f4/capteur")
+    ...
+    def read_sensor(sensor):
+        ...
+        publish_data(publisher, {"temperature": temperature, "humidity": humidity})
+    ...
+    finally:
+        publisher.close()
+
+publish() only appends to the outbox and wakes the worker, so it costs
+microseconds whatever the network does. The worker:
+
+- keeps one connection open and reuses it for every message,
+- sends samples in batches (one message holding a JSON list) when
+  max_batch samples are waiting or the oldest is max_age seconds old,
+- on a failure, keeps the last outbox_size samples in memory, appends
+  older ones to spill_dir/outbox.jsonl, and reconnects every retry
+  seconds; spilled samples are sent first once the connection is back,
+  so the order is kept.
+
+A connection is any object with connect(), publish(topic, payload) and
+close(); connect() and publish() raise ConnectionError when they fail.
+LocalBroker is an in-process stand-in (with an ``online`` switch to
+simulate outages); MqttConnection wraps paho-mqtt when it is installed.
+Whatever a connection raises, the batch being sent is kept and the
+connection is opened again.
+
+Only the worker takes samples out of the outbox. When it falls more
+than 2 * outbox_size samples behind (a stuck disk), publish() drops the
+new sample instead and counts it as overflow.
+"""
+
+import collections
+import json
+import os
+import threading
+import time
+
+
+SPILL_FILE = "outbox.jsonl"
+
+
+def publish_data(client, data):
+    """Queue data (a dict) for publishing; never blocks the loop."""
+    client.publish(data)
+
+
+# ---------------------------------------------------------------------------
+# Connections
+# ---------------------------------------------------------------------------
+class LocalBroker:
+    """In-process broker: records messages; offline means connection errors."""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.online = True
+        self.messages = []
+        self.connections = 0
+        self.lock = threading.Lock()
+
+    def connect(self):
+        """A new (not yet connected) LocalConnection to this broker."""
+        return LocalConnection(self)
+
+    def samples(self, topic=None):
+        """All samples received (batches unpacked), in order."""
+        with self.lock:
+            messages = list(self.messages)
+        return [
+            sample
+            for t, payload in messages
+            if topic is None or t == topic
+            for sample in json.loads(payload)
+        ]
+
+
+class LocalConnection:
+    def __init__(self, broker):
+        self.broker = broker
+        self.connected = False
+
+    def connect(self):
+        if not self.broker.online:
+            raise ConnectionError("broker unreachable")
+        with self.broker.lock:
+            self.broker.connections += 1
+        self.connected = True
+
+    def publish(self, topic, payload):
+        broker = self.broker
+        if not self.connected or not broker.online:
+            self.connected = False
+            raise ConnectionError("connection lost")
+        if broker.latency:
+            time.sleep(broker.latency)
+        with broker.lock:
+            broker.messages.append((topic, payload))
+
+    def close(self):
+        self.connected = False
+
+
+class MqttConnection:
+    """
+    paho-mqtt client (pip install paho-mqtt), QoS 1.
+
+    Every paho error (an exception or an error rc) is raised as
+    ConnectionError. After a failed or timed-out publish the client is
+    discarded, so paho does not send the message again on its own while
+    the Publisher resends the batch.
+    """
+
+    def __init__(self, host, port=1883, client_id="", keepalive=60, timeout=5.0):
+        import paho.mqtt.client as mqtt
+
+        self.mqtt = mqtt
+        self.host = host
+        self.port = port
+        self.client_id = client_id
+        self.keepalive = keepalive
+        self.timeout = timeout
+        self.client = None
+
+    def connect(self):
+        if self.client is not None:
+            self.close()
+        client = self.mqtt.Client(client_id=self.client_id)
+        try:
+            rc = client.connect(self.host, self.port, self.keepalive)
+        except (OSError, ValueError, RuntimeError) as e:
+            raise ConnectionError(f"connect failed: {e}") from e
+        if rc != self.mqtt.MQTT_ERR_SUCCESS:
+            raise ConnectionError(f"connect failed (rc={rc})")
+        client.loop_start()
+        self.client = client
+
+    def publish(self, topic, payload):
+        if self.client is None:
+            raise ConnectionError("not connected")
+        try:
+            info = self.client.publish(topic, payload, qos=1)
+            if info.rc == self.mqtt.MQTT_ERR_SUCCESS:
+                info.wait_for_publish(self.timeout)
+        except (OSError, ValueError, RuntimeError) as e:
+            self.close()
+            raise ConnectionError(f"publish failed: {e}") from e
+        if info.rc != self.mqtt.MQTT_ERR_SUCCESS or not info.is_published():
+            self.close()  # timed out: drop paho's copy, the batch is resent
+            raise ConnectionError(f"publish failed (rc={info.rc})")
+
+    def close(self):
+        client, self.client = self.client, None
+        if client is not None:
+            try:
+                client.loop_stop()
+                client.disconnect()
+            except (OSError, ValueError, RuntimeError):
+                pass
+
+
+# ---------------------------------------------------------------------------
+# Publisher
+# ---------------------------------------------------------------------------
+class Publisher:
+    """Batching publisher with a bounded outbox, run by a worker thread."""
+
+    def __init__(self, connect, topic="f4/capteur", max_batch=10, max_age=5.0,
+                 outbox_size=1000, spill_dir=None, retry=2.0, clock=None):
+        self.connection = None
+        self._connect = connect
+        self.topic = topic
+        self.max_batch = max_batch
+        self.max_age = max_age
+        self.outbox_size = outbox_size
+        self.spill_path = os.path.join(str(spill_dir), SPILL_FILE) if spill_dir else None
+        self.retry = retry
+        self.clock = clock or time.monotonic
+
+        self.outbox = collections.deque()  # (queued_at, data)
+        self.connected = False
+        self.stats = {
+            "queued": 0, "sent": 0, "batches": 0, "connects": 0,
+            "failures": 0, "spilled": 0, "replayed": 0, "dropped": 0, "overflow": 0,
+        }
+
+        self._wake = threading.Event()
+        # flush() requests are numbered; the worker answers every request
+        # made before the pass that served them started.
+        self._flushed = threading.Condition()
+        self._flush_requested = 0
+        self._flush_served = 0
+        self._stopping = False
+        self._next_attempt = 0.0
+        self._thread = threading.Thread(target=self._run, name="publisher", daemon=True)
+        self._thread.start()
+
+    # -- main loop side ----------------------------------------------------
+    def publish(self, data):
+        """Queue one sample (no I/O, no waiting)."""
+        outbox = self.outbox
+        self.stats["queued"] += 1
+        if len(outbox) >= 2 * self.outbox_size:
+            # The worker is stuck (e.g. slow disk). Only the worker takes
+            # samples out of the outbox, so this one is dropped.
+            self.stats["overflow"] += 1
+            self._wake.set()
+            return
+        outbox.append((self.clock(), data))
+        size = len(outbox)
+        if size == 1 or size >= self.max_batch or size > self.outbox_size:
+            self._wake.set()  # start the max_age timer / batch full / spill
+
+    def flush(self, timeout=5.0):
+        """Ask the worker to send everything now; True when the outbox drained."""
+        with self._flushed:
+            self._flush_requested += 1
+            request = self._flush_requested
+        self._wake.set()
+        with self._flushed:
+            served = self._flushed.wait_for(lambda: self._flush_served >= request, timeout)
+        return served and not self.outbox
+
+    def close(self, timeout=5.0):
+        """Send what can be sent within timeout, spill the rest, disconnect."""
+        self.flush(timeout)
+        self._stopping = True
+        self._wake.set()
+        self._thread.join(timeout)
+
+    # -- worker ------------------------------------------------------------
+    def _run(self):
+        while True:
+            self._wake.wait(self._timeout())
+            self._wake.clear()
+            try:
+                self._work()
+            except Exception:
+                self.stats["failures"] += 1
+            if self._stopping:
+                self._shutdown()
+                return
+
+    def _timeout(self):
+        if not self.connected:
+            return self.retry
+        if self.outbox:
+            return max(0.0, self.outbox[0][0] + self.max_age - self.clock())
+        return None
+
+    def _work(self):
+        # A flush requested while this pass runs waits for the next one.
+        request = self._flush_requested
+        try:
+            self._drain(flush=request > self._flush_served)
+        finally:
+            # Answered whether or not the drain succeeded: after a failure
+            # the next attempt waits retry seconds again.
+            self._serve_flush(request)
+
+    def _drain(self, flush):
+        if not self._ensure_connected(flush):
+            self._spill_overflow()
+            return
+        if not self._replay_spilled():
+            return
+        while self.outbox and (flush or self._batch_due()):
+            if not self._send(self._take_batch()):
+                return
+
+    def _serve_flush(self, request):
+        with self._flushed:
+            self._flush_served = max(self._flush_served, request)
+            self._flushed.notify_all()
+
+    def _batch_due(self):
+        return (len(self.outbox) >= self.max_batch
+                or self.clock() - self.outbox[0][0] >= self.max_age)
+
+    def _take_batch(self):
+        batch = []
+        while self.outbox and len(batch) < self.max_batch:
+            batch.append(self.outbox.popleft())
+        return batch
+
+    def _ensure_connected(self, flush=False):
+        if self.connected:
+            return True
+        if not flush and self.clock() < self._next_attempt:
+            return False  # wait retry seconds between attempts
+        try:
+            if self.connection is None:
+                self.connection = self._connect()
+            self.connection.connect()
+        except Exception:
+            self.stats["failures"] += 1
+            self._next_attempt = self.clock() + self.retry
+            return False
+        self.connected = True
+        self.stats["connects"] += 1
+        return True
+
+    def _send(self, batch):
+        """Publish batch as one message; put it back in front on failure."""
+        try:
+            payload = json.dumps([data for _, data in batch])
+        except (TypeError, ValueError):
+            self.stats["dropped"] += len(batch)  # not JSON: would never go out
+            return True
+        try:
+            self.connection.publish(self.topic, payload)
+        except Exception:
+            self.connected = False
+            self.stats["failures"] += 1
+            self.outbox.extendleft(reversed(batch))
+            self._spill_overflow()
+            return False
+        self.stats["sent"] += len(batch)
+        self.stats["batches"] += 1
+        return True
+
+    # -- spilling ----------------------------------------------------------
+    def _spill_overflow(self):
+        """Move the oldest samples beyond outbox_size to the spill file."""
+        excess = len(self.outbox) - self.outbox_size
+        if excess <= 0:
+            return
+        batch = [self.outbox.popleft() for _ in range(excess)]
+        if self.spill_path is None:
+            self.stats["dropped"] += len(batch)
+            return
+        os.makedirs(os.path.dirname(self.spill_path), exist_ok=True)
+        with open(self.spill_path, "a") as f:
+            f.writelines(json.dumps([t, data]) + "\n" for t, data in batch)
+        self.stats["spilled"] += len(batch)
+
+    def _replay_spilled(self):
+        """Send spilled samples first; False when the connection failed."""
+        if self.spill_path is None:
+            return True
+        replay_path = self.spill_path + ".replay"
+        if os.path.exists(replay_path):
+            self._restore_spill(replay_path)  # left over by an interrupted replay
+        while os.path.exists(self.spill_path):
+            # Replay from a renamed file so the outbox can keep spilling
+            # (to a fresh spill file) while the backlog is being sent.
+            os.replace(self.spill_path, replay_path)
+            with open(replay_path) as f:
+                spilled = [tuple(json.loads(line)) for line in f if line.strip()]
+
+            sent = 0
+            while sent < len(spilled):
+                batch = spilled[sent:sent + self.max_batch]
+                try:
+                    self.connection.publish(self.topic, json.dumps([data for _, data in batch]))
+                except Exception:
+                    self.connected = False
+                    self.stats["failures"] += 1
+                    self._restore_spill(replay_path, spilled[sent:])
+                    self._spill_overflow()
+                    return False
+                sent += len(batch)
+                self.stats["sent"] += len(batch)
+                self.stats["replayed"] += len(batch)
+                self.stats["batches"] += 1
+                self._spill_overflow()
+            os.remove(replay_path)
+        return True
+
+    def _restore_spill(self, replay_path, remaining=None):
+        """Put unsent replayed samples back in front of those spilled since."""
+        if remaining is None:
+            with open(replay_path) as f:
+                lines = [line for line in f if line.strip()]
+        else:
+            lines = [json.dumps([t, data]) + "\n" for t, data in remaining]
+        if os.path.exists(self.spill_path):
+            with open(self.spill_path) as f:
+                lines.extend(line for line in f if line.strip())
+        tmp = self.spill_path + ".tmp"
+        with open(tmp, "w") as f:
+            f.writelines(lines)
+        os.replace(tmp, self.spill_path)
+        os.remove(replay_path)
+
+    def _shutdown(self):
+        # Whatever is left after the final flush goes to disk.
+        if self.outbox and self.spill_path is not None:
+            size, self.outbox_size = self.outbox_size, 0
+            self._spill_overflow()
+            self.outbox_size = size
+        if self.connection is not None:
+            try:
+                self.connection.close()
+            except Exception:
+                pass
+        self.connected = False
+        self._serve_flush(self._flush_requested)
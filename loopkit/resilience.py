@@ -0,0 +1,169 @@
+"""
+Sensor reads with backoff, a circuit breaker and a bus re-probe
+===============================================================
+
+read_sensor() catches every exception and prints "Erreur lecture", then
+tries again at the next interval. With the AHTx0 unplugged, every
+interval pays a full I2C timeout inside the loop and prints another
+error line. ResilientReader wraps the read instead:
+
+    reader = ResilientReader(lambda: read_values(sensor),
+                             probe=lambda: bus_probe(i2c),
+                             profiler=profiler)
+    ...
+    values = reader.read(now)        # None: failed, or not tried now
+
+- Backoff: after a failure the next attempt waits base, base*factor,
+  ... up to maximum seconds, each reduced by a random jitter fraction so
+  that several devices do not retry in lockstep. The default maximum of
+  10 s retries a missing sensor every other 5 s interval, so it is read
+  again at most about 10 s after it is plugged back. Pass rng (a seeded
+  random.Random) to make the jitter reproducible.
+- CircuitBreaker: after failure_threshold failures in a row it opens and
+  nothing touches the bus until the (backed off) cooldown is over; then
+  it is half-open and one attempt decides between closed and open again.
+- Probe: after a failure, each attempt first calls probe(), a cheap
+  address scan, and only reads when the device answers. A missing sensor
+  therefore costs one read timeout, then one scan per backoff period.
+
+Every outcome is counted with profiler.count() (sensor_ok,
+sensor_errors, sensor_skipped, probe_failed, breaker_open), and each
+attempt's duration is recorded with profiler.sensor(), so they show up
+in the LoopProfiler dump.
+"""
+
+import random
+import time
+
+from loopkit.aht import AHTX0_ADDRESS
+from loopkit.scheduler import NoProfiler
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+def bus_probe(i2c, address=AHTX0_ADDRESS):
+    """True when a device answers at address (one scan, no register access)."""
+    if not i2c.try_lock():
+        return True  # bus in use: assume present and let the read decide
+    try:
+        return address in i2c.scan()
+    except OSError:
+        return False
+    finally:
+        i2c.unlock()
+
+
+# ---------------------------------------------------------------------------
+# Backoff and Circuit Breaker
+# ---------------------------------------------------------------------------
+class Backoff:
+    """Exponential delays with jitter: base * factor**n, capped at maximum."""
+
+    def __init__(self, base=1.0, factor=2.0, maximum=10.0, jitter=0.25, rng=None):
+        self.base = base
+        self.factor = factor
+        self.maximum = maximum
+        self.jitter = jitter
+        self.random = rng or random.Random()
+        self.attempts = 0
+
+    def next(self):
+        """Delay before the next attempt (grows with each call)."""
+        delay = min(self.base * self.factor ** self.attempts, self.maximum)
+        self.attempts += 1
+        return delay * (1.0 - self.jitter * self.random.random())
+
+    def reset(self):
+        self.attempts = 0
+
+
+class CircuitBreaker:
+    """CLOSED -> OPEN after failure_threshold failures, HALF_OPEN after the cooldown."""
+
+    def __init__(self, failure_threshold=3, backoff=None, rng=None):
+        self.failure_threshold = failure_threshold
+        self.backoff = backoff or Backoff(rng=rng)
+        self.state = CLOSED
+        self.failures = 0
+        self.retry_at = 0.0
+        self.opened = 0
+
+    def allow(self, now):
+        """True when an attempt may be made at now."""
+        if now < self.retry_at:
+            return False
+        if self.state == OPEN:
+            self.state = HALF_OPEN
+        return True
+
+    def success(self):
+        self.state = CLOSED
+        self.failures = 0
+        self.retry_at = 0.0
+        self.backoff.reset()
+
+    def failure(self, now):
+        """Record a failed attempt; True when the breaker (re)opened."""
+        self.failures += 1
+        self.retry_at = now + self.backoff.next()
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = OPEN
+            self.opened += 1
+            return True
+        return False
+
+
+# ---------------------------------------------------------------------------
+# Reader
+# ---------------------------------------------------------------------------
+class ResilientReader:
+    """read() guarded by a circuit breaker, a backoff and a bus probe."""
+
+    def __init__(self, read, probe=None, breaker=None, profiler=None, clock=None,
+                 rng=None):
+        self._read = read
+        self.probe = probe
+        self.breaker = breaker or CircuitBreaker(rng=rng)
+        self.profiler = profiler or NoProfiler()
+        self.clock = clock or time.monotonic
+        self.error = None       # exception of the last read() call
+        self.recovered = False  # the last read succeeded after failures
+
+    @property
+    def state(self):
+        return self.breaker.state
+
+    def read(self, now=None):
+        """Values from read(), or None when it failed or was not attempted."""
+        now = self.clock() if now is None else now
+        breaker = self.breaker
+        profiler = self.profiler
+        self.recovered = False
+        self.error = None
+        if not breaker.allow(now):
+            profiler.count("sensor_skipped")
+            return None
+
+        start = self.clock()
+        failed = breaker.failures > 0
+        try:
+            if failed and self.probe is not None and not self.probe():
+                profiler.count("probe_failed")
+                raise OSError(121, "no answer to the bus probe")
+            values = self._read()
+        except Exception as e:
+            self.error = e
+            profiler.sensor(self.clock() - start)
+            profiler.count("sensor_errors")
+            if breaker.failure(now):
+                profiler.count("breaker_open")
+            return None
+
+        profiler.sensor(self.clock() - start)
+        profiler.count("sensor_ok")
+        breaker.success()
+        self.recovered = failed
+        return values
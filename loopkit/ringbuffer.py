@@ -0,0 +1,261 @@
+"""
+Ring-buffer sample store with sliding-window aggregates
+=======================================================
+
+read_sensor() prints temperature and humidity and drops them. SensorHistory
+keeps the last N samples on the device in fixed-size ``array('d')``
+columns (8 bytes per value, no object per sample). It also maintains
+min/max/mean/stddev over sliding time windows (1 min, 15 min, 1 h by
+default) as samples arrive:
+
+    history = SensorHistory(capacity=4096)
+
+    def read_sensor(sensor):
+        try:
+            temperature = sensor.temperature
+            humidity = sensor.relative_humidity
+            history.push(time.monotonic(), temperature, humidity)
+            ...
+
+    history.stats("temperature", 900)   # {'count': ..., 'min': ..., ...}
+
+Each push costs amortized O(1) per window: sums are updated
+incrementally and min/max come from monotonic index queues, so nothing
+rescans the buffer. A window can never hold more than capacity samples.
+The sums are taken around a shift (a recent value) and recomputed once
+every capacity removals, also amortized O(1), so rounding errors do not
+pile up over a long run.
+
+Windows also expire without new pushes: stats() first drops the samples
+older than window seconds before now (the history's clock, by default
+time.monotonic(), the same clock as the push times). A sensor that has
+gone silent shows an empty window (count 0, NaN aggregates) rather than
+its last values.
+"""
+
+import math
+import time
+from array import array
+
+
+COLUMNS = ("temperature", "humidity")
+DEFAULT_WINDOWS = (60, 900, 3600)
+
+
+# ---------------------------------------------------------------------------
+# Ring Buffer
+# ---------------------------------------------------------------------------
+class SampleRing:
+    """Fixed-capacity columns of (t, temperature, humidity) samples."""
+
+    def __init__(self, capacity):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.t = array("d", bytes(8 * capacity))
+        self.columns = {name: array("d", bytes(8 * capacity)) for name in COLUMNS}
+        self.count = 0  # samples ever pushed; the next sequence number
+        self.windows = []
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    @property
+    def oldest(self):
+        """Sequence number of the oldest sample still stored."""
+        return self.count - len(self)
+
+    def push(self, t, temperature, humidity):
+        """Store one sample, overwriting the oldest when full."""
+        seq = self.count
+        if seq >= self.capacity:
+            for window in self.windows:
+                window.forget(seq - self.capacity)
+        slot = seq % self.capacity
+        self.t[slot] = t
+        self.columns["temperature"][slot] = temperature
+        self.columns["humidity"][slot] = humidity
+        self.count = seq + 1
+        for window in self.windows:
+            window.add(seq, t)
+        return seq
+
+    def get(self, seq):
+        """(t, temperature, humidity) of sample seq."""
+        if not self.oldest <= seq < self.count:
+            raise IndexError(f"sample {seq} is not in the buffer")
+        slot = seq % self.capacity
+        return self.t[slot], self.columns["temperature"][slot], self.columns["humidity"][slot]
+
+    def latest(self, n=None):
+        """The last n samples (all stored ones by default), oldest first."""
+        n = len(self) if n is None else min(n, len(self))
+        return [self.get(seq) for seq in range(self.count - n, self.count)]
+
+
+# ---------------------------------------------------------------------------
+# Sliding Window
+# ---------------------------------------------------------------------------
+class _IndexQueue:
+    """Circular deque of sample sequence numbers in an array('q')."""
+
+    def __init__(self, capacity):
+        self.items = array("q", bytes(8 * capacity))
+        self.capacity = capacity
+        self.first = 0
+        self.size = 0
+
+    def front(self):
+        return self.items[self.first]
+
+    def back(self):
+        return self.items[(self.first + self.size - 1) % self.capacity]
+
+    def push_back(self, seq):
+        self.items[(self.first + self.size) % self.capacity] = seq
+        self.size += 1
+
+    def pop_back(self):
+        self.size -= 1
+
+    def pop_front(self):
+        self.first = (self.first + 1) % self.capacity
+        self.size -= 1
+
+
+class WindowStats:
+    """Incremental min/max/mean/stddev of one column over the last window seconds."""
+
+    def __init__(self, ring, column, window):
+        self.ring = ring
+        self.values = ring.columns[column]
+        self.window = window
+        self.tail = ring.count  # oldest sequence number inside the window
+        self.n = 0
+        self._shift = 0.0
+        self._sum = 0.0
+        self._sumsq = 0.0
+        self._removed = 0  # removals since the sums were last recomputed
+        self._min = _IndexQueue(ring.capacity)
+        self._max = _IndexQueue(ring.capacity)
+        ring.windows.append(self)
+
+    def _value(self, seq):
+        return self.values[seq % self.ring.capacity]
+
+    def add(self, seq, t):
+        value = self._value(seq)
+        if self.n == 0:
+            self._shift, self._sum, self._sumsq = value, 0.0, 0.0
+        d = value - self._shift
+        self._sum += d
+        self._sumsq += d * d
+        self.n += 1
+
+        while self._min.size and self._value(self._min.back()) >= value:
+            self._min.pop_back()
+        self._min.push_back(seq)
+        while self._max.size and self._value(self._max.back()) <= value:
+            self._max.pop_back()
+        self._max.push_back(seq)
+
+        # Drop samples that fell out of the time window.
+        ring_t = self.ring.t
+        capacity = self.ring.capacity
+        while self.tail < seq and ring_t[self.tail % capacity] <= t - self.window:
+            self.forget(self.tail)
+
+    def expire(self, now):
+        """Drop the samples taken window seconds or more before now."""
+        ring_t = self.ring.t
+        capacity = self.ring.capacity
+        while self.n and ring_t[self.tail % capacity] <= now - self.window:
+            self.forget(self.tail)
+
+    def forget(self, seq):
+        """Remove sample seq (the oldest) if it is still in the window."""
+        if seq != self.tail or self.n == 0:
+            return
+        d = self._value(seq) - self._shift
+        self._sum -= d
+        self._sumsq -= d * d
+        self.n -= 1
+        self.tail += 1
+        if self._min.size and self._min.front() == seq:
+            self._min.pop_front()
+        if self._max.size and self._max.front() == seq:
+            self._max.pop_front()
+        self._removed += 1
+        if self._removed >= self.ring.capacity:
+            self._recompute()
+
+    def _recompute(self):
+        """Exact sums of the window around its current mean."""
+        self._removed = 0
+        if not self.n:
+            return
+        shift = self.mean
+        total = total_sq = 0.0
+        for seq in range(self.tail, self.tail + self.n):
+            d = self._value(seq) - shift
+            total += d
+            total_sq += d * d
+        self._shift, self._sum, self._sumsq = shift, total, total_sq
+
+    # -- results -----------------------------------------------------------
+    @property
+    def mean(self):
+        return self._shift + self._sum / self.n if self.n else math.nan
+
+    @property
+    def stddev(self):
+        if not self.n:
+            return math.nan
+        variance = (self._sumsq - self._sum * self._sum / self.n) / self.n
+        return math.sqrt(max(variance, 0.0))
+
+    @property
+    def min(self):
+        return self._value(self._min.front()) if self._min.size else math.nan
+
+    @property
+    def max(self):
+        return self._value(self._max.front()) if self._max.size else math.nan
+
+    def stats(self):
+        return {
+            "window": self.window,
+            "count": self.n,
+            "min": self.min,
+            "max": self.max,
+            "mean": self.mean,
+            "stddev": self.stddev,
+        }
+
+
+# ---------------------------------------------------------------------------
+# Sensor History
+# ---------------------------------------------------------------------------
+class SensorHistory:
+    """SampleRing plus sliding windows for temperature and humidity."""
+
+    def __init__(self, capacity=4096, windows=DEFAULT_WINDOWS, clock=None):
+        self.ring = SampleRing(capacity)
+        self.clock = clock or time.monotonic
+        self.windows = {
+            (column, window): WindowStats(self.ring, column, window)
+            for column in COLUMNS
+            for window in windows
+        }
+
+    def __len__(self):
+        return len(self.ring)
+
+    def push(self, t, temperature, humidity):
+        return self.ring.push(t, temperature, humidity)
+
+    def stats(self, column, window, now=None):
+        """Aggregates of column ('temperature' or 'humidity') over the window seconds before now."""
+        stats = self.windows[(column, window)]
+        stats.expire(self.clock() if now is None else now)
+        return stats.stats()
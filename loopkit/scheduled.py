@@ -0,0 +1,168 @@
+"""
+Programme de reference avec le Scheduler (sommeil jusqu'a la prochaine echeance).
+
+Meme comportement que loopkit/reference.py (lecture capteur toutes les
+SENSOR_INTERVAL secondes, detection d'appui, arret apres 2 secondes de
+maintien, Ctrl+C), mais la boucle dort exactement jusqu'a la prochaine
+echeance au lieu de se reveiller toutes les 50 ms quoi qu'il arrive.
+
+Le bouton est attendu sur son front descendant (loopkit.edge, libgpiod
+v2): au repos, la boucle ne se reveille que pour le capteur. Apres un
+appui, le bouton est lu toutes les BUTTON_POLL secondes seulement tant
+qu'il reste enfonce (relachement, rebonds), et l'arret tombe pile
+HOLD_TIME secondes apres le front. Sans libgpiod v2, retour au polling
+toutes les BUTTON_POLL secondes. main(waiter) impose une attente de
+front (par exemple loopkit.sim.SimEdgeWaiter), main(waiter, rng) le
+generateur (random.Random) des delais de reessai du capteur, pour des
+simulations reproductibles.
+
+Le capteur, et le code qui le lit (loopkit.resilience), ne sont crees et
+importes qu'a sa premiere lecture (loopkit.startup), pour que le bouton
+soit surveille des le demarrage.
+
+Les lectures passent par loopkit.resilience.ResilientReader: capteur
+debranche, les essais s'espacent (backoff) puis s'arretent pendant une
+pause (circuit ouvert), et un scan du bus precede chaque nouvel essai.
+Une seule ligne "Erreur lecture" par panne, au lieu d'une par intervalle.
+
+Les messages passent par loopkit.log.Logger (format "plain": memes
+lignes que print): les taches ne font que les mettre en file, et ils sont
+ecrits d'un coup juste avant que la boucle se rendorme, sans retarder
+les autres taches dues. Les erreurs capteur sont limitees en debit.
+
+Avec PROFILE = True, le profil de la boucle (duree des iterations, retard
+des taches, duree des lectures capteur, compteurs d'erreurs) est affiche
+a l'arret.
+"""
+
+import time
+import board
+import digitalio
+
+from loopkit import edge
+from loopkit.log import Logger
+from loopkit.scheduler import STOP, Scheduler
+from loopkit.startup import Deferred, lazy_import
+
+# Importes a la premiere lecture capteur / seulement avec PROFILE
+profiling = lazy_import("loopkit.profiling")
+resilience = lazy_import("loopkit.resilience")
+
+# Configuration
+SENSOR_INTERVAL = 5  # secondes entre lectures
+BUTTON_POLL = 0.05  # secondes entre lectures du bouton
+HOLD_TIME = 2  # secondes de maintien pour arreter
+DEBOUNCE = 0.05  # secondes sans nouvel appui apres un relachement
+PROFILE = False  # afficher le profil de la boucle a l'arret
+BUTTON_PIN = board.D17
+BUTTON_LINE = 17  # meme broche, numero de ligne pour libgpiod
+
+
+def read_values(sensor):
+    """Lire le capteur; les erreurs sont gerees par ResilientReader."""
+    return sensor.temperature, sensor.relative_humidity
+
+
+def main(waiter=None, rng=None):
+    """Fonction principale: taches periodiques sur un Scheduler."""
+    opened = None
+    if waiter is None:
+        waiter = opened = edge.open_edge_waiter(BUTTON_LINE)  # None: polling du bouton
+    adafruit_ahtx0 = lazy_import("adafruit_ahtx0")
+
+    # Bus et capteur crees a la premiere lecture: le bouton est lu des le
+    # demarrage. Le meme bus sert au capteur et au scan de resilience.
+    i2c = Deferred(board.I2C)
+    sensor = Deferred(lambda: adafruit_ahtx0.AHTx0(i2c.get()))
+
+    button = digitalio.DigitalInOut(BUTTON_PIN)
+    button.direction = digitalio.Direction.INPUT
+    button.pull = digitalio.Pull.UP
+
+    profiler = profiling.LoopProfiler(clock=time.monotonic) if PROFILE else None
+    scheduler = Scheduler(waiter=waiter, profiler=profiler)
+    log = Logger(fmt="plain")
+    scheduler.on_idle(log.drain)  # ecrire les messages avant de dormir
+    state = {"last_button": True, "hold": None, "watch": None, "released": None}
+
+    def check_hold(now):
+        # Echeance de maintien: toujours appuye depuis HOLD_TIME secondes
+        if not button.value:
+            log.info("Arret demande (bouton maintenu)...")
+            return STOP
+
+    def poll_button(now):
+        current_button = button.value
+        if state["last_button"] and not current_button:
+            log.info("Bouton appuye!")
+            state["hold"] = scheduler.call_later(HOLD_TIME, check_hold)
+        elif not state["last_button"] and current_button and state["hold"]:
+            state["hold"].cancel()
+            state["hold"] = None
+        state["last_button"] = current_button
+
+    def on_edge(now):
+        # now: heure du front. Rebonds: deja appuye ou relache il y a
+        # moins de DEBOUNCE secondes
+        released = state["released"]
+        if state["watch"] or (released is not None and now - released < DEBOUNCE):
+            return
+        if button.value:
+            # Niveau haut: rebond, sauf si le front date d'une lecture
+            # capteur bloquante (appui court deja termine)
+            if time.monotonic() - now < DEBOUNCE:
+                return
+            log.info("Bouton appuye!")
+            state["released"] = time.monotonic()
+            return
+        log.info("Bouton appuye!")
+        state["hold"] = scheduler.call_at(now + HOLD_TIME, check_hold)
+        state["watch"] = scheduler.every(BUTTON_POLL, watch_release)
+
+    def watch_release(now):
+        # Lecture du bouton seulement pendant l'appui
+        if button.value:
+            state["hold"].cancel()
+            state["watch"].cancel()
+            state["hold"] = state["watch"] = None
+            state["released"] = now
+
+    reader = Deferred(lambda: resilience.ResilientReader(
+        lambda: read_values(sensor),
+        probe=lambda: resilience.bus_probe(i2c.get()),
+        profiler=profiler,
+        rng=rng,
+    ))
+
+    def sensor_task(now):
+        values = reader.read(now)
+        if values is not None:
+            if reader.recovered:
+                log.info("Capteur de retour.")
+            log.info("Temperature: %.1f C, Humidite: %.1f %%", *values)
+        elif reader.error is not None and reader.breaker.failures == 1:
+            log.warn("Erreur lecture: %s", reader.error)
+
+    scheduler.every(SENSOR_INTERVAL, sensor_task, name="sensor")
+    if waiter is None:
+        scheduler.every(BUTTON_POLL, poll_button, first=0)
+    else:
+        scheduler.on_input(on_edge)
+
+    try:
+        scheduler.run()
+    except KeyboardInterrupt:
+        log.info("Arret demande (Ctrl+C)...")
+    finally:
+        button.deinit()
+        if opened:
+            waiter.close()
+        log.drain()
+        if profiler is not None:
+            profiler.dump()
+        log.info("Nettoyage termine.")
+        log.close()
+
+
+if __name__ == "__main__":
+    main()
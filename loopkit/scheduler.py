@@ -0,0 +1,173 @@
+"""
+Deadline-based scheduler for the single main loop
+=================================================
+
+The README loop wakes up every 50 ms whether or not something is due. The
+Scheduler keeps the same single-loop model, but every timer (sensor
+interval, button poll cadence, hold-to-stop window) is a deadline on
+time.monotonic(), and the loop sleeps exactly until the earliest one.
+
+    scheduler = Scheduler()
+    scheduler.every(SENSOR_INTERVAL, lambda now: read_sensor(sensor))
+    scheduler.every(0.05, poll_button)
+    scheduler.run()             # until a callback returns STOP
+
+Callbacks receive the current time. Returning STOP makes run() break out
+of its loop, like the break of the README program.
+
+An optional waiter (see loopkit.edge) replaces the idle sleep: the
+scheduler then waits on an input edge with the deadline as timeout and
+runs the on_input callbacks as soon as the edge happens. They receive the
+time of the edge itself (now minus the latency the waiter reports), so a
+deadline counted from it does not include the time the loop was busy.
+
+on_idle callbacks run each time the loop is about to sleep, after the
+due tasks: the place for work that must not delay them, such as writing
+out queued log lines (loopkit.log.Logger.drain).
+
+An optional LoopProfiler (see loopkit.profiling) records how long each
+pass over the due tasks takes and how late each task ran.
+"""
+
+import heapq
+import itertools
+import time
+
+from loopkit.periodic import SKIP, PeriodicTimer
+
+
+STOP = "stop"
+
+
+def _noop(*args):
+    pass
+
+
+class NoProfiler:
+    """Hooks of a disabled LoopProfiler, without importing loopkit.profiling."""
+
+    enabled = False
+    begin = end = lateness = sensor = count = staticmethod(_noop)
+
+
+class Task:
+    """A scheduled callback; periodic when it has a PeriodicTimer."""
+
+    def __init__(self, name, callback, when, timer=None):
+        self.name = name
+        self.callback = callback
+        self.when = when
+        self.timer = timer
+        self.cancelled = False
+        self.runs = 0
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class Scheduler:
+    """Run callbacks at their deadlines, sleeping until the next one."""
+
+    def __init__(self, clock=None, sleep=None, waiter=None, profiler=None):
+        self.clock = clock or time.monotonic
+        self.sleep = sleep or time.sleep
+        self.waiter = waiter
+        self.profiler = profiler or NoProfiler()
+        self.input_callbacks = []
+        self.idle_callbacks = []
+        self.wakeups = 0
+        self._heap = []
+        self._order = itertools.count()
+        self._stopped = False
+
+    # -- registration ------------------------------------------------------
+    def _push(self, task):
+        heapq.heappush(self._heap, (task.when, next(self._order), task))
+        return task
+
+    def every(self, interval, callback, name=None, first=None, policy=SKIP):
+        """
+        Run callback every interval seconds (first run at now + first).
+
+        Deadlines come from a PeriodicTimer, so they do not drift; policy
+        (SKIP or CATCH_UP) says what to do with missed ones. The timer's
+        drift/jitter statistics are available as task.timer.
+        """
+        delay = interval if first is None else first
+        timer = PeriodicTimer(interval, start=self.clock() + delay - interval,
+                              policy=policy, clock=self.clock)
+        task = Task(name or callback.__name__, callback, timer.deadline, timer)
+        return self._push(task)
+
+    def call_at(self, when, callback, name=None):
+        """Run callback once at monotonic time when."""
+        return self._push(Task(name or callback.__name__, callback, when))
+
+    def call_later(self, delay, callback, name=None):
+        """Run callback once, delay seconds from now."""
+        return self.call_at(self.clock() + delay, callback, name)
+
+    def on_input(self, callback):
+        """Run callback(edge_time) whenever the waiter reports an input edge."""
+        self.input_callbacks.append(callback)
+
+    def on_idle(self, callback):
+        """Run callback() after the due tasks, each time before the loop sleeps."""
+        self.idle_callbacks.append(callback)
+
+    def stop(self):
+        """Make run() return after the current callback."""
+        self._stopped = True
+
+    def next_deadline(self):
+        """Earliest pending deadline, or None when nothing is scheduled."""
+        while self._heap and self._heap[0][2].cancelled:
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    # -- loop --------------------------------------------------------------
+    def run_due(self, now):
+        """Run every task due at now; return STOP if one asked to stop."""
+        while self._heap and self._heap[0][0] <= now:
+            scheduled, _, task = heapq.heappop(self._heap)
+            if task.cancelled:
+                continue
+            if task.timer is not None:
+                task.timer.due(now)
+                task.when = task.timer.deadline
+                self._push(task)
+            task.runs += 1
+            self.profiler.lateness(task.name, now - scheduled)
+            if task.callback(now) == STOP or self._stopped:
+                return STOP
+        return None
+
+    def run(self):
+        """Run until a callback returns STOP, stop() is called or no task is left."""
+        self._stopped = False
+        profiler = self.profiler
+        while True:
+            profiler.begin()
+            result = self.run_due(self.clock())
+            profiler.end()
+            if result == STOP:
+                break
+
+            deadline = self.next_deadline()
+            if deadline is None:
+                break
+
+            for callback in self.idle_callbacks:
+                callback()
+            delay = deadline - self.clock()
+            if delay <= 0:
+                continue
+            self.wakeups += 1
+            if self.waiter is None:
+                self.sleep(delay)
+                continue
+            latency = self.waiter.wait(delay)
+            if latency is not None:
+                edge_time = self.clock() - latency
+                if any(cb(edge_time) == STOP for cb in list(self.input_callbacks)):
+                    break
@@ -0,0 +1,205 @@
+"""
+Several I2C sensors on one bus, each on its own schedule
+========================================================
+
+The reference program creates one AHTx0 and reads it every
+SENSOR_INTERVAL; each read blocks for the whole conversion. With several
+sensors in the enclosure, reading them one after the other adds their
+conversion times up. SensorRegistry shares one board.I2C() bus between
+the sensors and splits every read in two scheduled steps, like
+AHTx0Reader:
+
+    registry = SensorRegistry()                   # board.I2C() on first use
+    registry.add_ahtx0("interieur", interval=5)
+    registry.add("exterieur", AHTx0Reader(I2CDevice(registry.bus, 0x39)), interval=30)
+
+    scheduler = Scheduler()
+    registry.attach(scheduler, on_reading=show)   # show(name, values, now)
+    scheduler.every(BUTTON_POLL, poll_button)
+    scheduler.run()
+
+    trigger   one short write at the sensor's deadline, starts the conversion
+    fetch     one short read conversion_time later; retried a little later
+              (at most max_polls times) while the sensor reports busy
+
+Between the two steps the bus is free: the other sensors' steps and the
+button run during the conversion, so conversions overlap instead of
+adding up. Each step is a single I2C transfer, so the bus is held for one
+transfer at a time; a step longer than max_hold counts as an overrun.
+
+A reader is any object with trigger(now), poll(now) -> values or None,
+cancel() and conversion_time (AHTx0Reader is one). An OSError during a
+step is counted and the read is abandoned until the next deadline.
+
+registry.stats() gives, per sensor: reads, errors, timeouts (still busy
+after max_polls fetches), skipped deadlines, overruns, read latency
+(trigger to values) and the longest bus hold.
+"""
+
+import functools
+import time
+
+from loopkit.aht import AHTX0_ADDRESS, CONVERSION_TIME, AHTx0Reader
+from loopkit.profiling import Histogram
+
+
+_FAILED = object()
+
+
+class SensorStats:
+    """Counters and read latency of one sensor."""
+
+    def __init__(self):
+        self.reads = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.skipped = 0
+        self.overruns = 0
+        self.hold_max = 0.0
+        self.last_error = None
+        self.latency = Histogram()
+
+    def summary(self):
+        return {
+            "reads": self.reads,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "skipped": self.skipped,
+            "overruns": self.overruns,
+            "hold_max": self.hold_max,
+            "latency": self.latency.summary(),
+        }
+
+
+class Sensor:
+    """One device on the bus: its reader, schedule and last values."""
+
+    def __init__(self, name, reader, interval, first=None):
+        self.name = name
+        self.reader = reader
+        self.interval = interval
+        self.first = first
+        self.values = None
+        self.triggered_at = None  # set while a read waits for its fetch
+        self.polls = 0
+        self.stats = SensorStats()
+
+
+class SensorRegistry:
+    """Sensors sharing one I2C bus, read in interleaved trigger/fetch steps."""
+
+    def __init__(self, i2c=None, clock=None, max_hold=0.005, max_polls=5):
+        self._bus = i2c
+        self.clock = clock or time.monotonic
+        self.max_hold = max_hold
+        self.max_polls = max_polls
+        self.sensors = {}
+        self.scheduler = None
+        self.on_reading = None
+
+    @property
+    def bus(self):
+        """The shared bus (board.I2C(), created on first use)."""
+        if self._bus is None:
+            import board
+
+            self._bus = board.I2C()
+        return self._bus
+
+    # -- registration ------------------------------------------------------
+    def add(self, name, reader, interval, first=None):
+        """Read reader every interval seconds (first read after first)."""
+        if name in self.sensors:
+            raise ValueError(f"sensor {name!r} already registered")
+        sensor = Sensor(name, reader, interval, first)
+        self.sensors[name] = sensor
+        if self.scheduler is not None:
+            self._schedule(sensor)
+        return sensor
+
+    def add_ahtx0(self, name, interval, address=AHTX0_ADDRESS, first=None):
+        """An AHTx0/AHT20 at address on the shared bus."""
+        import adafruit_ahtx0
+
+        sensor = adafruit_ahtx0.AHTx0(self.bus, address)
+        return self.add(name, AHTx0Reader(sensor, CONVERSION_TIME, self.clock), interval, first)
+
+    def attach(self, scheduler, on_reading=None):
+        """
+        Schedule every sensor on scheduler. on_reading(name, values, now)
+        runs after each successful fetch; returning STOP stops the
+        scheduler like any other task.
+        """
+        self.scheduler = scheduler
+        self.on_reading = on_reading
+        for sensor in self.sensors.values():
+            self._schedule(sensor)
+
+    def _schedule(self, sensor):
+        self.scheduler.every(sensor.interval, functools.partial(self._trigger, sensor),
+                             name=f"{sensor.name}.trigger", first=sensor.first)
+
+    # -- results -----------------------------------------------------------
+    def readings(self):
+        """Last values of every sensor (None before the first read)."""
+        return {name: sensor.values for name, sensor in self.sensors.items()}
+
+    def stats(self):
+        return {name: sensor.stats.summary() for name, sensor in self.sensors.items()}
+
+    # -- steps -------------------------------------------------------------
+    def _step(self, sensor, transfer, now):
+        """Run one transfer; count errors and how long it held the bus."""
+        stats = sensor.stats
+        start = self.clock()
+        try:
+            result = transfer(now)
+        except OSError as e:
+            stats.errors += 1
+            stats.last_error = e
+            result = _FAILED
+        held = self.clock() - start
+        if held > stats.hold_max:
+            stats.hold_max = held
+        if held > self.max_hold:
+            stats.overruns += 1
+        return result
+
+    def _trigger(self, sensor, now):
+        if sensor.triggered_at is not None:
+            sensor.stats.skipped += 1  # the previous read is still converting
+            return None
+        if self._step(sensor, sensor.reader.trigger, now) is _FAILED:
+            return None
+        sensor.triggered_at = now
+        sensor.polls = 0
+        self.scheduler.call_at(now + sensor.reader.conversion_time,
+                               functools.partial(self._fetch, sensor),
+                               name=f"{sensor.name}.fetch")
+        return None
+
+    def _fetch(self, sensor, now):
+        values = self._step(sensor, sensor.reader.poll, now)
+        if values is _FAILED:
+            sensor.triggered_at = None
+            return None
+        if values is None:
+            sensor.polls += 1
+            if sensor.polls >= self.max_polls:
+                sensor.stats.timeouts += 1
+                sensor.reader.cancel()
+                sensor.triggered_at = None
+                return None
+            retry = max(0.001, sensor.reader.conversion_time / 4)
+            self.scheduler.call_at(now + retry, functools.partial(self._fetch, sensor),
+                                   name=f"{sensor.name}.fetch")
+            return None
+
+        stats = sensor.stats
+        stats.reads += 1
+        stats.latency.record(self.clock() - sensor.triggered_at)
+        sensor.triggered_at = None
+        sensor.values = values
+        if self.on_reading is not None:
+            return self.on_reading(sensor.name, values, now)
+        return None
@@ -0,0 +1,615 @@
+"""
+Simulated board/digitalio backend
+=================================
+
+Runs validate_pi.py and the README timer-in-loop program without a
+Raspberry Pi. Everything is driven by a virtual clock: time.sleep()
+advances it instantly, so a 10-minute loop scenario runs in milliseconds.
+
+    hw = SimHardware()
+    hw.button.press(at=1.2, hold=2.5)          # scripted pin timeline
+    hw.sensor.latency = 0.08                   # I2C read time (virtual)
+    with simulate(hw):
+        import board, digitalio                # the fake modules
+        ...
+
+simulate() installs fake ``board``, ``digitalio`` and ``adafruit_ahtx0``
+modules in sys.modules and points time.monotonic(), time.monotonic_ns(),
+time.time() and time.sleep() at the virtual clock until it exits. asyncio
+event loops created meanwhile also run on the virtual clock, and
+loopkit.edge.open_edge_waiter() returns a SimEdgeWaiter (None when
+hw.edges is False, like a board without libgpiod v2).
+"""
+
+import asyncio
+import contextlib
+import importlib
+import io
+import random
+import selectors
+import sys
+import threading
+import time
+import types
+
+from loopkit import edge
+from loopkit.aht import AHTX0_ADDRESS
+
+
+BUTTON_LINE = 17
+
+
+# ---------------------------------------------------------------------------
+# Virtual Clock
+# ---------------------------------------------------------------------------
+class VirtualClock:
+    """Monotonic clock that only moves when slept on or advanced."""
+
+    def __init__(self, start=0.0, epoch=1_700_000_000.0):
+        self.now = start
+        self.epoch = epoch
+        self.sleeps = 0
+        self.waits = 0  # SimEdgeWaiter.wait() calls
+        self.interrupt_at = None
+        self.jobs = 0
+        self._cond = threading.Condition()
+        self._waiting = []
+        self._released = False
+
+    def monotonic(self):
+        return self.now
+
+    def monotonic_ns(self):
+        return int(self.now * 1e9)
+
+    def time(self):
+        return self.epoch + self.now
+
+    def advance(self, seconds):
+        if seconds > 0:
+            self.now += seconds
+            if self._waiting:
+                with self._cond:
+                    self._cond.notify_all()
+
+    # -- worker threads ----------------------------------------------------
+    def wait_until(self, t):
+        """
+        Block the calling (worker) thread until the clock reaches t.
+
+        Another thread (the simulated event loop) moves the clock; see
+        next_wakeup(). release() lets every waiter go.
+        """
+        with self._cond:
+            self._waiting.append(t)
+            try:
+                while self.now < t and not self._released:
+                    self._cond.wait()
+            finally:
+                self._waiting.remove(t)
+
+    def next_wakeup(self):
+        """Earliest time a worker thread waits for, or None."""
+        with self._cond:
+            return min(self._waiting, default=None)
+
+    def running_jobs(self):
+        """Executor jobs (see VirtualEventLoop) not waiting for virtual time."""
+        with self._cond:
+            return self.jobs - sum(1 for t in self._waiting if t > self.now)
+
+    def release(self):
+        with self._cond:
+            self._released = True
+            self._cond.notify_all()
+
+    def sleep(self, seconds):
+        """Advance the clock; raise KeyboardInterrupt past interrupt_at."""
+        self.sleeps += 1
+        self.advance(seconds)
+        if self.interrupt_at is not None and self.now >= self.interrupt_at:
+            raise KeyboardInterrupt
+
+
+# ---------------------------------------------------------------------------
+# Pins
+# ---------------------------------------------------------------------------
+class Pin:
+    """Stand-in for board.Dxx pin objects."""
+
+    def __init__(self, number):
+        self.id = number
+
+    def __repr__(self):
+        return f"board.D{self.id}"
+
+
+class PinTimeline:
+    """
+    Scripted input level of one pin with a pull-up.
+
+    The pin reads True (released) except during pressed intervals.
+    """
+
+    def __init__(self):
+        self.presses = []
+
+    def press(self, at, hold=0.1, bounce=0.0, chatter=4):
+        """
+        Hold the button down from t=at for hold seconds.
+
+        With bounce > 0 the contact also chatters chatter times during
+        the bounce seconds after the press and after the release; the
+        steady press starts at at + bounce.
+        """
+        end = at + hold
+        if bounce > 0:
+            step = bounce / chatter
+            for k in range(chatter):
+                self.presses.append((at + k * step, at + (k + 0.5) * step))
+                self.presses.append((end + k * step, end + (k + 0.5) * step))
+            at += bounce
+        self.presses.append((at, end))
+        self.presses.sort()
+        return self
+
+    def value_at(self, t):
+        for start, end in self.presses:
+            if start > t:
+                break
+            if t < end:
+                return False
+        return True
+
+    def next_press(self, after):
+        """Start time of the first press strictly after t=after, or None."""
+        for start, _ in self.presses:
+            if start > after:
+                return start
+        return None
+
+
+class SimDigitalInOut:
+    """digitalio.DigitalInOut reading a PinTimeline at the virtual time."""
+
+    def __init__(self, hw, pin):
+        self.hw = hw
+        self.pin = pin
+        self.direction = None
+        self.pull = None
+        self.reads = 0
+        self.first_read = None  # (virtual time, time.perf_counter())
+        self.deinitialized = False
+        self._timeline = hw.pins.setdefault(pin.id, PinTimeline())
+        hw.inputs.append(self)
+
+    @property
+    def value(self):
+        if not self.reads:
+            self.first_read = (self.hw.clock.now, time.perf_counter())
+        self.reads += 1
+        return self._timeline.value_at(self.hw.clock.now)
+
+    def switch_to_input(self, pull=None):
+        self.pull = pull
+
+    def deinit(self):
+        self.deinitialized = True
+
+
+class SimEdgeWaiter:
+    """loopkit.edge waiter that jumps the virtual clock to the next press."""
+
+    mode = "edge"
+
+    def __init__(self, hw, line=BUTTON_LINE, latency=0.0):
+        self.clock = hw.clock
+        self.timeline = hw.pins.setdefault(line, PinTimeline())
+        self.latency = latency
+        self.seen = self.clock.now
+        self.waits = 0
+        self.first_wait = None  # (virtual time, time.perf_counter())
+        hw.waiters.append(self)
+
+    def wait(self, timeout):
+        """
+        Like the kernel event queue: an edge is reported once, even when
+        it happened before the call; Ctrl+C is simulated past interrupt_at.
+        """
+        if not self.waits:
+            self.first_wait = (self.clock.now, time.perf_counter())
+        self.waits += 1
+        self.clock.waits += 1
+        deadline = self.clock.now + timeout
+        edge = self.timeline.next_press(self.seen)
+        if edge is None or edge + self.latency > deadline:
+            self.clock.advance(deadline - self.clock.now)
+            self._check_interrupt()
+            return None
+        self.clock.advance(edge + self.latency - self.clock.now)
+        self.seen = edge
+        self._check_interrupt()
+        return self.clock.now - edge
+
+    def _check_interrupt(self):
+        if self.clock.interrupt_at is not None and self.clock.now >= self.clock.interrupt_at:
+            raise KeyboardInterrupt
+
+    def close(self):
+        pass
+
+
+class SimLines:
+    """loopkit.inputs backend reading several pin timelines in one call."""
+
+    mode = "bulk"
+
+    def __init__(self, hw, lines):
+        self.clock = hw.clock
+        self.timelines = [hw.pins.setdefault(line, PinTimeline()) for line in lines]
+        self.reads = 0
+
+    def read(self):
+        self.reads += 1
+        now = self.clock.now
+        mask = 0
+        bit = 1
+        for timeline in self.timelines:
+            if not timeline.value_at(now):
+                mask |= bit
+            bit <<= 1
+        return mask
+
+    def close(self):
+        pass
+
+
+# ---------------------------------------------------------------------------
+# I2C and AHTx0
+# ---------------------------------------------------------------------------
+class SimI2C:
+    """board.I2C() stand-in; scan() lists the connected sensor."""
+
+    def __init__(self, hw):
+        self.hw = hw
+
+    def scan(self):
+        return [AHTX0_ADDRESS] if self.hw.sensor.present(self.hw.clock.now) else []
+
+    def try_lock(self):
+        return True
+
+    def unlock(self):
+        pass
+
+    def deinit(self):
+        pass
+
+
+class SensorModel:
+    """
+    Behaviour of the simulated AHTx0.
+
+    temperature and humidity are numbers or functions of the virtual
+    time. Creating the AHTx0 costs init_time (soft reset and
+    calibration). Each property read costs latency seconds of virtual time and
+    fails with OSError with probability error_rate (seeded), or always
+    when the sensor is disconnected; such a read then costs timeout
+    seconds instead when timeout is set (a bus timeout). unplug(start, end)
+    disconnects it for a window of virtual time.
+
+    The raw I2C device (sensor.i2c_device) answers the trigger/fetch
+    protocol without blocking: the result is ready conversion_time after
+    the trigger; each transfer holds the bus for transfer_time.
+    measurements counts conversions, transactions counts I2C transfers.
+    """
+
+    def __init__(self, temperature=22.0, humidity=45.0, latency=0.08,
+                 error_rate=0.0, seed=0, conversion_time=0.08, init_time=0.04,
+                 transfer_time=0.0, timeout=None):
+        self.temperature = temperature
+        self.humidity = humidity
+        self.latency = latency
+        self.conversion_time = conversion_time
+        self.init_time = init_time
+        self.transfer_time = transfer_time
+        self.timeout = timeout
+        self.error_rate = error_rate
+        self.connected = True
+        self.outages = []  # (start, end) virtual time windows while unplugged
+        self.random = random.Random(seed)
+        self.reads = 0
+        self.errors = 0
+        self.measurements = 0
+        self.transactions = 0
+
+    def sample(self, value, t):
+        return value(t) if callable(value) else value
+
+    def unplug(self, start, end):
+        self.outages.append((start, end))
+
+    def present(self, t):
+        return self.connected and not any(start <= t < end for start, end in self.outages)
+
+    def check_error(self, t):
+        if not self.present(t) or self.random.random() < self.error_rate:
+            self.errors += 1
+            raise OSError(121, "Remote I/O error")
+
+
+class SimI2CDevice:
+    """adafruit_bus_device I2CDevice stand-in speaking the AHTx0 protocol."""
+
+    def __init__(self, hw, model=None):
+        self.hw = hw
+        self.model = model or hw.sensor  # another SensorModel: another device
+        self.triggered_at = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def _transfer(self):
+        model = self.model
+        model.transactions += 1
+        if model.transfer_time:
+            self.hw.clock.advance(model.transfer_time)
+        model.check_error(self.hw.clock.now)
+        return model
+
+    def write(self, buf, start=0, end=None):
+        model = self._transfer()
+        if bytes(buf[start:end])[:1] == b"\xac":
+            model.measurements += 1
+            self.triggered_at = self.hw.clock.now
+
+    def readinto(self, buf, start=0, end=None):
+        model = self._transfer()
+        now = self.hw.clock.now
+        busy = self.triggered_at is None or now - self.triggered_at < model.conversion_time
+        if busy:
+            buf[start] = 0x98
+            return
+        h = int(model.sample(model.humidity, now) / 100 * 0x100000)
+        t = int((model.sample(model.temperature, now) + 50) / 200 * 0x100000)
+        h, t = min(h, 0xFFFFF), min(max(t, 0), 0xFFFFF)
+        raw = (0x18, h >> 12, (h >> 4) & 0xFF, ((h & 0xF) << 4) | (t >> 16), (t >> 8) & 0xFF, t & 0xFF)
+        buf[start:start + 6] = bytes(raw)
+
+
+class SimAHTx0:
+    """adafruit_ahtx0.AHTx0 stand-in backed by a SensorModel."""
+
+    def __init__(self, i2c_bus, address=AHTX0_ADDRESS):
+        self.hw = i2c_bus.hw
+        self.model = self.hw.sensor
+        self.hw.clock.advance(self.model.init_time)
+        if not self.model.present(self.hw.clock.now):
+            raise ValueError(f"No I2C device at address: 0x{address:x}")
+        self.i2c_device = SimI2CDevice(self.hw)
+
+    def _measure(self, value):
+        model = self.model
+        model.reads += 1
+        model.measurements += 1
+        model.transactions += 2
+        clock = self.hw.clock
+        duration = model.latency
+        if model.timeout is not None and not model.present(clock.now):
+            duration = model.timeout
+        if threading.current_thread() is threading.main_thread():
+            clock.advance(duration)
+        else:
+            clock.wait_until(clock.now + duration)  # read in an executor
+        model.check_error(clock.now)
+        return model.sample(value, clock.now)
+
+    @property
+    def temperature(self):
+        return self._measure(self.model.temperature)
+
+    @property
+    def relative_humidity(self):
+        return self._measure(self.model.humidity)
+
+
+# ---------------------------------------------------------------------------
+# Hardware Bundle
+# ---------------------------------------------------------------------------
+class SimHardware:
+    """Virtual clock, pin timelines and sensor shared by the fake modules."""
+
+    def __init__(self, clock=None, sensor=None):
+        self.clock = clock or VirtualClock()
+        self.sensor = sensor or SensorModel()
+        self.pins = {}
+        self.inputs = []  # SimDigitalInOut objects, in creation order
+        self.waiters = []  # SimEdgeWaiter objects, in creation order
+        self.button = self.pins.setdefault(BUTTON_LINE, PinTimeline())
+        self.edges = True  # False: no libgpiod v2, open_edge_waiter() gives None
+        self.edge_latency = 0.0
+
+    def open_edge_waiter(self, line=BUTTON_LINE):
+        """Replaces loopkit.edge.open_edge_waiter() under simulate()."""
+        return SimEdgeWaiter(self, line, self.edge_latency) if self.edges else None
+
+    def modules(self):
+        """Fake board, digitalio and adafruit_ahtx0 modules."""
+        hw = self
+
+        board = types.ModuleType("board")
+        for n in range(28):
+            setattr(board, f"D{n}", Pin(n))
+        board.SCL, board.SDA = Pin(3), Pin(2)
+        board.I2C = lambda: SimI2C(hw)
+
+        digitalio = types.ModuleType("digitalio")
+        digitalio.Direction = types.SimpleNamespace(INPUT="INPUT", OUTPUT="OUTPUT")
+        digitalio.Pull = types.SimpleNamespace(UP="UP", DOWN="DOWN")
+        digitalio.DigitalInOut = lambda pin: SimDigitalInOut(hw, pin)
+
+        ahtx0 = types.ModuleType("adafruit_ahtx0")
+        ahtx0.AHTx0 = SimAHTx0
+
+        return {"board": board, "digitalio": digitalio, "adafruit_ahtx0": ahtx0}
+
+
+# ---------------------------------------------------------------------------
+# asyncio
+# ---------------------------------------------------------------------------
+class VirtualSelector:
+    """
+    Selector for asyncio event loops running on the virtual clock.
+
+    Instead of blocking for the loop's timeout, select() advances the
+    clock. It never does so while an executor job runs real code (it
+    waits for real instead), and when a job waits for virtual time (a
+    sensor read, see VirtualClock.wait_until) the clock only goes up to
+    that point, so loop and workers share one consistent timeline.
+    """
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.selector = selectors.DefaultSelector()
+
+    def __getattr__(self, name):
+        return getattr(self.selector, name)
+
+    def select(self, timeout=None):
+        events = self.selector.select(0)
+        if events or timeout == 0:
+            return events
+
+        clock = self.clock
+        if clock.running_jobs():
+            return self._wait_for_jobs()
+
+        target = None if timeout is None else clock.now + timeout
+        wakeup = clock.next_wakeup()
+        if wakeup is not None and (target is None or wakeup <= target):
+            clock.advance(wakeup - clock.now)
+            return self._wait_for_jobs()
+        if target is None:
+            return self.selector.select(1.0)
+
+        clock.sleeps += 1
+        clock.advance(target - clock.now)
+        if clock.interrupt_at is not None and clock.now >= clock.interrupt_at:
+            clock.interrupt_at = None
+            raise KeyboardInterrupt
+        return []
+
+    def _wait_for_jobs(self, limit=1.0):
+        """Real wait for an event or until no job runs real code."""
+        give_up = time.perf_counter() + limit
+        while time.perf_counter() < give_up:
+            events = self.selector.select(0.0005)
+            if events or not self.clock.running_jobs():
+                return events
+        return []
+
+
+class VirtualEventLoop(asyncio.SelectorEventLoop):
+    """Event loop on a VirtualSelector that tracks its executor jobs."""
+
+    def __init__(self, clock):
+        super().__init__(VirtualSelector(clock))
+        self.clock = clock
+
+    def run_in_executor(self, executor, func, *args):
+        self.clock.jobs += 1
+        future = super().run_in_executor(executor, func, *args)
+        future.add_done_callback(self._job_done)
+        return future
+
+    def _job_done(self, future):
+        self.clock.jobs -= 1
+
+
+class VirtualEventLoopPolicy(asyncio.DefaultEventLoopPolicy):
+    """New event loops run on the virtual clock."""
+
+    def __init__(self, clock):
+        super().__init__()
+        self.clock = clock
+
+    def new_event_loop(self):
+        return VirtualEventLoop(self.clock)
+
+
+@contextlib.contextmanager
+def simulate(hw):
+    """Install the fake modules and the virtual clock for the with-block."""
+    saved_modules = {name: sys.modules.get(name) for name in ("board", "digitalio", "adafruit_ahtx0")}
+    saved_time = {name: getattr(time, name) for name in ("monotonic", "monotonic_ns", "time", "sleep")}
+
+    saved_policy = asyncio.get_event_loop_policy()
+    saved_waiter = edge.open_edge_waiter
+
+    sys.modules.update(hw.modules())
+    edge.open_edge_waiter = hw.open_edge_waiter
+    time.monotonic = hw.clock.monotonic
+    time.monotonic_ns = hw.clock.monotonic_ns
+    time.time = hw.clock.time
+    time.sleep = hw.clock.sleep
+    asyncio.set_event_loop_policy(VirtualEventLoopPolicy(hw.clock))
+    try:
+        yield hw
+    finally:
+        hw.clock.release()
+        asyncio.set_event_loop_policy(saved_policy)
+        edge.open_edge_waiter = saved_waiter
+        for name, func in saved_time.items():
+            setattr(time, name, func)
+        for name, module in saved_modules.items():
+            if module is None:
+                sys.modules.pop(name, None)
+            else:
+                sys.modules[name] = module
+
+
+# ---------------------------------------------------------------------------
+# Running Programs
+# ---------------------------------------------------------------------------
+class TimestampedOutput(io.TextIOBase):
+    """Text stream that records each printed line with the virtual time."""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.lines = []
+        self._partial = ""
+
+    def write(self, text):
+        self._partial += text
+        while "\n" in self._partial:
+            line, self._partial = self._partial.split("\n", 1)
+            self.lines.append((self.clock.now, line))
+        return len(text)
+
+    def times(self, prefix):
+        """Virtual times of the lines starting with prefix."""
+        return [t for t, line in self.lines if line.startswith(prefix)]
+
+
+def run_program(hw, module="loopkit.reference", entry="main", until=None, args=()):
+    """
+    Import module fresh under simulate(hw) and call its entry function
+    with args.
+
+    until is a virtual time at which Ctrl+C is simulated. Returns the
+    TimestampedOutput with everything the program printed.
+    """
+    output = TimestampedOutput(hw.clock)
+    hw.clock.interrupt_at = until
+    sys.modules.pop(module, None)
+    try:
+        with simulate(hw), contextlib.redirect_stdout(output):
+            program = importlib.import_module(module)
+            getattr(program, entry)(*args)
+    finally:
+        sys.modules.pop(module, None)
+        hw.clock.interrupt_at = None
+    return output
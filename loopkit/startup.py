@@ -0,0 +1,194 @@
+"""
+Startup helpers: lazy imports, deferred hardware, cached platform detection
+===========================================================================
+
+On a Pi Zero, ``import board`` spends most of its time detecting the
+platform (adafruit_platformdetect reads /proc and the device tree), and
+creating the AHTx0 resets and calibrates the sensor (tens of
+milliseconds of sleeps) before the loop polls the button once. These helpers move that
+work off the path to the first poll:
+
+    adafruit_ahtx0 = lazy_import("adafruit_ahtx0")      # imported on first use
+    sensor = Deferred(lambda: adafruit_ahtx0.AHTx0(board.I2C()))
+    ...
+    sensor.temperature                                   # created here
+
+    apply_platform_cache()    # before the first "import board"
+    import board
+    store_platform_cache()    # after a successful detection
+
+The platform cache stores Blinka's detected board and chip ids, keyed by
+the device-tree model and kernel release, and replays them through the
+BLINKA_FORCEBOARD / BLINKA_FORCECHIP variables, which make Blinka skip
+detection.
+
+import_report() runs ``python -X importtime`` on a set of modules and
+returns the slowest imports.
+"""
+
+import importlib
+import os
+import sys
+import types
+
+
+# ---------------------------------------------------------------------------
+# Lazy Imports and Deferred Objects
+# ---------------------------------------------------------------------------
+class LazyModule(types.ModuleType):
+    """Module proxy that imports the real module on first attribute access."""
+
+    def __init__(self, name):
+        super().__init__(name)
+        self.__dict__["_module"] = None
+
+    def _load(self):
+        module = self.__dict__["_module"]
+        if module is None:
+            module = importlib.import_module(self.__name__)
+            self.__dict__["_module"] = module
+        return module
+
+    def __getattr__(self, name):
+        return getattr(self._load(), name)
+
+    def __repr__(self):
+        state = "loaded" if self.__dict__["_module"] is not None else "not loaded"
+        return f"<lazy module {self.__name__!r} ({state})>"
+
+
+def lazy_import(name):
+    """The module if it is already imported, else a LazyModule for it."""
+    return sys.modules.get(name) or LazyModule(name)
+
+
+json = lazy_import("json")
+subprocess = lazy_import("subprocess")
+
+
+class Deferred:
+    """
+    Proxy that builds its object with factory() on first attribute use.
+
+    deinit() on a proxy whose object was never created does nothing, so
+    cleanup code in finally: blocks does not create hardware to free it.
+    """
+
+    def __init__(self, factory):
+        self.__dict__["_factory"] = factory
+        self.__dict__["_target"] = None
+
+    @property
+    def created(self):
+        return self.__dict__["_target"] is not None
+
+    def get(self):
+        target = self.__dict__["_target"]
+        if target is None:
+            target = self.__dict__["_factory"]()
+            self.__dict__["_target"] = target
+        return target
+
+    def __getattr__(self, name):
+        return getattr(self.get(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self.get(), name, value)
+
+    def deinit(self):
+        if self.created:
+            self.get().deinit()
+
+
+# ---------------------------------------------------------------------------
+# Platform Detection Cache
+# ---------------------------------------------------------------------------
+def platform_cache_path():
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "loopkit", "platform.json")
+
+
+def platform_fingerprint():
+    """Device-tree model + kernel release: what the detection depends on."""
+    try:
+        with open("/proc/device-tree/model", "rb") as f:
+            model = f.read().rstrip(b"\0").decode(errors="replace")
+    except OSError:
+        model = ""
+    uname = os.uname()
+    return f"{model}|{uname.machine}|{uname.release}"
+
+
+def apply_platform_cache(path=None):
+    """
+    Set BLINKA_FORCEBOARD/BLINKA_FORCECHIP from the cache when it matches
+    this machine. Must run before board is imported. True when applied.
+    """
+    path = path or platform_cache_path()
+    try:
+        with open(path) as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return False
+    if cached.get("fingerprint") != platform_fingerprint():
+        return False
+    if not cached.get("board") or not cached.get("chip"):
+        return False
+    os.environ.setdefault("BLINKA_FORCEBOARD", cached["board"])
+    os.environ.setdefault("BLINKA_FORCECHIP", cached["chip"])
+    return True
+
+
+def store_platform_cache(path=None):
+    """Save the ids Blinka detected (board must be imported). True when saved."""
+    try:
+        from adafruit_blinka.agnostic import board_id, chip_id
+    except ImportError:
+        return False
+    if not board_id or not chip_id:
+        return False
+
+    path = path or platform_cache_path()
+    record = {"fingerprint": platform_fingerprint(), "board": board_id, "chip": chip_id}
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(record, f)
+        os.replace(tmp, path)
+    except OSError:
+        return False
+    return True
+
+
+# ---------------------------------------------------------------------------
+# Import Time Report
+# ---------------------------------------------------------------------------
+def import_report(modules, top=15, python=None):
+    """
+    Import modules in a fresh interpreter with -X importtime.
+
+    Returns (total_us, rows) where rows are the top slowest
+    (cumulative_us, self_us, module) entries, slowest first, and total_us
+    is the cumulative time of the requested modules themselves.
+    """
+    statement = "; ".join(f"import {name}" for name in modules)
+    result = subprocess.run(
+        [python or sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True, text=True,
+    )
+    rows = []
+    total = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        depth = len(name) - len(name.lstrip())
+        entry = (int(cumulative_us), int(self_us), name.strip())
+        rows.append(entry)
+        if depth <= 1 and entry[2] in modules:
+            total += entry[0]
+    if result.returncode != 0:
+        raise ImportError(result.stderr.strip().splitlines()[-1] if result.stderr else statement)
+    rows.sort(reverse=True)
+    return total, rows[:top]
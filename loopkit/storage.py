@@ -0,0 +1,262 @@
+"""
+Buffered batch writer for sensor samples
+========================================
+
+Writing each read_sensor() result with its own print or file write costs
+one syscall (and maybe one SD-card flush) per sample, in the middle of
+the main loop. BatchWriter appends samples to an in-memory batch and
+writes them out in one go when the batch is big or old enough:
+
+    writer = BatchWriter("logs", fmt="binary")
+    ...
+    writer.append(time.time(), temperature, humidity)   # no I/O
+    writer.maybe_flush()                                # once per iteration
+    ...
+    finally:
+        writer.close()
+
+Flushing writes in chunks and stops as soon as the time budget is used
+up (5 ms by default), leaving the rest for the next iteration, so a
+flush never holds the loop much longer than the budget.
+
+Files are append-only segments. The active one is named ``*.part``; when
+it reaches segment_bytes it is retired: new samples go to the next
+segment, and the next maybe_flush() calls finalize the retired one
+instead of writing, one blocking step per call (fsync, then close,
+rename to its final name and fsync of the directory), so a complete
+segment is never half-written. On start-up, a ``.part`` left by a crash
+is cut back to its last whole record and renamed the same way.
+
+Worst case for one maybe_flush() call: the budget plus one chunk write
+(or one fsync with FSYNC_FLUSH, which only starts within the budget), or
+a single finalization step. A step cannot be cut short, and the fsync of
+a retired segment may have up to segment_bytes to push to the card.
+flush() without a budget and close() finish everything at once.
+
+Formats (one sample = epoch seconds, temperature C, humidity %):
+    csv     ``t,temperature,humidity`` header, one line per sample
+    binary  16-byte header (magic F4SAMPLE, version, record size), then
+            fixed 24-byte little-endian records of three float64
+"""
+
+import glob
+import os
+import re
+import struct
+import time
+
+
+MAGIC = b"F4SAMPLE"
+VERSION = 1
+RECORD = struct.Struct("<ddd")
+HEADER = struct.Struct("<8sHHI")
+CSV_HEADER = b"t,temperature,humidity\n"
+
+FSYNC_NEVER = "never"      # leave it to the OS (fastest, may lose recent data)
+FSYNC_SEGMENT = "segment"  # fsync when a segment is finalized
+FSYNC_FLUSH = "flush"      # fsync after every completed flush
+
+CHUNK_BYTES = 170 * RECORD.size
+
+
+def binary_header():
+    return HEADER.pack(MAGIC, VERSION, RECORD.size, 0)
+
+
+class BatchWriter:
+    """Append-only batched sample writer with time-bounded flushes."""
+
+    def __init__(self, directory, fmt="binary", prefix="samples", max_batch=64,
+                 max_age=30.0, segment_bytes=1024 * 1024, fsync=FSYNC_SEGMENT,
+                 budget=0.005, clock=None):
+        if fmt not in ("binary", "csv"):
+            raise ValueError(f"unknown format: {fmt!r}")
+        if fsync not in (FSYNC_NEVER, FSYNC_SEGMENT, FSYNC_FLUSH):
+            raise ValueError(f"unknown fsync policy: {fsync!r}")
+        self.directory = str(directory)
+        self.fmt = fmt
+        self.ext = "bin" if fmt == "binary" else "csv"
+        self.prefix = prefix
+        self.max_batch = max_batch
+        self.max_age = max_age
+        self.segment_bytes = segment_bytes
+        self.fsync = fsync
+        self.budget = budget
+        self.clock = clock or time.monotonic
+
+        self.pending = bytearray()
+        self.pending_records = 0
+        self.oldest_pending = None
+        self._offset = 0  # bytes of pending already written
+        self._needs_sync = False
+
+        self.fd = None
+        self.segment_size = 0
+        self.retired = None  # [fd, sequence, synced] of a full segment to finalize
+        self.flushes = 0
+        self.samples_written = 0
+
+        os.makedirs(self.directory, exist_ok=True)
+        self.sequence = self._recover()
+
+    # -- segments ----------------------------------------------------------
+    def _name(self, sequence):
+        return os.path.join(self.directory, f"{self.prefix}-{sequence:06d}.{self.ext}")
+
+    def _recover(self):
+        """Finalize segments left as .part; return the next sequence number."""
+        pattern = os.path.join(self.directory, f"{self.prefix}-*.{self.ext}")
+        segment = re.compile(rf"{re.escape(self.prefix)}-(\d+)\.{self.ext}(\.part)?")
+        last = -1
+        for path in sorted(glob.glob(pattern) + glob.glob(pattern + ".part")):
+            match = segment.fullmatch(os.path.basename(path))
+            if match is None:
+                continue  # not one of ours (samples-old.bin, a copy...)
+            last = max(last, int(match.group(1)))
+            if match.group(2):
+                self._truncate_partial(path)
+                os.replace(path, path[:-len(".part")])
+        return last + 1
+
+    def _truncate_partial(self, path):
+        with open(path, "r+b") as f:
+            data = f.read()
+            if self.fmt == "binary":
+                if len(data) < HEADER.size:
+                    keep = 0
+                else:
+                    keep = HEADER.size + (len(data) - HEADER.size) // RECORD.size * RECORD.size
+            else:
+                keep = data.rfind(b"\n") + 1
+            f.truncate(keep)
+
+    def _open_segment(self):
+        path = self._name(self.sequence) + ".part"
+        self.fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        header = binary_header() if self.fmt == "binary" else CSV_HEADER
+        os.write(self.fd, header)
+        self.segment_size = len(header)
+
+    def _retire_segment(self):
+        """Set the active segment aside for finalization; writes go to the next one."""
+        if self.fd is None:
+            return
+        if self.retired is not None:
+            self._finish_retired()  # flush() filled two segments in one call
+        self.retired = [self.fd, self.sequence, self.fsync == FSYNC_NEVER]
+        self.fd = None
+        self.sequence += 1
+
+    def _finalize_step(self):
+        """One blocking step for the retired segment: fsync, or close + rename."""
+        fd, sequence, synced = self.retired
+        if not synced:
+            os.fsync(fd)
+            self.retired[2] = True
+            return
+        os.close(fd)
+        final = self._name(sequence)
+        os.replace(final + ".part", final)
+        if self.fsync != FSYNC_NEVER:
+            self._sync_directory()
+        self.retired = None
+
+    def _finish_retired(self):
+        while self.retired is not None:
+            self._finalize_step()
+
+    def _sync_directory(self):
+        try:
+            fd = os.open(self.directory, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+    # -- writing -----------------------------------------------------------
+    def append(self, t, temperature, humidity):
+        """Queue one sample in memory (no I/O)."""
+        if self.fmt == "binary":
+            self.pending += RECORD.pack(t, temperature, humidity)
+        else:
+            self.pending += f"{t:.3f},{temperature:.2f},{humidity:.2f}\n".encode()
+        self.pending_records += 1
+        if self.oldest_pending is None:
+            self.oldest_pending = self.clock()
+
+    def due(self, now=None):
+        """True when the batch is full or its oldest sample is too old."""
+        if not self.pending_records:
+            return self._offset < len(self.pending)
+        if self.pending_records >= self.max_batch:
+            return True
+        now = self.clock() if now is None else now
+        return now - self.oldest_pending >= self.max_age
+
+    def maybe_flush(self, now=None):
+        """
+        Finalize a retired segment by one step, or else flush within the
+        time budget if a flush is due; True when idle (nothing left to
+        write, sync or finalize).
+        """
+        if self.retired is not None:
+            self._finalize_step()
+            return False
+        if self.due(now) or self._offset or self._needs_sync:
+            # _needs_sync: an FSYNC_FLUSH fsync deferred by the budget
+            return self.flush(self.budget)
+        return True
+
+    def flush(self, budget=None):
+        """
+        Write pending samples, stopping once budget seconds are used.
+
+        Returns True when everything pending is on disk (and synced per
+        the fsync policy), False when the budget ran out first. A segment
+        filled here is retired; without a budget it is finalized at once.
+        """
+        start = self.clock()
+        if self.pending:
+            if self.fd is None:
+                self._open_segment()
+            view = memoryview(self.pending)
+            while self._offset < len(self.pending):
+                chunk = view[self._offset:self._offset + CHUNK_BYTES]
+                written = os.write(self.fd, chunk)
+                self._offset += written
+                self.segment_size += written
+                if budget is not None and self.clock() - start >= budget:
+                    if self._offset < len(self.pending):
+                        view.release()
+                        return False
+            view.release()
+
+            self.samples_written += self.pending_records
+            self.pending = bytearray()
+            self.pending_records = 0
+            self.oldest_pending = None
+            self._offset = 0
+            self.flushes += 1
+            self._needs_sync = self.fsync == FSYNC_FLUSH
+
+        if self._needs_sync:
+            if budget is not None and self.clock() - start >= budget:
+                return False
+            os.fsync(self.fd)
+            self._needs_sync = False
+
+        if self.fd is not None and self.segment_size >= self.segment_bytes:
+            self._retire_segment()
+        if budget is None:
+            self._finish_retired()
+        return True
+
+    def close(self):
+        """Write everything and finalize the retired and active segments."""
+        self.flush()
+        self._retire_segment()
+        self._finish_retired()
@@ -0,0 +1 @@
+# loopkit - tests unitaires (simulateur, sans Raspberry Pi)
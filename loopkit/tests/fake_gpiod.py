@@ -0,0 +1,139 @@
+"""
+Stand-in for the libgpiod v2 Python bindings
+============================================
+
+Just enough of ``gpiod`` (request_lines, LineSettings, Chip) and
+``gpiod.line`` (Value, Direction, Bias, Edge) for loopkit.edge and
+loopkit.inputs. Line levels are physical: True is high, which is
+"released" with the pull-up.
+
+    gpiod = install(monkeypatch)
+    gpiod.levels[17] = False                  # pin pulled low (pressed)
+    gpiod.push_edge(17, timestamp_ns)         # queue a falling edge
+"""
+
+import enum
+import sys
+import types
+
+
+class Value(enum.Enum):
+    INACTIVE = 0
+    ACTIVE = 1
+
+
+class Direction(enum.Enum):
+    AS_IS = 1
+    INPUT = 2
+    OUTPUT = 3
+
+
+class Bias(enum.Enum):
+    AS_IS = 1
+    DISABLED = 2
+    PULL_UP = 3
+    PULL_DOWN = 4
+
+
+class Edge(enum.Enum):
+    NONE = 1
+    RISING = 2
+    FALLING = 3
+    BOTH = 4
+
+
+class LineSettings:
+    def __init__(self, direction=Direction.AS_IS, edge_detection=Edge.NONE,
+                 bias=Bias.AS_IS, active_low=False):
+        self.direction = direction
+        self.edge_detection = edge_detection
+        self.bias = bias
+        self.active_low = active_low
+
+
+class EdgeEvent:
+    def __init__(self, line_offset, timestamp_ns):
+        self.line_offset = line_offset
+        self.timestamp_ns = timestamp_ns
+
+
+class LineRequest:
+    def __init__(self, gpiod, path, consumer, config):
+        self.gpiod = gpiod
+        self.path = path
+        self.consumer = consumer
+        self.settings = {}
+        for lines, settings in config.items():
+            for line in lines if isinstance(lines, tuple) else (lines,):
+                self.settings[line] = settings
+        self.events = []
+        self.timeouts = []
+        self.get_calls = 0
+        self.released = False
+
+    def get_values(self, lines=None):
+        self.get_calls += 1
+        values = []
+        for line in self.settings if lines is None else lines:
+            high = self.gpiod.levels.get(line, True)
+            active = high != self.settings[line].active_low
+            values.append(Value.ACTIVE if active else Value.INACTIVE)
+        return values
+
+    def wait_edge_events(self, timeout=None):
+        self.timeouts.append(timeout)
+        return bool(self.events)
+
+    def read_edge_events(self, max_events=None):
+        events, self.events = self.events, []
+        return events
+
+    def release(self):
+        self.released = True
+
+
+class Chip:
+    def __init__(self, gpiod, path):
+        if path not in gpiod.chips:
+            raise OSError(2, "No such file or directory", path)
+        self.label = gpiod.chips[path]
+
+    def get_info(self):
+        return types.SimpleNamespace(label=self.label)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+def install(monkeypatch, chips=None):
+    """Put a fake gpiod (and gpiod.line) in sys.modules; returns it."""
+    gpiod = types.ModuleType("gpiod")
+    line = types.ModuleType("gpiod.line")
+    line.Value, line.Direction, line.Bias, line.Edge = Value, Direction, Bias, Edge
+
+    gpiod.line = line
+    gpiod.LineSettings = LineSettings
+    gpiod.levels = {}
+    gpiod.requests = []
+    gpiod.chips = chips if chips is not None else {"/dev/gpiochip0": "pinctrl-bcm2711"}
+
+    def request_lines(path, consumer=None, config=None):
+        request = LineRequest(gpiod, path, consumer, config or {})
+        gpiod.requests.append(request)
+        return request
+
+    def push_edge(offset, timestamp_ns):
+        for request in gpiod.requests:
+            if offset in request.settings:
+                request.events.append(EdgeEvent(offset, timestamp_ns))
+
+    gpiod.request_lines = request_lines
+    gpiod.Chip = lambda path: Chip(gpiod, path)
+    gpiod.push_edge = push_edge
+
+    monkeypatch.setitem(sys.modules, "gpiod", gpiod)
+    monkeypatch.setitem(sys.modules, "gpiod.line", line)
+    return gpiod
@@ -0,0 +1,137 @@
+"""
+loopkit.adaptive (AdaptiveSampler): interval response to step and ramp inputs
+"""
+
+import pytest
+
+from loopkit.adaptive import AdaptiveSampler
+
+
+DEADBAND = (0.1, 0.5)  # C, %RH
+
+
+def run(signal, until, **options):
+    """
+    Sample signal(t) -> (temperature, humidity) on a virtual clock.
+
+    Returns the sampler and the (read time, interval after it) pairs.
+    """
+    now = 0.0
+    options.setdefault("deadband", DEADBAND)
+    sampler = AdaptiveSampler(lambda: signal(now), clock=lambda: now, **options)
+    trace = []
+    while sampler.deadline < until:
+        now = sampler.deadline
+        sampler.sample(now)
+        trace.append((now, sampler.interval))
+    return sampler, trace
+
+
+def flat(t):
+    return 21.5, 42.0
+
+
+def step(at, size):
+    return lambda t: (21.5, 42.0 + (size if t >= at else 0.0))
+
+
+def ramp(start, end, slope):
+    return lambda t: (21.5, 42.0 + slope * min(max(t - start, 0.0), end - start))
+
+
+# ---------------------------------------------------------------------------
+# Bounds
+# ---------------------------------------------------------------------------
+def test_max_interval_defaults_to_the_starting_interval():
+    sampler, trace = run(flat, 600, interval=5.0)
+    assert sampler.max_interval == 5.0
+    assert {interval for _, interval in trace} == {5.0}
+
+
+def test_quiet_signal_grows_by_at_most_growth_per_read():
+    _, trace = run(flat, 600, interval=5.0, max_interval=30.0, growth=1.5)
+    intervals = [interval for _, interval in trace]
+    for before, after in zip(intervals, intervals[1:]):
+        assert after <= before * 1.5 + 1e-9
+    assert intervals[-1] == 30.0
+
+
+def test_bounds_are_checked():
+    with pytest.raises(ValueError):
+        AdaptiveSampler(flat, min_interval=5.0, max_interval=1.0)
+    with pytest.raises(ValueError):
+        AdaptiveSampler(flat, deadband=(0.1, 0.0))
+
+
+# ---------------------------------------------------------------------------
+# Step
+# ---------------------------------------------------------------------------
+@pytest.mark.parametrize("max_interval", [5.0, 30.0])
+def test_step_drops_to_min_interval_on_the_first_read(max_interval):
+    _, trace = run(step(302.5, 2.0), 400, interval=5.0,
+                   max_interval=max_interval, min_interval=1.0)
+    first = next(i for i, (t, _) in enumerate(trace) if t >= 302.5)
+    assert trace[first - 1][1] == max_interval
+    assert trace[first][1] == 1.0
+
+
+def test_half_a_deadband_is_a_transient():
+    _, trace = run(step(302.5, 0.3), 400, interval=5.0)  # 0.6 deadband
+    first = next(i for i, (t, _) in enumerate(trace) if t >= 302.5)
+    assert trace[first][1] == 1.0
+
+
+def test_step_below_the_transient_threshold_keeps_the_interval():
+    _, trace = run(step(302.5, 0.2), 400, interval=5.0)  # 0.4 deadband
+    first = next(i for i, (t, _) in enumerate(trace) if t >= 302.5)
+    assert trace[first][1] > 1.0
+
+
+def test_interval_recovers_after_a_step():
+    _, trace = run(step(302.5, 2.0), 900, interval=5.0, max_interval=30.0, growth=1.5)
+    after = [interval for t, interval in trace if t >= 302.5]
+    for before, now in zip(after, after[1:]):
+        assert now <= before * 1.5 + 1e-9
+    assert after[-1] == 30.0
+
+
+# ---------------------------------------------------------------------------
+# Ramp
+# ---------------------------------------------------------------------------
+def test_ramp_is_sampled_at_least_once_per_deadband():
+    # 0.25 %RH/s: one deadband every 2 s.
+    _, trace = run(ramp(300.0, 600.0, 0.25), 700, interval=5.0, max_interval=30.0)
+    during = [interval for t, interval in trace if 330.0 <= t < 600.0]
+    assert during
+    assert max(during) <= 2.0
+
+
+def test_ramp_emits_every_deadband():
+    sampler, _ = run(ramp(300.0, 600.0, 0.25), 600, interval=5.0)
+    # 75 %RH over 300 s is 150 deadbands; one emit per crossed deadband.
+    assert sampler.emits >= 140
+    stats = sampler.stats(600)
+    assert stats["reads"] == sampler.emits + sampler.suppressed + sampler.errors
+
+
+def test_slow_ramp_widens_past_the_fast_one():
+    _, fast = run(ramp(300.0, 900.0, 0.25), 900, interval=5.0, max_interval=30.0)
+    _, slow = run(ramp(300.0, 900.0, 0.01), 900, interval=5.0, max_interval=30.0)
+    assert slow[-1][1] > fast[-1][1]
+
+
+# ---------------------------------------------------------------------------
+# Deadband and errors
+# ---------------------------------------------------------------------------
+def test_flat_signal_is_suppressed_until_the_heartbeat():
+    sampler, _ = run(flat, 606, interval=5.0, heartbeat=300.0)
+    assert sampler.emits == 3  # first read at t=5, then t=305 and t=605
+    assert sampler.stats(606)["suppression_ratio"] == pytest.approx(1 - 3 / sampler.reads)
+
+
+def test_failed_read_keeps_the_interval():
+    now = 0.0
+    sampler = AdaptiveSampler(lambda: None, interval=5.0, clock=lambda: now)
+    now = sampler.deadline
+    assert sampler.sample(now) is None
+    assert (sampler.errors, sampler.interval, sampler.deadline) == (1, 5.0, now + 5.0)
@@ -0,0 +1,145 @@
+"""
+loopkit.aht (decode, AHTx0Reader): the 20-bit split and the busy-bit polling
+"""
+
+import pytest
+
+from loopkit.aht import AHTX0_CMD_TRIGGER, AHTx0Reader, decode
+from loopkit.sim import SensorModel, SimAHTx0, SimHardware, SimI2C
+
+
+def raw(humidity, temperature, status=0x18):
+    """6-byte reading carrying two 20-bit raw values."""
+    return bytes((status, humidity >> 12, (humidity >> 4) & 0xFF,
+                  ((humidity & 0xF) << 4) | (temperature >> 16),
+                  (temperature >> 8) & 0xFF, temperature & 0xFF))
+
+
+class FakeDevice:
+    """I2CDevice stand-in that replays scripted readings."""
+
+    def __init__(self, *replies):
+        self.replies = list(replies)
+        self.writes = []
+        self.reads = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def write(self, buf):
+        self.writes.append(bytes(buf))
+
+    def readinto(self, buf):
+        self.reads += 1
+        reply = self.replies.pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+        buf[:len(reply)] = reply
+
+
+# ---------------------------------------------------------------------------
+# Decoding
+# ---------------------------------------------------------------------------
+@pytest.mark.parametrize("humidity, temperature, expected", [
+    (0x00000, 0x00000, (-50.0, 0.0)),
+    (0x80000, 0x80000, (50.0, 50.0)),
+    (0x40000, 0x40000, (0.0, 25.0)),
+    (0xFFFFF, 0xFFFFF, (150.0 - 200 / 0x100000, 100.0 - 100 / 0x100000)),
+    # The shared middle byte: humidity's low nibble, temperature's high one.
+    (0x0000F, 0xF0000, (137.5, 15 * 100 / 0x100000)),
+])
+def test_decode_known_vectors(humidity, temperature, expected):
+    assert decode(raw(humidity, temperature)) == pytest.approx(expected, abs=1e-12)
+
+
+def test_decode_a_typical_reading():
+    # 45 %RH and 22.5 C as the sensor encodes them
+    buf = bytes((0x1C, 0x73, 0x33, 0x35, 0xCC, 0xCC))
+    temperature, humidity = decode(buf)
+    assert humidity == pytest.approx(45.0, abs=1e-4)
+    assert temperature == pytest.approx(22.5, abs=1e-3)
+
+
+def test_decode_ignores_the_status_byte():
+    assert decode(raw(0x12345, 0x6789A, status=0xFF)) == decode(raw(0x12345, 0x6789A, status=0))
+
+
+# ---------------------------------------------------------------------------
+# Trigger and poll
+# ---------------------------------------------------------------------------
+def test_poll_before_the_conversion_time_does_not_touch_the_bus():
+    device = FakeDevice()
+    reader = AHTx0Reader(device, conversion_time=0.08, clock=lambda: 0.0)
+    assert reader.poll(1.0) is None          # nothing triggered
+    reader.trigger(1.0)
+    assert device.writes == [bytes(AHTX0_CMD_TRIGGER)]
+    assert reader.pending
+    assert not reader.ready(1.05)
+    assert reader.poll(1.05) is None
+    assert device.reads == 0
+
+
+def test_busy_status_returns_none_and_keeps_the_read_pending():
+    device = FakeDevice(raw(0x80000, 0x80000, status=0x98), raw(0x80000, 0x80000))
+    reader = AHTx0Reader(device, conversion_time=0.08)
+    reader.trigger(1.0)
+    assert reader.poll(1.08) is None
+    assert reader.pending and reader.triggered_at == 1.0
+    assert reader.poll(1.09) == (50.0, 50.0)
+    assert not reader.pending
+    assert (reader.temperature, reader.humidity) == (50.0, 50.0)
+    assert device.reads == 2
+
+
+def test_trigger_while_pending_is_ignored():
+    device = FakeDevice()
+    reader = AHTx0Reader(device)
+    reader.trigger(1.0)
+    reader.trigger(1.05)
+    assert len(device.writes) == 1
+    assert reader.triggered_at == 1.0
+
+
+def test_trigger_defaults_to_the_clock():
+    reader = AHTx0Reader(FakeDevice(), clock=lambda: 7.5)
+    reader.trigger()
+    assert reader.triggered_at == 7.5
+
+
+def test_bus_error_while_fetching_clears_the_read():
+    device = FakeDevice(OSError(121, "Remote I/O error"))
+    reader = AHTx0Reader(device)
+    reader.trigger(1.0)
+    with pytest.raises(OSError):
+        reader.poll(2.0)
+    assert not reader.pending
+    reader.trigger(3.0)                      # a new read can start at once
+    assert len(device.writes) == 2
+
+
+def test_cancel_forgets_the_read():
+    device = FakeDevice()
+    reader = AHTx0Reader(device)
+    reader.trigger(1.0)
+    reader.cancel()
+    assert not reader.pending and reader.poll(2.0) is None
+    assert device.reads == 0
+
+
+# ---------------------------------------------------------------------------
+# Simulated sensor
+# ---------------------------------------------------------------------------
+def test_round_trip_through_the_simulated_sensor():
+    hw = SimHardware(sensor=SensorModel(temperature=18.25, humidity=61.5))
+    reader = AHTx0Reader(SimAHTx0(SimI2C(hw)), clock=hw.clock.monotonic)
+    reader.trigger()
+    start = hw.clock.now
+    hw.clock.advance(0.04)
+    assert reader.poll(start + 0.08) is None  # the device itself is still busy
+    hw.clock.advance(0.05)
+    temperature, humidity = reader.poll()
+    assert temperature == pytest.approx(18.25, abs=200 / 0x100000)
+    assert humidity == pytest.approx(61.5, abs=100 / 0x100000)
@@ -0,0 +1,130 @@
+"""
+loopkit.button (ButtonMachine)
+
+The machine is fed the samples of a PinTimeline taken every PERIOD
+seconds, so every event time below is known to within one sample.
+"""
+
+import pytest
+
+from loopkit.button import (
+    CLICK, DOUBLE_CLICK, IDLE, LONG_HOLD, PRESS, RELEASE, REPEAT, ButtonMachine,
+)
+from loopkit.sim import PinTimeline
+
+
+PERIOD = 0.01
+SETTLE = 2 * PERIOD  # samples=3: PRESS/RELEASE on the third sample
+
+
+def drive(machine, timeline, end, period=PERIOD):
+    """(t, events) for every sample up to end that produced events."""
+    events = []
+    for k in range(int(end / period) + 1):
+        t = k * period
+        mask = machine.update(timeline.value_at(t), t)
+        if mask:
+            events.append((t, mask))
+    return events
+
+
+def times(events, flag):
+    return [t for t, mask in events if mask & flag]
+
+
+# ---------------------------------------------------------------------------
+# Debounce
+# ---------------------------------------------------------------------------
+def test_bounce_is_rejected():
+    timeline = PinTimeline().press(1.0, hold=0.2, bounce=0.008, chatter=4)
+    events = drive(ButtonMachine(), timeline, 2.0, period=0.001)
+
+    assert len(times(events, PRESS)) == 1
+    assert len(times(events, RELEASE)) == 1
+    assert len(times(events, CLICK)) == 1
+    # The steady press starts after the bounce.
+    assert times(events, PRESS)[0] == pytest.approx(1.008 + 0.002, abs=0.0015)
+
+
+def test_glitch_shorter_than_the_integrator_is_ignored():
+    timeline = PinTimeline().press(1.0, hold=0.015)  # two samples low
+    assert drive(ButtonMachine(), timeline, 2.0) == []
+
+
+# ---------------------------------------------------------------------------
+# Clicks
+# ---------------------------------------------------------------------------
+def test_second_press_inside_the_gap_is_a_double_click():
+    # RELEASE at 1.12, gap ends at 1.42; the second PRESS settles at 1.39.
+    timeline = PinTimeline().press(1.0, hold=0.1).press(1.37, hold=0.1)
+    events = drive(ButtonMachine(double_click=0.3), timeline, 3.0)
+
+    assert times(events, DOUBLE_CLICK) == [pytest.approx(1.47 + SETTLE, abs=1.5 * PERIOD)]
+    assert times(events, CLICK) == []
+    assert len(times(events, PRESS)) == 2
+
+
+def test_second_press_after_the_gap_is_two_clicks():
+    # Same timing, but the second PRESS settles at 1.43, past the gap: the
+    # expired gap is handled before the press on that same sample.
+    timeline = PinTimeline().press(1.0, hold=0.1).press(1.41, hold=0.1)
+    events = drive(ButtonMachine(double_click=0.3), timeline, 3.0)
+
+    assert times(events, DOUBLE_CLICK) == []
+    clicks = times(events, CLICK)
+    assert len(clicks) == 2
+    assert clicks[0] == pytest.approx(1.12 + 0.3, abs=1.5 * PERIOD)
+    assert (clicks[0], CLICK | PRESS) in events
+
+
+def test_click_without_double_click_window_is_reported_on_release():
+    timeline = PinTimeline().press(1.0, hold=0.1)
+    events = drive(ButtonMachine(double_click=0), timeline, 2.0)
+
+    assert events == [
+        (pytest.approx(1.0 + SETTLE), PRESS),
+        (pytest.approx(1.1 + SETTLE), RELEASE | CLICK),
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Holds
+# ---------------------------------------------------------------------------
+def test_long_hold_fires_at_the_threshold():
+    timeline = PinTimeline().press(1.0, hold=3.0)
+    events = drive(ButtonMachine(hold_time=2.0), timeline, 5.0)
+
+    pressed_at = times(events, PRESS)[0]
+    assert times(events, LONG_HOLD) == [pytest.approx(pressed_at + 2.0, abs=PERIOD)]
+
+
+def test_press_shorter_than_hold_time_is_a_click():
+    timeline = PinTimeline().press(1.0, hold=1.9)
+    events = drive(ButtonMachine(hold_time=2.0), timeline, 4.0)
+
+    assert times(events, LONG_HOLD) == []
+    assert len(times(events, CLICK)) == 1
+
+
+def test_repeat_keeps_its_cadence():
+    # LONG_HOLD at 3.02, then REPEAT every 0.5 s until the release at 4.82.
+    timeline = PinTimeline().press(1.0, hold=3.8)
+    events = drive(ButtonMachine(hold_time=2.0, repeat_interval=0.5), timeline, 6.0)
+
+    hold = times(events, LONG_HOLD)[0]
+    repeats = times(events, REPEAT)
+    assert len(repeats) == 3
+    for k, t in enumerate(repeats, 1):
+        assert t == pytest.approx(hold + 0.5 * k, abs=PERIOD)
+
+
+def test_release_after_a_hold_is_not_a_click():
+    timeline = PinTimeline().press(1.0, hold=3.8)
+    machine = ButtonMachine(hold_time=2.0, repeat_interval=0.5)
+    events = drive(machine, timeline, 6.0)
+
+    assert times(events, CLICK) == []
+    assert times(events, DOUBLE_CLICK) == []
+    assert events[-1] == (pytest.approx(4.8 + SETTLE), RELEASE)
+    assert machine.state == IDLE
+    assert machine.deadline is None
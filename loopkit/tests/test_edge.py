@@ -0,0 +1,85 @@
+"""
+loopkit.edge: libgpiod edge waiter (fake gpiod) and polling waiter (simulated pin)
+"""
+
+import sys
+import time
+
+from loopkit import edge
+from loopkit.edge import GpiodEdgeWaiter, PollingWaiter, open_edge_waiter, wait_for_press
+from loopkit.sim import SimHardware
+
+from . import fake_gpiod
+
+
+# ---------------------------------------------------------------------------
+# Edge Waiter (fake libgpiod v2)
+# ---------------------------------------------------------------------------
+def test_edge_waiter_requests_falling_edge_with_pull_up(monkeypatch):
+    gpiod = fake_gpiod.install(monkeypatch)
+    waiter = GpiodEdgeWaiter(17, chip_path="/dev/gpiochip0")
+
+    settings = gpiod.requests[0].settings[17]
+    assert settings.edge_detection == fake_gpiod.Edge.FALLING
+    assert settings.bias == fake_gpiod.Bias.PULL_UP
+    assert waiter.mode == "edge"
+
+
+def test_edge_waiter_reports_latency_from_kernel_timestamp(monkeypatch):
+    gpiod = fake_gpiod.install(monkeypatch)
+    waiter = GpiodEdgeWaiter(17, chip_path="/dev/gpiochip0")
+
+    assert waiter.wait(0.1) is None
+    gpiod.push_edge(17, time.monotonic_ns() - 2_000_000)
+    latency = waiter.wait(0.1)
+    assert 0.002 <= latency < 0.5
+    assert waiter.wait(0.1) is None  # each edge is reported once
+
+    waiter.close()
+    assert gpiod.requests[0].released
+
+
+def test_find_gpio_chip_picks_the_header_chip(monkeypatch):
+    fake_gpiod.install(monkeypatch, chips={
+        "/dev/gpiochip0": "gpio-brcmstb@107d508500",
+        "/dev/gpiochip4": "pinctrl-rp1",
+    })
+    monkeypatch.setattr(edge.glob, "glob", lambda pattern: ["/dev/gpiochip0", "/dev/gpiochip4"])
+    assert edge.find_gpio_chip() == "/dev/gpiochip4"
+
+
+def test_open_edge_waiter_without_usable_gpiod(monkeypatch):
+    monkeypatch.setitem(sys.modules, "gpiod", None)  # not installed
+    assert open_edge_waiter() is None
+
+    gpiod = fake_gpiod.install(monkeypatch)
+    del gpiod.request_lines  # libgpiod v1 bindings
+    assert open_edge_waiter() is None
+
+
+# ---------------------------------------------------------------------------
+# Polling Waiter (simulated pin)
+# ---------------------------------------------------------------------------
+def polling_waiter(hw):
+    clock = hw.clock
+    return PollingWaiter(lambda: hw.button.value_at(clock.now),
+                         clock=clock.monotonic, sleep=clock.sleep)
+
+
+def test_polling_waiter_detects_press_within_one_interval():
+    hw = SimHardware()
+    hw.button.press(at=1.02, hold=0.2)
+
+    latency = polling_waiter(hw).wait(5.0)
+
+    assert latency is not None and latency <= edge.POLL_INTERVAL + 1e-9
+    assert 1.02 <= hw.clock.now <= 1.02 + edge.POLL_INTERVAL + 1e-9
+
+
+def test_polling_waiter_times_out():
+    hw = SimHardware()
+    result = wait_for_press(polling_waiter(hw), 2.0, clock=hw.clock.monotonic)
+
+    assert not result.detected
+    assert result.elapsed == 2.0
+    assert result.describe() == "no press after 2.0 s (poll)"
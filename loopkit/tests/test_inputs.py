@@ -0,0 +1,79 @@
+"""
+loopkit.inputs: GpiodLines against the fake libgpiod, InputGroup on the sim
+"""
+
+import sys
+
+from loopkit.inputs import GpiodLines, InputGroup, open_input_group
+from loopkit.sim import PinTimeline, SimHardware, simulate
+
+from . import fake_gpiod
+
+
+LINES = (5, 6, 13, 17)
+
+
+# ---------------------------------------------------------------------------
+# GpiodLines (fake libgpiod v2)
+# ---------------------------------------------------------------------------
+def test_one_request_for_all_lines(monkeypatch):
+    gpiod = fake_gpiod.install(monkeypatch)
+    GpiodLines(LINES, chip_path="/dev/gpiochip0", consumer="panel")
+
+    request, = gpiod.requests
+    assert request.consumer == "panel"
+    assert sorted(request.settings) == sorted(LINES)
+    for settings in request.settings.values():
+        assert settings.direction == fake_gpiod.Direction.INPUT
+        assert settings.bias == fake_gpiod.Bias.PULL_UP
+        assert settings.active_low
+
+
+def test_read_builds_mask_from_one_call(monkeypatch):
+    gpiod = fake_gpiod.install(monkeypatch)
+    lines = GpiodLines(LINES, chip_path="/dev/gpiochip0")
+    request = gpiod.requests[0]
+
+    assert lines.read() == 0  # pull-up: all high, released
+
+    gpiod.levels[6] = False   # pressed: pulled low, active with active_low
+    gpiod.levels[17] = False
+    assert lines.read() == 0b1010
+    assert request.get_calls == 2
+
+    lines.close()
+    assert request.released
+
+
+def test_open_input_group_prefers_gpiod(monkeypatch):
+    gpiod = fake_gpiod.install(monkeypatch)
+    gpiod.levels[13] = False
+
+    group = open_input_group(LINES, chip_path="/dev/gpiochip0")
+
+    assert group.mode == "bulk"
+    assert group.poll() == 0b0100
+    assert list(group.bits(group.state)) == [2]
+
+
+# ---------------------------------------------------------------------------
+# Fallback and change detection (simulated pins)
+# ---------------------------------------------------------------------------
+def test_digitalio_fallback_and_changes(monkeypatch):
+    monkeypatch.setitem(sys.modules, "gpiod", None)
+    hw = SimHardware()
+    hw.pins[6] = PinTimeline().press(at=1.0, hold=1.0)
+
+    with simulate(hw):
+        group = open_input_group(LINES)
+        assert group.mode == "digitalio"
+        assert group.poll() == 0
+
+        hw.clock.advance(1.5)
+        changed = group.poll()
+        assert list(InputGroup.bits(group.pressed(changed))) == [1]
+
+        hw.clock.advance(1.0)
+        changed = group.poll()
+        assert list(InputGroup.bits(group.released(changed))) == [1]
+        group.close()
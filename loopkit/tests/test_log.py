@@ -0,0 +1,67 @@
+"""
+loopkit.log: ring buffer, rate limit and formats of Logger
+"""
+
+import io
+import json
+
+from loopkit.log import Logger
+
+
+def make_logger(**kwargs):
+    now = [0.0]
+    stream = io.StringIO()
+    log = Logger(stream=stream, clock=lambda: now[0], wall_clock=lambda: 1000.0, **kwargs)
+    return log, stream, now
+
+
+def test_records_are_written_on_drain_only():
+    log, stream, _ = make_logger(fmt="plain")
+    log.info("Temperature: %.1f C, Humidite: %.1f %%", 21.04, 45.0)
+
+    assert stream.getvalue() == ""
+    assert log.drain() == 1
+    assert stream.getvalue() == "Temperature: 21.0 C, Humidite: 45.0 %\n"
+    assert log.drain() == 0
+
+
+def test_text_and_json_formats():
+    log, stream, _ = make_logger(color=False)
+    log.warn("Erreur lecture: %s", "timeout")
+    log.drain()
+    assert stream.getvalue() == "[WARN] Erreur lecture: timeout\n"
+
+    log, stream, now = make_logger(fmt="json")
+    now[0] = 2.5
+    log.fail("Capteur absent")
+    log.drain()
+    assert json.loads(stream.getvalue()) == {"t": 1002.5, "level": "fail", "msg": "Capteur absent"}
+
+
+def test_repeated_warnings_are_rate_limited():
+    log, stream, now = make_logger(fmt="plain", burst=2, period=60.0)
+    for k in range(5):
+        now[0] = k
+        log.warn("Erreur lecture: %s", k)
+    log.info("Bouton appuye!")  # below limit_level: never limited
+    now[0] = 61.0
+    log.warn("Erreur lecture: %s", 61)
+    log.close()
+
+    assert stream.getvalue().splitlines() == [
+        "Erreur lecture: 0",
+        "Erreur lecture: 1",
+        "Bouton appuye!",
+        "Erreur lecture: 61 (suppressed 3)",
+    ]
+
+
+def test_full_ring_reports_lost_records():
+    log, stream, _ = make_logger(fmt="plain", size=3)
+    for k in range(5):
+        log.info("event %d", k)
+    log.drain()
+
+    assert stream.getvalue().splitlines() == [
+        "2 log records lost (buffer full)", "event 2", "event 3", "event 4",
+    ]
@@ -0,0 +1,122 @@
+"""
+loopkit.periodic (PeriodicTimer): overrun policies, alignment, statistics
+"""
+
+import statistics
+
+import pytest
+
+from loopkit.periodic import CATCH_UP, SKIP, PeriodicTimer
+
+
+def poll(timer, times):
+    """(poll time, deadline that fired) for every poll where due() was True."""
+    fired = []
+    for now in times:
+        while True:
+            deadline = timer.deadline
+            if not timer.due(now):
+                break
+            fired.append((now, deadline))
+            if timer.policy == SKIP:
+                break
+    return fired
+
+
+# ---------------------------------------------------------------------------
+# Overruns
+# ---------------------------------------------------------------------------
+def test_on_time_polls_fire_once_per_deadline():
+    timer = PeriodicTimer(1.0, start=0.0)
+    assert poll(timer, [0.5, 1.0, 1.5, 2.0, 3.0]) == [(1.0, 1.0), (2.0, 2.0), (3.0, 3.0)]
+    assert timer.skipped == 0
+
+
+def test_skip_fires_once_after_a_stall_and_keeps_the_phase():
+    timer = PeriodicTimer(1.0, start=0.0, policy=SKIP)
+    # Poll at 1.0, then the loop stalls until 4.25: deadlines 2, 3, 4 missed.
+    fired = poll(timer, [1.0, 4.25, 4.5, 5.0, 6.0])
+    assert fired == [(1.0, 1.0), (4.25, 2.0), (5.0, 5.0), (6.0, 6.0)]
+    assert timer.skipped == 2
+    assert timer.fired == 4
+
+
+def test_catch_up_fires_once_per_missed_deadline():
+    timer = PeriodicTimer(1.0, start=0.0, policy=CATCH_UP)
+    fired = poll(timer, [1.0, 4.25, 4.5, 5.0])
+    assert fired == [(1.0, 1.0), (4.25, 2.0), (4.25, 3.0), (4.25, 4.0), (5.0, 5.0)]
+    assert timer.skipped == 0
+    assert timer.fired == 5
+
+
+def test_overrun_exactly_on_a_deadline():
+    skip = PeriodicTimer(0.5, start=0.0, policy=SKIP)
+    catch_up = PeriodicTimer(0.5, start=0.0, policy=CATCH_UP)
+    # 2.0 is the 4th deadline: 0.5, 1.0 and 1.5 are overdue.
+    assert poll(skip, [2.0]) == [(2.0, 0.5)]
+    assert skip.deadline == 2.5 and skip.skipped == 3
+    assert [deadline for _, deadline in poll(catch_up, [2.0])] == [0.5, 1.0, 1.5, 2.0]
+    assert catch_up.deadline == 2.5
+
+
+def test_remaining_and_reset():
+    timer = PeriodicTimer(5.0, start=0.0)
+    assert timer.remaining(3.0) == 2.0
+    assert timer.remaining(6.0) == -1.0
+    timer.due(6.0)
+    timer.reset(7.5)
+    assert timer.deadline == 12.5
+    assert timer.fired == 1  # statistics kept
+
+
+@pytest.mark.parametrize("interval, policy", [(0, SKIP), (-1.0, SKIP), (1.0, "drop")])
+def test_invalid_arguments(interval, policy):
+    with pytest.raises(ValueError):
+        PeriodicTimer(interval, start=0.0, policy=policy)
+
+
+# ---------------------------------------------------------------------------
+# Wall-clock alignment
+# ---------------------------------------------------------------------------
+def test_aligned_deadlines_fall_on_wall_clock_multiples():
+    wall_offset = 1_700_000_003.25 - 100.0   # wall time minus monotonic time
+    timer = PeriodicTimer.aligned(5.0, clock=lambda: 100.0,
+                                  wall_clock=lambda: 100.0 + wall_offset)
+    assert timer.deadline == 101.75
+    for _ in range(3):
+        assert (timer.deadline + wall_offset) % 5.0 == 0.0
+        timer.due(timer.deadline)
+
+
+def test_aligned_on_a_multiple_waits_a_full_interval():
+    timer = PeriodicTimer.aligned(10.0, clock=lambda: 50.0, wall_clock=lambda: 1_700_000_000.0)
+    assert timer.deadline == 60.0
+
+
+# ---------------------------------------------------------------------------
+# Drift and jitter
+# ---------------------------------------------------------------------------
+def test_drift_and_jitter_are_the_mean_and_deviation_of_lateness():
+    timer = PeriodicTimer(1.0, start=0.0, policy=SKIP)
+    lateness = [0.0, 0.25, 0.125, 0.5, 0.0625]
+    for k, late in enumerate(lateness, 1):
+        assert timer.due(k + late)
+
+    assert timer.drift == pytest.approx(statistics.fmean(lateness))
+    assert timer.jitter == pytest.approx(statistics.pstdev(lateness))
+    assert timer.max_lateness == 0.5
+    stats = timer.stats()
+    assert (stats["fired"], stats["skipped"], stats["policy"]) == (5, 0, SKIP)
+
+
+def test_skipped_deadlines_count_once_in_the_lateness():
+    timer = PeriodicTimer(1.0, start=0.0, policy=SKIP)
+    timer.due(3.5)  # deadline 1.0, 2.5 s late
+    assert (timer.fired, timer.skipped) == (1, 2)
+    assert timer.drift == timer.max_lateness == 2.5
+    assert timer.jitter == 0.0
+
+
+def test_statistics_start_empty():
+    timer = PeriodicTimer(1.0, start=0.0)
+    assert (timer.drift, timer.jitter, timer.max_lateness) == (0.0, 0.0, 0.0)
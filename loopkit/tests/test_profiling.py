@@ -0,0 +1,159 @@
+"""
+loopkit.profiling (Histogram, LoopProfiler)
+"""
+
+import io
+import json
+import random
+
+import pytest
+
+from loopkit.profiling import BUCKETS, MAX_SHIFT, SUB_BUCKETS, Histogram, LoopProfiler
+
+
+TOP = (2 * SUB_BUCKETS) << MAX_SHIFT  # us, upper edge of the last bucket
+
+
+# ---------------------------------------------------------------------------
+# Bucket math
+# ---------------------------------------------------------------------------
+def test_small_values_have_one_bucket_per_microsecond():
+    assert [Histogram.index(us) for us in range(2 * SUB_BUCKETS)] == list(range(32))
+    assert Histogram.index(-3) == 0
+    assert Histogram.index(32) == 32 and Histogram.lower_bound(32) == 32
+    assert Histogram.lower_bound(33) == 34  # 2 us wide from 32 us
+
+
+def test_every_value_falls_between_its_bucket_edges():
+    rng = random.Random(15)
+    values = list(range(4096)) + [rng.randrange(TOP) for _ in range(5000)] + [TOP - 1]
+    for us in values:
+        i = Histogram.index(us)
+        assert Histogram.lower_bound(i) <= us < Histogram.lower_bound(i + 1), us
+
+
+def test_buckets_are_contiguous_and_about_6_percent_wide():
+    for i in range(1, BUCKETS):
+        low, high = Histogram.lower_bound(i), Histogram.lower_bound(i + 1)
+        assert Histogram.lower_bound(i - 1) < low < high
+        assert Histogram.index(low) == i
+        if low >= 2 * SUB_BUCKETS:
+            assert (high - low) / low <= 1 / SUB_BUCKETS
+
+
+def test_range_tops_out_at_about_36_minutes():
+    assert Histogram.lower_bound(BUCKETS) == TOP
+    assert 35 * 60 < TOP / 1e6 < 36 * 60
+    assert Histogram.index(TOP - 1) == BUCKETS - 1
+    assert Histogram.index(TOP) == BUCKETS - 1   # clamped
+    assert Histogram.index(10 ** 15) == BUCKETS - 1
+
+
+# ---------------------------------------------------------------------------
+# Recording and percentiles
+# ---------------------------------------------------------------------------
+def test_percentile_is_the_upper_edge_of_its_bucket():
+    h = Histogram()
+    for us in (10, 20, 30, 1000, 1000, 1000, 1000, 1000, 1000, 5000):
+        h.record(us / 1e6)
+    bucket_1000 = Histogram.lower_bound(Histogram.index(1000) + 1) / 1e6
+    assert h.percentile(10) == pytest.approx(11e-6)
+    assert h.percentile(50) == pytest.approx(bucket_1000)
+    assert h.percentile(100) == pytest.approx(5000e-6)  # capped at the maximum
+    summary = h.summary()
+    assert (summary["count"], summary["min"], summary["max"]) == (10, 10e-6, 5000e-6)
+    assert summary["mean"] == pytest.approx(sum((10, 20, 30, 6000, 5000)) / 10 / 1e6)
+
+
+def test_percentiles_stay_within_the_bucket_resolution():
+    rng = random.Random(3)
+    values = sorted(rng.lognormvariate(-7, 1.5) for _ in range(2000))
+    h = Histogram()
+    for v in values:
+        h.record(v)
+    for p in (50, 90, 99):
+        exact = values[round(p / 100 * len(values)) - 1]
+        assert exact <= h.percentile(p) <= max(exact * (1 + 1 / SUB_BUCKETS), exact + 1e-6)
+
+
+def test_overflow_is_counted_in_the_last_bucket():
+    h = Histogram()
+    h.record(0.001)
+    h.record(3600.0)                                # one hour, past the range
+    assert h.counts[BUCKETS - 1] == 1
+    assert h.percentile(100) == 3600.0
+    assert h.percentile(50) == pytest.approx(Histogram.lower_bound(Histogram.index(1000) + 1) / 1e6)
+
+
+def test_empty_histogram():
+    h = Histogram()
+    assert h.percentile(50) is None
+    assert h.summary() == {"count": 0}
+
+
+# ---------------------------------------------------------------------------
+# LoopProfiler
+# ---------------------------------------------------------------------------
+class StepClock:
+    def __init__(self, step):
+        self.now = 0.0
+        self.step = step
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        self.now += self.step
+        return self.now
+
+
+def test_enabled_profiler_records_every_hook():
+    clock = StepClock(0.002)
+    profiler = LoopProfiler(clock=clock, tasks=("sensor",))
+    for _ in range(3):
+        profiler.begin()
+        profiler.end()
+    profiler.end()                                  # without begin(): ignored
+    profiler.sensor(0.08)
+    profiler.lateness("sensor", -0.001)             # early counts as on time
+    profiler.lateness("button", 0.004)              # new task
+    profiler.count("sensor_errors")
+    profiler.count("sensor_errors", 2)
+
+    snapshot = json.loads(profiler.to_json())
+    assert snapshot["iterations"]["count"] == 3
+    assert snapshot["iterations"]["max"] == pytest.approx(0.002)
+    assert snapshot["sensor_reads"]["max"] == 0.08
+    assert snapshot["task_lateness"]["sensor"]["max"] == 0.0
+    assert snapshot["task_lateness"]["button"]["count"] == 1
+    assert snapshot["counters"] == {"sensor_errors": 3}
+
+    out = io.StringIO()
+    profiler.dump(out)
+    lines = out.getvalue().splitlines()
+    assert lines[0] == "Profil de la boucle:"
+    assert any(line.split()[:2] == ["retard", "button"] for line in lines)
+    assert lines[-1].split() == ["sensor_errors", "3"]
+
+
+def test_disabled_profiler_hooks_are_no_ops():
+    clock = StepClock(0.002)
+    profiler = LoopProfiler(enabled=False, clock=clock)
+    for hook in (profiler.begin, profiler.end, profiler.sensor, profiler.lateness,
+                 profiler.count):
+        assert hook.__name__ == "_noop"
+    profiler.begin()
+    profiler.end()
+    profiler.sensor(0.08)
+    profiler.lateness("sensor", 0.5)
+    profiler.count("sensor_errors")
+
+    assert clock.calls == 0
+    assert profiler.snapshot() == {
+        "iterations": {"count": 0},
+        "sensor_reads": {"count": 0},
+        "task_lateness": {},
+        "counters": {},
+    }
+    out = io.StringIO()
+    profiler.dump(out)
+    assert out.getvalue().splitlines()[1].split() == ["iteration", "-"]
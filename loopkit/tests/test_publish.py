@@ -0,0 +1,306 @@
+"""
+loopkit.publish: Publisher against the in-process LocalBroker
+"""
+
+import os
+import sys
+import threading
+import time
+import types
+
+import pytest
+
+from loopkit.publish import SPILL_FILE, LocalBroker, LocalConnection, MqttConnection, Publisher
+
+
+def samples(n, start=0):
+    return [{"n": i} for i in range(start, start + n)]
+
+
+def wait_until(condition, timeout=5.0):
+    give_up = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > give_up:
+            return False
+        time.sleep(0.002)
+    return True
+
+
+class FlakyConnection(LocalConnection):
+    """LocalConnection whose publish() raises RuntimeError on chosen calls."""
+
+    def __init__(self, broker, fail_on):
+        super().__init__(broker)
+        self.fail_on = fail_on  # shared set of call numbers, counted per broker
+        broker.calls = getattr(broker, "calls", 0)
+
+    def publish(self, topic, payload):
+        self.broker.calls += 1
+        if self.broker.calls in self.fail_on:
+            raise RuntimeError("paho: rc=MQTT_ERR_NO_CONN")
+        super().publish(topic, payload)
+
+
+# ---------------------------------------------------------------------------
+# Batching
+# ---------------------------------------------------------------------------
+def test_batches_in_order():
+    broker = LocalBroker()
+    publisher = Publisher(broker.connect, max_batch=10, max_age=60)
+    for data in samples(25):
+        publisher.publish(data)
+
+    assert publisher.flush()
+    publisher.close()
+
+    assert broker.samples() == samples(25)
+    assert len(broker.messages) == 3
+    assert broker.connections == 1
+
+
+# ---------------------------------------------------------------------------
+# Outage, spill, restart, replay
+# ---------------------------------------------------------------------------
+def test_outage_spills_and_next_run_replays(tmp_path):
+    broker = LocalBroker()
+    broker.online = False
+    publisher = Publisher(broker.connect, max_batch=4, outbox_size=5,
+                          spill_dir=tmp_path, retry=0.01)
+    for data in samples(20):
+        publisher.publish(data)
+        assert wait_until(lambda: len(publisher.outbox) <= 5)
+    assert publisher.stats["spilled"] == 15
+    publisher.close(timeout=0.1)  # still offline: the rest goes to disk too
+
+    assert broker.samples() == []
+    assert publisher.stats["spilled"] == 20
+    assert (tmp_path / SPILL_FILE).exists()
+
+    broker.online = True
+    publisher = Publisher(broker.connect, max_batch=4, outbox_size=5, spill_dir=tmp_path)
+    for data in samples(3, start=20):
+        publisher.publish(data)
+    assert publisher.flush()
+    publisher.close()
+
+    assert broker.samples() == samples(23)  # spilled first, in order, once each
+    assert publisher.stats["replayed"] == 20
+    assert os.listdir(tmp_path) == []
+
+
+def test_reconnects_after_outage_without_duplicates(tmp_path):
+    broker = LocalBroker()
+    publisher = Publisher(broker.connect, max_batch=5, max_age=0.01, outbox_size=8,
+                          spill_dir=tmp_path, retry=0.01)
+    for data in samples(10):
+        publisher.publish(data)
+    assert wait_until(lambda: publisher.stats["sent"] == 10)
+
+    broker.online = False
+    for data in samples(30, start=10):
+        publisher.publish(data)
+        assert wait_until(lambda: len(publisher.outbox) <= 8)
+    assert publisher.stats["spilled"] >= 22
+
+    broker.online = True
+    assert publisher.flush()
+    publisher.close()
+
+    assert broker.samples() == samples(40)
+    assert broker.connections == 2
+
+
+# ---------------------------------------------------------------------------
+# Flush requests
+# ---------------------------------------------------------------------------
+class CountingConnection(LocalConnection):
+    """LocalConnection counting connect attempts, successful or not."""
+
+    attempts = 0
+
+    def connect(self):
+        CountingConnection.attempts += 1
+        super().connect()
+
+
+def test_failed_flush_keeps_the_retry_interval(monkeypatch):
+    monkeypatch.setattr(CountingConnection, "attempts", 0)
+    broker = LocalBroker()
+    broker.online = False
+    publisher = Publisher(lambda: CountingConnection(broker), max_batch=1, retry=60)
+    publisher.publish({"n": 0})
+    assert not publisher.flush(timeout=1.0)  # one immediate attempt, failed
+    assert CountingConnection.attempts == 1
+
+    # max_batch=1: every publish wakes the worker, which must not reconnect
+    # before retry seconds.
+    for data in samples(5, start=1):
+        publisher.publish(data)
+        time.sleep(0.005)
+    assert CountingConnection.attempts == 1
+
+    broker.online = True
+    assert publisher.flush()               # a new request tries at once
+    assert CountingConnection.attempts == 2
+    publisher.close()
+    assert broker.samples() == samples(6)
+
+
+def test_flush_during_a_drain_is_not_lost():
+    broker = LocalBroker(latency=0.02)
+    publisher = Publisher(broker.connect, max_batch=1, max_age=60)
+    for data in samples(5):
+        publisher.publish(data)
+    first = threading.Thread(target=publisher.flush)
+    first.start()
+    assert wait_until(lambda: publisher.stats["sent"] >= 1)
+
+    publisher.publish({"n": 5})            # queued while the drain runs
+    assert publisher.flush()
+    first.join()
+    assert broker.samples() == samples(6)
+    publisher.close()
+
+
+def test_concurrent_flushes_each_send_what_came_before():
+    broker = LocalBroker()
+    publisher = Publisher(broker.connect, max_batch=3, max_age=60)
+    missing = []
+
+    def producer(start):
+        for data in samples(40, start):
+            publisher.publish(data)
+            publisher.flush(timeout=2.0)
+            if data not in broker.samples():  # the other producers keep publishing
+                missing.append(data)
+
+    threads = [threading.Thread(target=producer, args=(k * 100,)) for k in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    publisher.close()
+
+    assert missing == []
+    assert len(broker.samples()) == 160
+
+
+# ---------------------------------------------------------------------------
+# Failures other than ConnectionError
+# ---------------------------------------------------------------------------
+def test_send_error_keeps_batch_and_reconnects():
+    broker = LocalBroker()
+    fail_on = {1}
+    publisher = Publisher(lambda: FlakyConnection(broker, fail_on), max_batch=5,
+                          max_age=60, retry=0.01)
+    for data in samples(5):
+        publisher.publish(data)
+
+    assert not publisher.flush()  # the first attempt fails
+    assert wait_until(lambda: publisher.stats["sent"] == 5)
+    publisher.close()
+
+    assert broker.samples() == samples(5)
+    assert publisher.stats["failures"] == 1
+    assert publisher.stats["connects"] == 2
+
+
+def test_replay_error_keeps_spill_without_duplicates(tmp_path):
+    broker = LocalBroker()
+    broker.online = False
+    publisher = Publisher(broker.connect, max_batch=4, spill_dir=tmp_path)
+    for data in samples(12):
+        publisher.publish(data)
+    publisher.close(timeout=0.1)
+    broker.online = True
+
+    fail_on = {2}  # second replayed batch
+    publisher = Publisher(lambda: FlakyConnection(broker, fail_on), max_batch=4,
+                          spill_dir=tmp_path, retry=0.01)
+    publisher.flush()
+    assert wait_until(lambda: publisher.stats["replayed"] == 12)
+    publisher.close()
+
+    assert broker.samples() == samples(12)
+    assert not (tmp_path / (SPILL_FILE + ".replay")).exists()
+
+
+# ---------------------------------------------------------------------------
+# MqttConnection (fake paho)
+# ---------------------------------------------------------------------------
+class FakeInfo:
+    def __init__(self, rc, outcome):
+        self.rc = rc
+        self.outcome = outcome
+
+    def wait_for_publish(self, timeout=None):
+        if isinstance(self.outcome, Exception):
+            raise self.outcome
+
+    def is_published(self):
+        return self.outcome is True
+
+
+class FakeClient:
+    outcomes = []
+
+    def __init__(self, client_id=""):
+        self.stopped = False
+
+    def connect(self, host, port, keepalive):
+        return 0
+
+    def loop_start(self):
+        pass
+
+    def loop_stop(self):
+        self.stopped = True
+
+    def disconnect(self):
+        pass
+
+    def publish(self, topic, payload, qos=0):
+        outcome = self.outcomes.pop(0)
+        return FakeInfo(4 if outcome == "no_conn" else 0, outcome)
+
+
+@pytest.fixture
+def paho(monkeypatch):
+    client = types.ModuleType("paho.mqtt.client")
+    client.Client = FakeClient
+    client.MQTT_ERR_SUCCESS = 0
+    mqtt = types.ModuleType("paho.mqtt")
+    mqtt.client = client
+    package = types.ModuleType("paho")
+    package.mqtt = mqtt
+    monkeypatch.setitem(sys.modules, "paho", package)
+    monkeypatch.setitem(sys.modules, "paho.mqtt", mqtt)
+    monkeypatch.setitem(sys.modules, "paho.mqtt.client", client)
+    return client
+
+
+@pytest.mark.parametrize("outcome", [
+    RuntimeError("rc=MQTT_ERR_NO_CONN"),
+    ValueError("message queue full"),
+    False,       # timed out
+    "no_conn",   # error rc, nothing queued
+])
+def test_mqtt_errors_become_connection_errors(paho, outcome):
+    FakeClient.outcomes = [outcome]
+    connection = MqttConnection("broker.local")
+    connection.connect()
+    client = connection.client
+
+    with pytest.raises(ConnectionError):
+        connection.publish("f4/capteur", "[]")
+
+    assert client.stopped and connection.client is None  # paho's copy is dropped
+
+
+def test_mqtt_publish_after_reconnect(paho):
+    FakeClient.outcomes = [True]
+    connection = MqttConnection("broker.local")
+    connection.connect()
+    connection.publish("f4/capteur", "[]")
+    connection.close()
+    assert connection.client is None
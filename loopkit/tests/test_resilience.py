@@ -0,0 +1,215 @@
+"""
+loopkit.resilience (Backoff, CircuitBreaker, ResilientReader, bus_probe)
+
+Times come from a VirtualClock; the jitter is seeded or switched off.
+"""
+
+import random
+
+import pytest
+
+from loopkit.aht import AHTX0_ADDRESS
+from loopkit.resilience import (
+    CLOSED, HALF_OPEN, OPEN, Backoff, CircuitBreaker, ResilientReader, bus_probe,
+)
+from loopkit.sim import SimHardware, SimI2C, VirtualClock, run_program
+
+
+# ---------------------------------------------------------------------------
+# Backoff
+# ---------------------------------------------------------------------------
+def test_backoff_doubles_up_to_the_maximum():
+    backoff = Backoff(base=1.0, factor=2.0, maximum=10.0, jitter=0.0)
+    assert [backoff.next() for _ in range(6)] == [1.0, 2.0, 4.0, 8.0, 10.0, 10.0]
+    backoff.reset()
+    assert backoff.next() == 1.0
+
+
+def test_backoff_jitter_only_shortens_and_is_seeded():
+    delays = [Backoff(jitter=0.25, rng=random.Random(7)).next() for _ in range(2)]
+    assert delays[0] == delays[1]
+
+    backoff = Backoff(base=4.0, factor=1.0, maximum=4.0, jitter=0.25, rng=random.Random(7))
+    for _ in range(100):
+        assert 3.0 <= backoff.next() <= 4.0
+
+
+# ---------------------------------------------------------------------------
+# Circuit breaker
+# ---------------------------------------------------------------------------
+def breaker(threshold=3):
+    return CircuitBreaker(threshold, Backoff(base=1.0, maximum=10.0, jitter=0.0))
+
+
+def test_breaker_opens_after_the_threshold():
+    b = breaker()
+    assert b.allow(0.0)
+    assert not b.failure(0.0)        # retry at 1
+    assert not b.allow(0.5)
+    assert b.allow(1.0) and b.state == CLOSED
+    assert not b.failure(1.0)        # retry at 3
+    assert b.allow(3.0)
+    assert b.failure(3.0)            # third failure: open until 7
+    assert (b.state, b.opened, b.retry_at) == (OPEN, 1, 7.0)
+
+
+def test_open_breaker_blocks_until_the_cooldown_then_half_opens():
+    b = breaker(threshold=1)
+    b.failure(0.0)
+    assert b.state == OPEN
+    assert not b.allow(0.99)
+    assert b.state == OPEN
+    assert b.allow(1.0)
+    assert b.state == HALF_OPEN
+
+
+def test_half_open_failure_reopens_with_a_longer_cooldown():
+    b = breaker(threshold=1)
+    b.failure(0.0)                   # open until 1
+    b.allow(1.0)
+    assert b.failure(1.0)            # half-open attempt failed: open until 3
+    assert (b.state, b.opened, b.retry_at) == (OPEN, 2, 3.0)
+
+
+def test_half_open_success_closes_and_resets():
+    b = breaker(threshold=1)
+    b.failure(0.0)
+    b.allow(1.0)
+    b.success()
+    assert (b.state, b.failures, b.retry_at) == (CLOSED, 0, 0.0)
+    b.failure(5.0)
+    assert b.retry_at == 6.0         # backoff starts over at base
+
+
+def test_breaker_passes_its_rng_to_the_backoff():
+    a = CircuitBreaker(rng=random.Random(3))
+    b = CircuitBreaker(rng=random.Random(3))
+    a.failure(0.0)
+    b.failure(0.0)
+    assert a.retry_at == b.retry_at
+
+
+# ---------------------------------------------------------------------------
+# Bus probe
+# ---------------------------------------------------------------------------
+class FakeI2C:
+    def __init__(self, addresses=(), locked=False, error=None):
+        self.addresses = list(addresses)
+        self.locked = locked
+        self.error = error
+        self.unlocks = 0
+
+    def try_lock(self):
+        return not self.locked
+
+    def scan(self):
+        if self.error:
+            raise self.error
+        return self.addresses
+
+    def unlock(self):
+        self.unlocks += 1
+
+
+def test_bus_probe_finds_the_sensor():
+    i2c = FakeI2C([0x3C, AHTX0_ADDRESS])
+    assert bus_probe(i2c)
+    assert not bus_probe(FakeI2C([0x3C]))
+    assert i2c.unlocks == 1
+
+
+def test_bus_probe_treats_a_bus_error_as_absent_and_unlocks():
+    i2c = FakeI2C(error=OSError(5, "I/O error"))
+    assert not bus_probe(i2c)
+    assert i2c.unlocks == 1
+
+
+def test_bus_probe_leaves_a_busy_bus_alone():
+    i2c = FakeI2C(locked=True, error=AssertionError("scanned a locked bus"))
+    assert bus_probe(i2c)
+    assert i2c.unlocks == 0
+
+
+def test_bus_probe_follows_the_simulated_sensor():
+    hw = SimHardware()
+    hw.sensor.unplug(10.0, 20.0)
+    i2c = SimI2C(hw)
+    assert bus_probe(i2c)
+    hw.clock.advance(15.0)
+    assert not bus_probe(i2c)
+
+
+# ---------------------------------------------------------------------------
+# Reader
+# ---------------------------------------------------------------------------
+class Counts:
+    """Profiler stand-in that keeps the counters."""
+
+    def __init__(self):
+        self.counts = {}
+        self.sensor_times = []
+
+    def count(self, name):
+        self.counts[name] = self.counts.get(name, 0) + 1
+
+    def sensor(self, seconds):
+        self.sensor_times.append(seconds)
+
+
+def unplugged_reader(clock, present, counts, rng=None):
+    def read():
+        if not present[0]:
+            clock.advance(1.0)  # bus timeout
+            raise OSError(121, "Remote I/O error")
+        return 21.5, 42.0
+
+    return ResilientReader(read, probe=lambda: present[0], profiler=counts,
+                           clock=clock.monotonic, rng=rng)
+
+
+def test_reader_times_out_once_then_only_probes():
+    clock = VirtualClock()
+    present = [False]
+    counts = Counts()
+    reader = unplugged_reader(clock, present, counts, rng=random.Random(1))
+
+    for _ in range(120):                # 10 minutes of 5 s reads
+        assert reader.read() is None
+        clock.advance(5.0)
+    assert clock.now == pytest.approx(601.0)  # a single 1 s timeout
+    assert counts.counts["sensor_errors"] >= counts.counts["probe_failed"] > 0
+    assert counts.counts["sensor_skipped"] > 0
+    assert counts.counts["breaker_open"] >= 1
+    assert reader.state in (OPEN, HALF_OPEN)
+
+    present[0] = True
+    for _ in range(3):                  # retried within the 10 s cap
+        values = reader.read()
+        if values is not None:
+            break
+        clock.advance(5.0)
+    assert values == (21.5, 42.0)
+    assert reader.recovered and reader.state == CLOSED
+    assert counts.counts["sensor_ok"] == 1
+
+
+def test_reader_without_profiler_does_not_need_one():
+    clock = VirtualClock()
+    reader = ResilientReader(lambda: (1.0, 2.0), clock=clock.monotonic)
+    assert reader.read() == (1.0, 2.0)
+    assert not reader.recovered
+
+
+def test_seeded_simulation_recovers_at_the_same_time():
+    def recovery():
+        hw = SimHardware()
+        hw.sensor.timeout = 1.0
+        hw.sensor.unplug(20.0, 120.0)
+        output = run_program(hw, "loopkit.scheduled", until=160.0,
+                             args=(None, random.Random(24)))
+        assert len(output.times("Erreur lecture")) == 1
+        return [t for t in output.times("Temperature") if t >= 120.0][0]
+
+    first = recovery()
+    assert first - 120.0 <= 10.0 + 5.0  # backoff cap + one SENSOR_INTERVAL
+    assert recovery() == first
@@ -0,0 +1,130 @@
+"""
+loopkit.ringbuffer (SampleRing, WindowStats, SensorHistory)
+
+The incremental aggregates are checked against a brute-force scan of the
+samples still in the buffer and inside the window.
+"""
+
+import math
+import random
+import statistics
+
+import pytest
+
+from loopkit.ringbuffer import SampleRing, SensorHistory
+
+
+def brute_force(samples, capacity, window, now, column):
+    """Aggregates over the stored samples taken less than window s before now."""
+    index = {"temperature": 1, "humidity": 2}[column]
+    stored = samples[-capacity:]
+    values = [s[index] for s in stored if s[0] > now - window]
+    if not values:
+        return {"count": 0}
+    return {
+        "count": len(values),
+        "min": min(values),
+        "max": max(values),
+        "mean": statistics.fmean(values),
+        "stddev": statistics.pstdev(values),
+    }
+
+
+def check(history, samples, capacity, windows, now):
+    for column in ("temperature", "humidity"):
+        for window in windows:
+            expected = brute_force(samples, capacity, window, now, column)
+            stats = history.stats(column, window, now)
+            assert stats["count"] == expected["count"], (column, window, now)
+            if not expected["count"]:
+                assert math.isnan(stats["mean"]) and math.isnan(stats["min"])
+                continue
+            assert stats["min"] == expected["min"]
+            assert stats["max"] == expected["max"]
+            assert stats["mean"] == pytest.approx(expected["mean"], rel=1e-12)
+            # Compared as variances: sqrt() turns a 1e-15 rounding error of
+            # a zero variance into a 3e-8 stddev.
+            assert stats["stddev"] ** 2 == pytest.approx(expected["stddev"] ** 2,
+                                                         rel=1e-9, abs=1e-12)
+
+
+# ---------------------------------------------------------------------------
+# Brute-force comparison
+# ---------------------------------------------------------------------------
+@pytest.mark.parametrize("seed", range(3))
+@pytest.mark.parametrize("capacity", [1, 7, 64])
+def test_windows_match_brute_force(seed, capacity):
+    rng = random.Random(seed)
+    windows = (5, 30, 10_000)  # the last one is bounded by the capacity
+    history = SensorHistory(capacity=capacity, windows=windows)
+    samples = []
+    t = 0.0
+    for _ in range(300):  # several wraparounds of every capacity
+        # Mostly short gaps, some longer than a window; repeated values
+        # exercise the ties in the monotonic queues.
+        t += rng.choice((0.5, 1.0, 2.0, rng.uniform(0.1, 3.0), 12.0, 45.0))
+        temperature = rng.choice((21.5, 22.0, rng.gauss(22.0, 2.0)))
+        humidity = rng.gauss(45.0, 5.0)
+        history.push(t, temperature, humidity)
+        samples.append((t, temperature, humidity))
+        check(history, samples, capacity, windows, t)
+
+
+def test_large_offsets_keep_their_precision():
+    # Shifted sums: a constant offset must not swamp the variance.
+    history = SensorHistory(capacity=32, windows=(1000,))
+    samples = []
+    rng = random.Random(3)
+    for k in range(200):
+        value = 1e6 + rng.uniform(-0.01, 0.01)
+        history.push(float(k), value, value)
+        samples.append((float(k), value, value))
+    check(history, samples, 32, (1000,), 199.0)
+
+
+# ---------------------------------------------------------------------------
+# Expiry without pushes
+# ---------------------------------------------------------------------------
+def test_window_empties_while_the_sensor_is_silent():
+    history = SensorHistory(capacity=16, windows=(60,))
+    samples = [(float(t), 20.0 + t, 40.0) for t in range(0, 50, 5)]
+    for sample in samples:
+        history.push(*sample)
+
+    for now in (45.0, 70.0, 100.0, 104.9, 105.0, 500.0):
+        check(history, samples, 16, (60,), now)
+    assert history.stats("temperature", 60, 500.0)["count"] == 0
+
+
+def test_pushes_after_an_empty_window_start_fresh():
+    history = SensorHistory(capacity=8, windows=(10,))
+    history.push(0.0, 30.0, 50.0)
+    assert history.stats("temperature", 10, 100.0)["count"] == 0
+    history.push(101.0, 20.0, 40.0)
+    history.push(102.0, 22.0, 42.0)
+    stats = history.stats("temperature", 10, 102.0)
+    assert (stats["count"], stats["min"], stats["max"], stats["mean"]) == (2, 20.0, 22.0, 21.0)
+
+
+def test_stats_default_to_the_history_clock():
+    now = [0.0]
+    history = SensorHistory(capacity=8, windows=(10,), clock=lambda: now[0])
+    history.push(0.0, 21.0, 45.0)
+    assert history.stats("humidity", 10)["count"] == 1
+    now[0] = 10.0
+    assert history.stats("humidity", 10)["count"] == 0
+
+
+# ---------------------------------------------------------------------------
+# Ring
+# ---------------------------------------------------------------------------
+def test_ring_keeps_the_last_capacity_samples():
+    ring = SampleRing(4)
+    for k in range(10):
+        ring.push(float(k), 20.0 + k, 40.0 + k)
+    assert len(ring) == 4 and ring.oldest == 6
+    assert ring.latest(2) == [(8.0, 28.0, 48.0), (9.0, 29.0, 49.0)]
+    with pytest.raises(IndexError):
+        ring.get(5)
+    with pytest.raises(ValueError):
+        SampleRing(0)
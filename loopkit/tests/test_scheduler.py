@@ -0,0 +1,221 @@
+"""
+loopkit.scheduler (Scheduler) on the virtual clock
+"""
+
+import pytest
+
+from loopkit.scheduler import STOP, Scheduler
+from loopkit.sim import SimEdgeWaiter, SimHardware, VirtualClock
+
+
+def make(clock=None, waiter=None, profiler=None):
+    clock = clock or VirtualClock()
+    return Scheduler(clock=clock.monotonic, sleep=clock.sleep, waiter=waiter,
+                     profiler=profiler), clock
+
+
+def recorder(log, name, result=None):
+    def callback(now):
+        log.append((name, now))
+        return result
+    callback.__name__ = name
+    return callback
+
+
+# ---------------------------------------------------------------------------
+# Ordering
+# ---------------------------------------------------------------------------
+def test_one_shot_tasks_run_in_deadline_order():
+    scheduler, clock = make()
+    log = []
+    scheduler.call_at(3.0, recorder(log, "c"))
+    scheduler.call_at(1.0, recorder(log, "a"))
+    scheduler.call_later(2.0, recorder(log, "b"))
+    scheduler.run()  # returns once nothing is left
+    assert log == [("a", 1.0), ("b", 2.0), ("c", 3.0)]
+    assert clock.now == 3.0
+    assert scheduler.wakeups == clock.sleeps == 3
+
+
+def test_equal_deadlines_run_in_registration_order():
+    scheduler, _ = make()
+    log = []
+    for name in "xyz":
+        scheduler.call_at(1.0, recorder(log, name))
+    scheduler.run()
+    assert [name for name, _ in log] == ["x", "y", "z"]
+
+
+def test_call_later_counts_from_the_current_time():
+    scheduler, clock = make(VirtualClock(start=10.0))
+    log = []
+    scheduler.call_later(0.5, recorder(log, "a"))
+    assert scheduler.next_deadline() == 10.5
+    scheduler.run()
+    assert log == [("a", 10.5)]
+
+
+def test_every_keeps_its_deadlines_and_interleaves_with_one_shots():
+    scheduler, _ = make()
+    log = []
+    scheduler.every(1.0, recorder(log, "tick"), first=0)
+    scheduler.call_at(2.5, recorder(log, "once"))
+    scheduler.call_at(4.0, recorder(log, "stop", STOP))
+    scheduler.run()
+    # At 4.0 the one-shot goes first: a periodic task is pushed again after
+    # each run, behind the tasks already waiting for the same deadline.
+    assert log == [
+        ("tick", 0.0), ("tick", 1.0), ("tick", 2.0), ("once", 2.5),
+        ("tick", 3.0), ("stop", 4.0),
+    ]
+
+
+def test_every_first_run_defaults_to_one_interval():
+    scheduler, _ = make()
+    task = scheduler.every(5.0, recorder([], "sensor"))
+    assert task.when == scheduler.next_deadline() == 5.0
+    assert task.name == "sensor"
+
+
+def test_cancelled_tasks_do_not_run():
+    scheduler, _ = make()
+    log = []
+    task = scheduler.call_at(1.0, recorder(log, "a"))
+    scheduler.call_at(2.0, recorder(log, "b"))
+    task.cancel()
+    assert scheduler.next_deadline() == 2.0
+    scheduler.run()
+    assert log == [("b", 2.0)]
+
+
+# ---------------------------------------------------------------------------
+# Stopping
+# ---------------------------------------------------------------------------
+def test_stop_result_skips_the_rest_of_the_due_tasks():
+    scheduler, _ = make()
+    log = []
+    scheduler.call_at(1.0, recorder(log, "stop", STOP))
+    scheduler.call_at(1.0, recorder(log, "late"))
+    scheduler.run()
+    assert log == [("stop", 1.0)]
+    # The remaining task is still pending for a later run().
+    scheduler.run()
+    assert log == [("stop", 1.0), ("late", 1.0)]
+
+
+def test_stop_method_from_a_callback():
+    scheduler, _ = make()
+    log = []
+
+    def halt(now):
+        log.append(("halt", now))
+        scheduler.stop()
+
+    scheduler.every(1.0, halt)
+    scheduler.run()
+    assert log == [("halt", 1.0)]
+
+
+def test_keyboard_interrupt_in_the_sleep_leaves_run():
+    scheduler, clock = make()
+    clock.interrupt_at = 3.5
+    log = []
+    scheduler.every(1.0, recorder(log, "tick"))
+    with pytest.raises(KeyboardInterrupt):
+        scheduler.run()
+    assert [now for _, now in log] == [1.0, 2.0, 3.0]
+
+
+# ---------------------------------------------------------------------------
+# Exceptions
+# ---------------------------------------------------------------------------
+def test_task_exception_propagates_and_the_schedule_survives():
+    scheduler, _ = make()
+    log = []
+
+    def flaky(now):
+        log.append(now)
+        if now == 2.0:
+            raise ValueError("capteur")
+        if now == 4.0:
+            return STOP
+
+    scheduler.every(1.0, flaky)
+    with pytest.raises(ValueError):
+        scheduler.run()
+    # The periodic task was rescheduled before it ran: run() resumes.
+    scheduler.run()
+    assert log == [1.0, 2.0, 3.0, 4.0]
+
+
+# ---------------------------------------------------------------------------
+# Idle and input callbacks
+# ---------------------------------------------------------------------------
+def test_on_idle_runs_after_the_due_tasks_before_each_sleep():
+    scheduler, clock = make()
+    log = []
+    scheduler.every(1.0, recorder(log, "tick"))
+    scheduler.call_at(3.0, recorder(log, "stop", STOP))
+    scheduler.on_idle(lambda: log.append(("idle", clock.now)))
+    scheduler.run()
+    assert log == [
+        ("idle", 0.0), ("tick", 1.0), ("idle", 1.0), ("tick", 2.0), ("idle", 2.0),
+        ("stop", 3.0),  # no idle pass after STOP
+    ]
+
+
+def test_on_input_gets_the_edge_time_not_the_wakeup_time():
+    hw = SimHardware()
+    hw.button.press(2.5, hold=0.2)
+    scheduler, clock = make(hw.clock, waiter=SimEdgeWaiter(hw, latency=0.03))
+    log = []
+    scheduler.every(1.0, recorder(log, "tick"))
+    scheduler.call_at(4.0, recorder(log, "stop", STOP))
+    scheduler.on_input(lambda edge: log.append(("edge", edge, clock.now)))
+    scheduler.run()
+
+    edge = [entry for entry in log if entry[0] == "edge"]
+    assert edge == [("edge", pytest.approx(2.5), pytest.approx(2.53))]
+    assert [entry[1] for entry in log if entry[0] == "tick"] == [1.0, 2.0, 3.0]
+    assert clock.sleeps == 0  # the waiter replaces the sleep
+
+
+def test_input_callback_can_stop_the_loop():
+    hw = SimHardware()
+    hw.button.press(1.5, hold=0.2)
+    scheduler, clock = make(hw.clock, waiter=SimEdgeWaiter(hw))
+    scheduler.every(1.0, recorder([], "tick"))
+    scheduler.on_input(lambda edge: STOP)
+    scheduler.run()
+    assert clock.now == pytest.approx(1.5)
+
+
+# ---------------------------------------------------------------------------
+# Profiler hooks
+# ---------------------------------------------------------------------------
+class Lateness:
+    enabled = True
+
+    def __init__(self):
+        self.late = []
+
+    def begin(self):
+        pass
+
+    end = begin
+
+    def lateness(self, name, seconds):
+        self.late.append((name, seconds))
+
+
+def test_lateness_is_reported_per_task():
+    profiler = Lateness()
+    scheduler, clock = make(profiler=profiler)
+
+    def slow(now):
+        clock.advance(0.25)  # blocks past the next deadline
+
+    scheduler.call_at(1.0, slow)
+    scheduler.call_at(1.1, recorder([], "next"))
+    scheduler.run()
+    assert profiler.late == [("slow", 0.0), ("next", pytest.approx(0.15))]
@@ -0,0 +1,186 @@
+"""
+loopkit.sensors (SensorRegistry) on the Scheduler and the virtual clock
+"""
+
+import pytest
+
+from loopkit.aht import AHTx0Reader
+from loopkit.scheduler import STOP, Scheduler
+from loopkit.sensors import SensorRegistry
+from loopkit.sim import SensorModel, SimHardware, SimI2C, SimI2CDevice, simulate
+
+
+class Bench:
+    """Simulated bus, registry and scheduler sharing one virtual clock."""
+
+    def __init__(self, **options):
+        self.hw = SimHardware()
+        clock = self.hw.clock
+        self.registry = SensorRegistry(i2c=SimI2C(self.hw), clock=clock.monotonic, **options)
+        self.scheduler = Scheduler(clock=clock.monotonic, sleep=clock.sleep)
+        self.readings = []
+
+    def add(self, name, interval, conversion_time=0.08, model=None, reader_time=None,
+            first=None):
+        """A sensor whose device converts in conversion_time; the reader
+        waits reader_time (default: the same) before its first fetch."""
+        model = model or SensorModel(conversion_time=conversion_time)
+        reader = AHTx0Reader(SimI2CDevice(self.hw, model),
+                             conversion_time if reader_time is None else reader_time,
+                             clock=self.hw.clock.monotonic)
+        self.registry.add(name, reader, interval, first)
+        return model
+
+    def run(self, until, on_reading=None):
+        def record(name, values, now):
+            self.readings.append((name, now))
+            if on_reading is not None:
+                return on_reading(name, values, now)
+
+        self.registry.attach(self.scheduler, on_reading=record)
+        self.scheduler.call_at(until, lambda now: STOP, name="end")
+        self.scheduler.run()
+        return self.registry.stats()
+
+
+# ---------------------------------------------------------------------------
+# Interleaving
+# ---------------------------------------------------------------------------
+def test_conversions_overlap_and_the_loop_keeps_running():
+    bench = Bench()
+    bench.add("slow", 1.0, conversion_time=0.08)
+    bench.add("fast", 1.0, conversion_time=0.01)
+    polls = []
+    bench.scheduler.every(0.05, lambda now: polls.append(now), name="button")
+    stats = bench.run(1.5)
+
+    # Both triggered at 1.0; the fast one is fetched first.
+    assert bench.readings == [("fast", pytest.approx(1.01)), ("slow", pytest.approx(1.08))]
+    assert any(1.0 < t < 1.08 for t in polls)  # button polled during the conversion
+    assert stats["slow"]["latency"]["max"] == pytest.approx(0.08, rel=0.05)
+    assert bench.registry.readings()["slow"] == pytest.approx((22.0, 45.0), abs=0.001)
+
+
+def test_each_step_is_one_transfer():
+    bench = Bench()
+    model = bench.add("aht", 1.0)
+    bench.run(3.5)
+    assert model.measurements == 3
+    assert model.transactions == 6  # trigger + fetch per read
+
+
+# ---------------------------------------------------------------------------
+# Busy sensor
+# ---------------------------------------------------------------------------
+def test_busy_fetch_is_retried_until_ready():
+    bench = Bench(max_polls=20)
+    # The reader expects 20 ms, the device needs 80 ms.
+    model = bench.add("aht", 1.0, conversion_time=0.08, reader_time=0.02)
+    stats = bench.run(1.5)
+
+    assert stats["aht"]["reads"] == 1
+    assert stats["aht"]["timeouts"] == 0
+    assert bench.readings[0][1] == pytest.approx(1.08, abs=0.005)
+    # retries every reader_time / 4 from 1.02 until 1.08 and the good one
+    assert model.transactions == 1 + 13 + 1
+
+
+def test_still_busy_after_max_polls_is_a_timeout():
+    bench = Bench(max_polls=3)
+    model = bench.add("aht", 1.0, conversion_time=0.08, reader_time=0.02)
+    stats = bench.run(3.5)
+
+    assert stats["aht"]["reads"] == 0
+    assert stats["aht"]["timeouts"] == 3
+    assert stats["aht"]["skipped"] == 0  # the cancelled read frees the next deadline
+    assert model.transactions == 3 * (1 + 3)
+
+
+def test_deadline_during_a_conversion_is_skipped():
+    bench = Bench()
+    # 0.375 s conversions every 0.25 s (exact in binary): every other
+    # deadline finds the previous read still converting.
+    bench.add("aht", 0.25, conversion_time=0.375)
+    stats = bench.run(2.2)
+
+    assert stats["aht"]["skipped"] == 4       # 0.5, 1.0, 1.5, 2.0
+    assert stats["aht"]["reads"] == 4         # triggered at 0.25, 0.75, 1.25, 1.75
+    assert stats["aht"]["timeouts"] == 0
+    assert stats["aht"]["latency"]["max"] == 0.375
+
+
+# ---------------------------------------------------------------------------
+# Errors and overruns
+# ---------------------------------------------------------------------------
+def test_failed_trigger_abandons_the_read_until_the_next_deadline():
+    bench = Bench()
+    model = bench.add("aht", 1.0)
+    model.unplug(1.5, 2.5)  # the 2.0 trigger fails
+    stats = bench.run(4.5)
+
+    assert stats["aht"]["errors"] == 1
+    assert stats["aht"]["reads"] == 3
+    assert [t for _, t in bench.readings] == [
+        pytest.approx(1.08), pytest.approx(3.08), pytest.approx(4.08),
+    ]
+    assert isinstance(bench.registry.sensors["aht"].stats.last_error, OSError)
+
+
+def test_failed_fetch_abandons_the_read_until_the_next_deadline():
+    bench = Bench()
+    model = bench.add("aht", 1.0)
+    model.unplug(2.05, 2.1)  # triggered at 2.0, unplugged for the fetch
+    stats = bench.run(3.5)
+
+    assert stats["aht"]["errors"] == 1
+    assert stats["aht"]["reads"] == 2
+    assert bench.registry.sensors["aht"].triggered_at is None
+
+
+def test_long_transfers_count_as_overruns():
+    bench = Bench(max_hold=0.005)
+    bench.add("slow_bus", 1.0, model=SensorModel(transfer_time=0.01))
+    bench.add("fast_bus", 1.0, model=SensorModel(transfer_time=0.001))
+    stats = bench.run(2.5)
+
+    assert stats["slow_bus"]["overruns"] == 4  # trigger and fetch, twice
+    assert stats["slow_bus"]["hold_max"] == pytest.approx(0.01)
+    assert stats["fast_bus"]["overruns"] == 0
+    assert stats["fast_bus"]["hold_max"] == pytest.approx(0.001)
+
+
+# ---------------------------------------------------------------------------
+# Registration
+# ---------------------------------------------------------------------------
+def test_on_reading_can_stop_the_scheduler():
+    bench = Bench()
+    bench.add("aht", 1.0)
+    bench.run(10.0, on_reading=lambda name, values, now: STOP)
+    assert bench.hw.clock.now == pytest.approx(1.08)
+
+
+def test_names_are_unique_and_late_sensors_are_scheduled():
+    bench = Bench()
+    bench.add("aht", 1.0)
+    with pytest.raises(ValueError):
+        bench.add("aht", 2.0)
+    bench.registry.attach(bench.scheduler)
+    bench.add("late", 1.0, first=0.5)
+    bench.scheduler.call_at(1.2, lambda now: STOP)
+    bench.scheduler.run()
+    assert bench.registry.stats()["late"]["reads"] == 1
+
+
+def test_add_ahtx0_uses_the_shared_bus():
+    hw = SimHardware()
+    registry = SensorRegistry(clock=hw.clock.monotonic)
+    scheduler = Scheduler(clock=hw.clock.monotonic, sleep=hw.clock.sleep)
+    with simulate(hw):
+        registry.add_ahtx0("interieur", interval=5)
+        registry.attach(scheduler)
+        scheduler.call_at(5.5, lambda now: STOP)
+        scheduler.run()
+    assert isinstance(registry.bus, SimI2C)
+    temperature, humidity = registry.readings()["interieur"]
+    assert temperature == pytest.approx(22.0, abs=0.001)  # 20-bit resolution
+    assert humidity == pytest.approx(45.0, abs=0.001)
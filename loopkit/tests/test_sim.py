@@ -0,0 +1,103 @@
+"""
+Main loops on the simulated board (loopkit.sim): virtual time, so an
+hour of loop runs in milliseconds.
+"""
+
+import pytest
+
+from loopkit.sim import SimEdgeWaiter, SimHardware, run_program
+
+
+PROGRAMS = {
+    # name: module, main() arguments, libgpiod v2 available
+    "reference": ("loopkit.reference", lambda hw: (), True),
+    "deadline": ("loopkit.scheduled", lambda hw: (), True),
+    "polling": ("loopkit.scheduled", lambda hw: (), False),
+    "edge": ("loopkit.scheduled", lambda hw: (SimEdgeWaiter(hw),), True),
+    "asyncio": ("loopkit.aio", lambda hw: (), True),
+}
+
+
+def run(name, hw, until=60.0):
+    module, make_args, edges = PROGRAMS[name]
+    hw.edges = edges
+    return run_program(hw, module, until=until, args=make_args(hw))
+
+
+@pytest.fixture(params=sorted(PROGRAMS))
+def program(request):
+    return request.param
+
+
+# ---------------------------------------------------------------------------
+# Reference loop
+# ---------------------------------------------------------------------------
+def test_reference_reads_sensor_every_interval():
+    output = run_program(SimHardware(), until=21.0)
+
+    reads = output.times("Temperature:")
+    assert len(reads) == 4
+    assert 5.0 <= reads[0] < 5.5  # interval, then the read itself
+    assert output.times("Arret demande (Ctrl+C)")
+    assert output.lines[-1][1] == "Nettoyage termine."
+
+
+def test_reference_reports_sensor_error_and_keeps_running():
+    hw = SimHardware()
+    hw.sensor.unplug(7.0, 12.0)
+
+    output = run_program(hw, until=21.0)
+
+    assert len(output.times("Erreur lecture")) == 1  # the read at 10 s
+    assert len(output.times("Temperature:")) == 3
+    assert output.lines[-1][1] == "Nettoyage termine."
+
+
+# ---------------------------------------------------------------------------
+# Same behaviour for every loop variant
+# ---------------------------------------------------------------------------
+def test_short_press_is_reported_once(program):
+    hw = SimHardware()
+    hw.button.press(at=3.0, hold=0.3)
+
+    output = run(program, hw, until=10.0)
+
+    presses = output.times("Bouton appuye!")
+    assert len(presses) == 1
+    assert 3.0 <= presses[0] <= 3.06
+    assert not output.times("Arret demande (bouton maintenu)")
+
+
+def test_bouncing_contact_is_one_press(program):
+    hw = SimHardware()
+    hw.button.press(at=3.0, hold=0.3, bounce=0.005)
+    hw.button.press(at=6.0, hold=0.4, bounce=0.005)
+
+    output = run(program, hw, until=10.0)
+
+    assert len(output.times("Bouton appuye!")) == 2
+
+
+def test_hold_stops_the_program(program):
+    hw = SimHardware()
+    hw.button.press(at=12.0, hold=3.0)
+
+    output = run(program, hw)
+
+    stops = output.times("Arret demande (bouton maintenu)")
+    assert stops and 14.0 <= stops[0] <= 14.06
+    assert not output.times("Arret demande (Ctrl+C)")
+    assert output.lines[-1][1] == "Nettoyage termine."
+
+
+# ---------------------------------------------------------------------------
+# Scheduled loop wake-ups
+# ---------------------------------------------------------------------------
+def test_scheduled_loop_only_polls_while_pressed():
+    hw = SimHardware()
+    hw.button.press(at=30.0, hold=0.5)
+
+    run("deadline", hw, until=60.0)
+
+    # 12 sensor deadlines, about 10 polls during the press, the Ctrl+C
+    assert hw.clock.sleeps + hw.clock.waits < 30
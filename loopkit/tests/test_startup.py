@@ -0,0 +1,165 @@
+"""
+loopkit.startup (LazyModule, Deferred, platform cache, import_report)
+"""
+
+import json
+import os
+import sys
+import types
+
+import pytest
+
+from loopkit import startup
+from loopkit.startup import Deferred, LazyModule, lazy_import
+
+
+# ---------------------------------------------------------------------------
+# Lazy imports
+# ---------------------------------------------------------------------------
+@pytest.fixture
+def probe_module(tmp_path, monkeypatch):
+    """Name of an importable module that is not imported yet."""
+    name = "loopkit_lazy_probe"
+    (tmp_path / f"{name}.py").write_text("VALUE = 42\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, name, raising=False)
+    yield name
+    sys.modules.pop(name, None)
+
+
+def test_lazy_module_imports_on_first_attribute_access(probe_module):
+    module = lazy_import(probe_module)
+    assert isinstance(module, LazyModule)
+    assert probe_module not in sys.modules
+    assert "not loaded" in repr(module)
+
+    assert module.VALUE == 42
+    assert probe_module in sys.modules
+    assert "(loaded)" in repr(module)
+
+
+def test_lazy_import_returns_an_imported_module_as_is():
+    assert lazy_import("json") is json
+
+
+def test_lazy_module_reports_a_missing_module_on_use():
+    module = lazy_import("loopkit_no_such_module")
+    with pytest.raises(ImportError):
+        module.anything
+
+
+# ---------------------------------------------------------------------------
+# Deferred
+# ---------------------------------------------------------------------------
+class Device:
+    def __init__(self):
+        self.value = 1
+        self.deinitialized = False
+
+    def deinit(self):
+        self.deinitialized = True
+
+
+def test_deferred_creates_on_first_use_only():
+    calls = []
+    device = Deferred(lambda: calls.append(1) or Device())
+    assert not device.created and calls == []
+
+    device.value = 5
+    assert device.value == 5
+    assert device.created and calls == [1]
+
+
+def test_deferred_retries_after_a_failed_factory():
+    attempts = []
+
+    def factory():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise OSError("no device")
+        return Device()
+
+    device = Deferred(factory)
+    with pytest.raises(OSError):
+        device.value
+    assert not device.created
+
+    assert device.value == 1
+    assert device.created and len(attempts) == 2
+
+
+def test_deinit_of_an_uncreated_deferred_does_not_create_it():
+    device = Deferred(lambda: pytest.fail("factory called by deinit()"))
+    device.deinit()
+    assert not device.created
+
+
+def test_deinit_reaches_a_created_object():
+    device = Deferred(Device)
+    target = device.get()
+    device.deinit()
+    assert target.deinitialized
+
+
+# ---------------------------------------------------------------------------
+# Platform cache
+# ---------------------------------------------------------------------------
+@pytest.fixture
+def blinka(monkeypatch):
+    """Stand-in adafruit_blinka.agnostic with detected ids, fresh env."""
+    agnostic = types.ModuleType("adafruit_blinka.agnostic")
+    agnostic.board_id, agnostic.chip_id = "RASPBERRY_PI_ZERO_2_W", "BCM2XXX"
+    monkeypatch.setitem(sys.modules, "adafruit_blinka", types.ModuleType("adafruit_blinka"))
+    monkeypatch.setitem(sys.modules, "adafruit_blinka.agnostic", agnostic)
+    monkeypatch.delenv("BLINKA_FORCEBOARD", raising=False)
+    monkeypatch.delenv("BLINKA_FORCECHIP", raising=False)
+    monkeypatch.setattr(startup, "platform_fingerprint", lambda: "Pi Zero 2 W|aarch64|6.6")
+    return agnostic
+
+
+def test_platform_cache_round_trip(tmp_path, blinka):
+    path = str(tmp_path / "loopkit" / "platform.json")
+    assert startup.store_platform_cache(path)
+    assert startup.apply_platform_cache(path)
+    assert os.environ["BLINKA_FORCEBOARD"] == "RASPBERRY_PI_ZERO_2_W"
+    assert os.environ["BLINKA_FORCECHIP"] == "BCM2XXX"
+
+
+def test_platform_cache_is_invalidated_by_a_new_fingerprint(tmp_path, blinka, monkeypatch):
+    path = str(tmp_path / "platform.json")
+    assert startup.store_platform_cache(path)
+
+    monkeypatch.setattr(startup, "platform_fingerprint", lambda: "Pi Zero 2 W|aarch64|6.12")
+    assert not startup.apply_platform_cache(path)
+    assert "BLINKA_FORCEBOARD" not in os.environ
+    assert "BLINKA_FORCECHIP" not in os.environ
+
+
+@pytest.mark.parametrize("content", ["", "{not json", json.dumps({"fingerprint": "x"})])
+def test_unusable_platform_cache_is_ignored(tmp_path, blinka, content):
+    path = tmp_path / "platform.json"
+    path.write_text(content)
+    assert not startup.apply_platform_cache(str(path))
+    assert not startup.apply_platform_cache(str(tmp_path / "missing.json"))
+
+
+def test_failed_detection_is_not_cached(tmp_path, blinka):
+    blinka.board_id = None
+    path = tmp_path / "platform.json"
+    assert not startup.store_platform_cache(str(path))
+    assert not path.exists()
+
+
+# ---------------------------------------------------------------------------
+# Import report
+# ---------------------------------------------------------------------------
+def test_import_report_lists_the_requested_modules():
+    total, rows = startup.import_report(["json"], top=50)
+    assert total > 0
+    assert "json" in [name for _, _, name in rows]
+    assert rows == sorted(rows, reverse=True)
+
+
+def test_import_report_raises_for_a_missing_module():
+    with pytest.raises(ImportError):
+        startup.import_report(["loopkit_no_such_module"])
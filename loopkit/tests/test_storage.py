@@ -0,0 +1,151 @@
+"""
+loopkit.storage (BatchWriter) and loopkit.history (SampleHistory)
+"""
+
+import os
+
+from loopkit import storage
+from loopkit.history import SampleHistory
+from loopkit.storage import RECORD, BatchWriter
+
+
+def samples(n, start=1_700_000_000.0):
+    return [(start + i, 20.0 + i / 10, 40.0 + i / 100) for i in range(n)]
+
+
+def files(directory):
+    return sorted(os.listdir(directory))
+
+
+# ---------------------------------------------------------------------------
+# Round trip
+# ---------------------------------------------------------------------------
+def test_round_trip_across_segments(tmp_path):
+    data = samples(100)
+    writer = BatchWriter(tmp_path, max_batch=16, segment_bytes=40 * RECORD.size)
+    for sample in data:
+        writer.append(*sample)
+        writer.flush()
+    writer.close()
+
+    assert not any(name.endswith(".part") for name in files(tmp_path))
+    with SampleHistory(tmp_path) as history:
+        assert len(history) == 100
+        assert [len(f) for f in history.files] == [40, 40, 20]
+        read = [part[i] for part in history.between(data[10][0], data[90][0])
+                for i in range(len(part))]
+    assert read == data[10:90]
+
+
+def test_csv_round_trip(tmp_path):
+    writer = BatchWriter(tmp_path, fmt="csv")
+    writer.append(1_700_000_000.0, 21.5, 45.25)
+    writer.close()
+
+    text = (tmp_path / "samples-000000.csv").read_text()
+    assert text == "t,temperature,humidity\n1700000000.000,21.50,45.25\n"
+
+
+# ---------------------------------------------------------------------------
+# Crash recovery
+# ---------------------------------------------------------------------------
+def test_partial_record_is_cut_on_restart(tmp_path):
+    writer = BatchWriter(tmp_path)
+    for sample in samples(5):
+        writer.append(*sample)
+    writer.flush()
+    os.write(writer.fd, RECORD.pack(*samples(1)[0])[:10])  # crash mid-record
+    os.close(writer.fd)
+    assert files(tmp_path) == ["samples-000000.bin.part"]
+
+    writer = BatchWriter(tmp_path)
+    assert files(tmp_path) == ["samples-000000.bin"]
+    assert writer.sequence == 1
+    writer.close()
+
+    with SampleHistory(tmp_path) as history:
+        assert len(history) == 5
+
+
+def test_partial_csv_line_is_cut_on_restart(tmp_path):
+    path = tmp_path / "samples-000003.csv.part"
+    path.write_bytes(b"t,temperature,humidity\n1.000,20.00,40.00\n2.000,2")
+
+    writer = BatchWriter(tmp_path, fmt="csv")
+
+    assert writer.sequence == 4
+    assert (tmp_path / "samples-000003.csv").read_bytes() == (
+        b"t,temperature,humidity\n1.000,20.00,40.00\n")
+
+
+# ---------------------------------------------------------------------------
+# Budgeted flushes
+# ---------------------------------------------------------------------------
+def test_full_segment_is_finalized_by_later_calls(tmp_path, monkeypatch):
+    synced = []
+    real_fsync = os.fsync
+    monkeypatch.setattr(storage.os, "fsync", lambda fd: synced.append(fd) or real_fsync(fd))
+    writer = BatchWriter(tmp_path, max_batch=4, segment_bytes=4 * RECORD.size)
+    for sample in samples(4):
+        writer.append(*sample)
+
+    assert writer.maybe_flush()  # writes and retires the segment, no fsync
+    assert synced == []
+    assert files(tmp_path) == ["samples-000000.bin.part"]
+
+    writer.append(*samples(1, start=1_700_000_100.0)[0])
+    assert not writer.maybe_flush()  # step 1: fsync only
+    assert len(synced) == 1
+    assert files(tmp_path) == ["samples-000000.bin.part"]
+
+    assert not writer.maybe_flush()  # step 2: close, rename, directory fsync
+    assert files(tmp_path) == ["samples-000000.bin"]
+    assert writer.pending_records == 1
+
+    writer.close()
+    assert files(tmp_path) == ["samples-000000.bin", "samples-000001.bin"]
+
+
+def test_deferred_fsync_keeps_maybe_flush_busy(tmp_path, monkeypatch):
+    now = [0.0]
+    synced = []
+    real_write, real_fsync = os.write, os.fsync
+
+    def slow_write(fd, data):
+        now[0] += 0.01  # every write uses up the 5 ms budget
+        return real_write(fd, data)
+
+    monkeypatch.setattr(storage.os, "write", slow_write)
+    monkeypatch.setattr(storage.os, "fsync", lambda fd: synced.append(fd) or real_fsync(fd))
+    writer = BatchWriter(tmp_path, max_batch=2, fsync=storage.FSYNC_FLUSH,
+                         clock=lambda: now[0])
+    for sample in samples(2):
+        writer.append(*sample)
+
+    assert not writer.maybe_flush()  # written, fsync deferred: not idle
+    assert synced == [] and writer.pending_records == 0
+    assert not writer.due()
+    assert writer.maybe_flush()      # the deferred fsync runs
+    assert len(synced) == 1
+    assert writer.maybe_flush()      # idle, nothing more to sync
+    assert len(synced) == 1
+    writer.close()
+
+
+# ---------------------------------------------------------------------------
+# Foreign files
+# ---------------------------------------------------------------------------
+def test_stray_files_are_left_alone_on_restart(tmp_path):
+    for name in ("samples-old.bin.part", "samples-000001-copy.bin",
+                 "samples-.bin", "samples-000004.csv.part"):
+        (tmp_path / name).write_bytes(b"not a segment")
+    (tmp_path / "samples-000002.bin.part").write_bytes(storage.binary_header())
+
+    writer = BatchWriter(tmp_path)
+
+    assert writer.sequence == 3
+    assert files(tmp_path) == [
+        "samples-.bin", "samples-000001-copy.bin", "samples-000002.bin",
+        "samples-000004.csv.part", "samples-old.bin.part",
+    ]
+    writer.close()
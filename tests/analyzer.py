@@ -0,0 +1,261 @@
+"""
+Single-pass analyzer for student scripts
+========================================
+
+Walks the AST of main.py once and records every fact the milestone tests
+need (imports, constants, timer calls, loop structure, error handling,
+button reads). Tests query the resulting FactSheet instead of scanning the
+raw text, so comments and strings no longer produce false positives and
+adding a check does not add another pass over the file.
+"""
+
+import ast
+
+import pytest
+
+
+INTERVAL_OPS = (ast.Gt, ast.GtE, ast.Lt, ast.LtE)
+MONOTONIC_NAMES = ("time.monotonic", "time.monotonic_ns")
+
+
+# ---------------------------------------------------------------------------
+# Fact Sheet
+# ---------------------------------------------------------------------------
+class TryFact:
+    """One try statement: its handlers, finally clause and nesting depth."""
+
+    def __init__(self, lineno, handlers, has_finally, depth):
+        self.lineno = lineno
+        self.handlers = handlers
+        self.has_finally = has_finally
+        self.depth = depth
+
+
+class FactSheet:
+    """Structured facts extracted from one script."""
+
+    def __init__(self):
+        self.imports = set()
+        self.constants = []
+        self.assigned_names = set()
+        self.functions = []
+        self.names = set()
+        self.attributes = set()
+        self.has_main_guard = False
+        self.monotonic_calls = []
+        self.interval_comparisons = []
+        self.breaks = []
+        self.tries = []
+        self.value_reads = []
+
+    @property
+    def except_handlers(self):
+        return [name for fact in self.tries for name in fact.handlers]
+
+    def imports_module(self, module):
+        """True if module (or one of its submodules) is imported."""
+        return any(
+            name == module or name.startswith(module + ".")
+            for name in self.imports
+        )
+
+    def references(self, suffix):
+        """True if a dotted name ending with suffix is used in the code."""
+        return any(
+            name == suffix or name.endswith("." + suffix) for name in self.names
+        )
+
+
+# ---------------------------------------------------------------------------
+# Visitor
+# ---------------------------------------------------------------------------
+class _FactVisitor(ast.NodeVisitor):
+    def __init__(self):
+        self.facts = FactSheet()
+        self.aliases = {}
+        self.scope_depth = 0
+        self.loop_depth = 0
+        self.while_depth = 0
+        self.try_depth = 0
+        self.difference_names = set()
+        self.pending_comparisons = []
+
+    # -- helpers -----------------------------------------------------------
+    def dotted(self, node):
+        """Dotted name of a Name/Attribute chain, resolved through imports."""
+        parts = []
+        while isinstance(node, ast.Attribute):
+            parts.append(node.attr)
+            node = node.value
+        if not isinstance(node, ast.Name):
+            return None
+        parts.append(self.aliases.get(node.id, node.id))
+        return ".".join(reversed(parts))
+
+    def record_target(self, target, value):
+        for node in ast.walk(target):
+            if isinstance(node, ast.Name):
+                self.facts.assigned_names.add(node.id)
+                if self.scope_depth == 0 and node.id.isupper() and len(node.id) > 1:
+                    self.facts.constants.append(node.id)
+                if isinstance(value, ast.BinOp) and isinstance(value.op, ast.Sub):
+                    self.difference_names.add(node.id)
+
+    # -- imports -----------------------------------------------------------
+    def visit_Import(self, node):
+        for alias in node.names:
+            self.facts.imports.add(alias.name)
+            local = alias.asname or alias.name.split(".")[0]
+            self.aliases[local] = alias.name if alias.asname else local
+
+    def visit_ImportFrom(self, node):
+        if node.module:
+            self.facts.imports.add(node.module)
+            for alias in node.names:
+                self.aliases[alias.asname or alias.name] = f"{node.module}.{alias.name}"
+
+    # -- definitions and assignments ---------------------------------------
+    def visit_FunctionDef(self, node):
+        self.facts.functions.append(node.name)
+        self.scope_depth += 1
+        self.generic_visit(node)
+        self.scope_depth -= 1
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_ClassDef(self, node):
+        self.scope_depth += 1
+        self.generic_visit(node)
+        self.scope_depth -= 1
+
+    def visit_Assign(self, node):
+        for target in node.targets:
+            self.record_target(target, node.value)
+        self.generic_visit(node)
+
+    def visit_AnnAssign(self, node):
+        self.record_target(node.target, node.value)
+        self.generic_visit(node)
+
+    # -- expressions -------------------------------------------------------
+    def visit_Name(self, node):
+        self.facts.names.add(self.aliases.get(node.id, node.id))
+
+    def visit_Attribute(self, node):
+        name = self.dotted(node)
+        if name is not None:
+            self.facts.names.add(name)
+        self.facts.attributes.add(node.attr)
+        if node.attr == "value" and isinstance(node.ctx, ast.Load):
+            self.facts.value_reads.append((self.dotted(node.value), node.lineno))
+        self.generic_visit(node)
+
+    def visit_Call(self, node):
+        if self.dotted(node.func) in MONOTONIC_NAMES:
+            self.facts.monotonic_calls.append(node.lineno)
+        self.generic_visit(node)
+
+    def visit_Compare(self, node):
+        if self.while_depth and any(isinstance(op, INTERVAL_OPS) for op in node.ops):
+            self.pending_comparisons.append(node)
+        self.generic_visit(node)
+
+    # -- control flow ------------------------------------------------------
+    def visit_If(self, node):
+        test = node.test
+        if (
+            self.scope_depth == 0
+            and isinstance(test, ast.Compare)
+            and isinstance(test.left, ast.Name)
+            and test.left.id == "__name__"
+            and any(
+                isinstance(c, ast.Constant) and c.value == "__main__"
+                for c in test.comparators
+            )
+        ):
+            self.facts.has_main_guard = True
+        self.generic_visit(node)
+
+    def visit_While(self, node):
+        self.loop_depth += 1
+        self.while_depth += 1
+        self.generic_visit(node)
+        self.while_depth -= 1
+        self.loop_depth -= 1
+
+    def visit_For(self, node):
+        self.loop_depth += 1
+        self.generic_visit(node)
+        self.loop_depth -= 1
+
+    visit_AsyncFor = visit_For
+
+    def visit_Break(self, node):
+        if self.loop_depth:
+            self.facts.breaks.append(node.lineno)
+
+    def visit_Try(self, node):
+        handlers = []
+        for handler in node.handlers:
+            kinds = handler.type
+            if kinds is None:
+                handlers.append("")
+                continue
+            elements = kinds.elts if isinstance(kinds, ast.Tuple) else [kinds]
+            handlers.extend(self.dotted(e) or "" for e in elements)
+        self.facts.tries.append(
+            TryFact(node.lineno, handlers, bool(node.finalbody), self.try_depth)
+        )
+        self.try_depth += 1
+        self.generic_visit(node)
+        self.try_depth -= 1
+
+    visit_TryStar = visit_Try
+
+    # -- result ------------------------------------------------------------
+    def finish(self):
+        for node in self.pending_comparisons:
+            for operand in [node.left] + node.comparators:
+                is_difference = (
+                    isinstance(operand, ast.BinOp) and isinstance(operand.op, ast.Sub)
+                ) or (
+                    isinstance(operand, ast.Name) and operand.id in self.difference_names
+                )
+                if is_difference:
+                    self.facts.interval_comparisons.append(node.lineno)
+                    break
+        return self.facts
+
+
+# ---------------------------------------------------------------------------
+# Entry Points
+# ---------------------------------------------------------------------------
+def analyze(source):
+    """Return the FactSheet of a SourceModel, computing it on first use."""
+    if source._facts is None:
+        visitor = _FactVisitor()
+        if source.tree is not None:
+            visitor.visit(source.tree)
+        source._facts = visitor.finish()
+    return source._facts
+
+
+def require_facts(source):
+    """
+    FactSheet for main.py.
+
+    The calling test is skipped when main.py is missing (test_main_script_exists
+    reports it) and fails when main.py does not parse: a script that cannot
+    run must not score like a partially correct one.
+    """
+    if not source.exists:
+        pytest.skip("main.py not found")
+    e = source.syntax_error
+    if e is not None:
+        pytest.fail(
+            f"\n\n"
+            f"Expected: main.py that Python can parse\n"
+            f"Actual: SyntaxError on line {e.lineno}: {e.msg}\n\n"
+            f"Suggestion: Fix the syntax error first (see test_main_script_syntax).\n"
+        )
+    return analyze(source)
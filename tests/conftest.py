@@ -0,0 +1,24 @@
+"""
+Shared fixtures for the milestone tests.
+
+main.py is loaded once per session through the source model cache and
+analyzed once into a fact sheet; every test queries those instead of
+reading, parsing or scanning the file again.
+"""
+
+import pytest
+
+from .analyzer import require_facts
+from .source_model import REPO_ROOT, load_source
+
+
+@pytest.fixture(scope="session")
+def source():
+    """Parsed main.py (text, AST, tokens, node index) shared by all tests."""
+    return load_source(REPO_ROOT / "main.py")
+
+
+@pytest.fixture(scope="session")
+def facts(source):
+    """Single-pass FactSheet of main.py (skips when missing, fails when unparsable)."""
+    return require_facts(source)
@@ -0,0 +1,240 @@
+"""
+Batch Grading for Formatif F4
+=============================
+
+Grade a whole cohort of submission checkouts locally, in one command.
+
+Each submission directory is graded against the three milestone test
+modules by calling their test functions directly (no pytest startup or
+collection per submission), so the expected/actual/suggestion messages are
+exactly the ones students see. Submissions are spread over a bounded
+process pool and one JSON record per submission is written.
+
+Results are cached by main.py hash (see result_cache.py), so re-grading
+an unchanged submission does not run the tests again.
+
+Usage:
+    python -m tests.grading SUBMISSIONS_DIR [-o results.jsonl] [-j JOBS]
+    python -m tests.grading SUBMISSIONS_DIR --no-cache
+    python -m tests.grading SUBMISSIONS_DIR --clear-cache
+"""
+
+import argparse
+import importlib
+import inspect
+import json
+import os
+import sys
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from .analyzer import require_facts
+from .result_cache import ResultCache, file_digest
+from .source_model import REPO_ROOT, read_source
+
+
+# ---------------------------------------------------------------------------
+# Milestones
+# ---------------------------------------------------------------------------
+Milestone = namedtuple("Milestone", "number title points module")
+
+DEFAULT_CACHE_DIR = REPO_ROOT / ".grading_cache"
+
+MILESTONES = (
+    Milestone(1, "Code Structure", 25, "test_milestone_01"),
+    Milestone(2, "Timer Pattern", 35, "test_milestone_02"),
+    Milestone(3, "Bouton + Arret Propre", 40, "test_milestone_03"),
+)
+
+_TESTS = None
+
+
+def load_milestone_tests():
+    """Import the milestone modules once and list their test functions."""
+    global _TESTS
+    if _TESTS is None:
+        _TESTS = []
+        for milestone in MILESTONES:
+            module = importlib.import_module(f".{milestone.module}", __package__)
+            tests = [
+                func for name, func in vars(module).items()
+                if name.startswith("test_") and inspect.isfunction(func)
+            ]
+            _TESTS.append((milestone, tests))
+    return _TESTS
+
+
+# ---------------------------------------------------------------------------
+# Grading One Submission
+# ---------------------------------------------------------------------------
+def _fixtures(func, source):
+    kwargs = {}
+    for name in inspect.signature(func).parameters:
+        if name == "source":
+            kwargs[name] = source
+        elif name == "facts":
+            kwargs[name] = require_facts(source)
+        else:
+            raise TypeError(f"unknown fixture '{name}' in {func.__name__}")
+    return kwargs
+
+
+def run_test(func, source):
+    """Run one milestone test function and return (outcome, message)."""
+    try:
+        func(**_fixtures(func, source))
+    except pytest.skip.Exception as e:
+        return "skipped", str(e.msg).strip()
+    except pytest.fail.Exception as e:
+        return "failed", str(e.msg).strip()
+    except AssertionError as e:
+        return "failed", str(e).strip()
+    except Exception as e:
+        return "error", f"{type(e).__name__}: {e}"
+    return "passed", ""
+
+
+def grade_submission(root):
+    """Grade one checkout and return its result record."""
+    root = Path(root)
+    source = read_source(root / "main.py")
+
+    milestones = []
+    for milestone, tests in load_milestone_tests():
+        results = []
+        for func in tests:
+            outcome, message = run_test(func, source)
+            results.append({"name": func.__name__, "outcome": outcome, "message": message})
+        passed = all(r["outcome"] in ("passed", "skipped") for r in results)
+        milestones.append({
+            "number": milestone.number,
+            "title": milestone.title,
+            "points": milestone.points,
+            "earned": milestone.points if passed else 0,
+            "passed": passed,
+            "tests": results,
+        })
+
+    return make_record(root, milestones)
+
+
+def make_record(root, milestones):
+    """Result record for one submission from its milestone results."""
+    return {
+        "submission": root.name,
+        "path": str(root),
+        "total": sum(m["earned"] for m in milestones),
+        "max": sum(m.points for m in MILESTONES),
+        "milestones": milestones,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Batch
+# ---------------------------------------------------------------------------
+def find_submissions(directory):
+    """Every non-hidden subdirectory of directory, sorted by name."""
+    return sorted(
+        path for path in Path(directory).iterdir()
+        if path.is_dir() and not path.name.startswith(".")
+    )
+
+
+def grade_all(roots, jobs=None, cache=None):
+    """
+    Yield one record per submission, in order, using up to jobs processes.
+
+    With a ResultCache, submissions whose main.py hash is already cached
+    are answered from disk and only the others are sent to the pool.
+    """
+    roots = [Path(root) for root in roots]
+    if cache is None:
+        yield from _grade_many(roots, jobs)
+        return
+
+    # Submissions without main.py have no digest: they are cheap to grade
+    # and their messages carry the path, so they are never cached.
+    digests = [file_digest(root / "main.py") for root in roots]
+    records = [None] * len(roots)
+    pending = []
+    for i, (root, digest) in enumerate(zip(roots, digests)):
+        cached = cache.get(digest) if digest else None
+        if cached is not None:
+            records[i] = make_record(root, cached)
+        else:
+            pending.append(i)
+
+    graded = _grade_many([roots[i] for i in pending], jobs)
+    for i, record in zip(pending, graded):
+        records[i] = record
+        if digests[i]:
+            cache.put(digests[i], record["milestones"])
+
+    yield from records
+
+
+def _grade_many(roots, jobs):
+    jobs = jobs or os.cpu_count() or 1
+
+    if jobs == 1 or len(roots) <= 1:
+        for root in roots:
+            yield grade_submission(root)
+        return
+
+    chunksize = max(1, len(roots) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs, initializer=load_milestone_tests) as pool:
+        yield from pool.map(grade_submission, roots, chunksize=chunksize)
+
+
+def _summary_line(record):
+    marks = " ".join(
+        f"M{m['number']}:{'PASS' if m['passed'] else 'FAIL'}" for m in record["milestones"]
+    )
+    return f"{record['submission']:<30} {record['total']:>3}/{record['max']}  {marks}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Grade many F4 submissions at once.")
+    parser.add_argument("submissions", help="directory containing one checkout per student")
+    parser.add_argument("-o", "--output", help="write JSON lines here (default: stdout)")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="worker processes (default: CPU count)")
+    parser.add_argument("--cache-dir", default=str(DEFAULT_CACHE_DIR),
+                        help="result cache location (default: .grading_cache/)")
+    parser.add_argument("--cache-size", type=int, default=None,
+                        help="maximum number of cached results")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="grade everything, without reading or writing the cache")
+    parser.add_argument("--clear-cache", action="store_true",
+                        help="delete all cached results before grading")
+    args = parser.parse_args(argv)
+
+    roots = find_submissions(args.submissions)
+    if not roots:
+        print(f"No submissions found in {args.submissions}", file=sys.stderr)
+        return 1
+
+    cache = None
+    if not args.no_cache:
+        options = {"max_entries": args.cache_size} if args.cache_size else {}
+        cache = ResultCache(args.cache_dir, **options)
+        if args.clear_cache:
+            cache.clear()
+
+    out = open(args.output, "w") if args.output else sys.stdout
+    try:
+        for record in grade_all(roots, args.jobs, cache):
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            if args.output:
+                print(_summary_line(record))
+    finally:
+        if args.output:
+            out.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,164 @@
+"""
+On-disk result cache for batch grading
+======================================
+
+Students push often, and most pushes do not change main.py. Results are
+cached on disk, keyed by the SHA-256 of main.py, inside a directory named
+after the test-suite version (a hash of every file in tests/). Editing
+anything in tests/ therefore starts a fresh cache and the stale ones are
+deleted. Only version directories this cache created (16 hex digits plus
+a marker file) are ever removed, so pointing --cache-dir at a directory
+that holds other data is safe.
+
+Entries are small JSON files. A hit refreshes the file's mtime, and the
+least recently used entries are evicted once the entry count or total
+size goes over its bound.
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+from pathlib import Path
+
+
+TESTS_DIR = Path(__file__).parent
+
+DEFAULT_MAX_ENTRIES = 5000
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+MARKER = ".result-cache"
+VERSION_NAME = re.compile(r"[0-9a-f]{16}")
+
+
+def file_digest(path):
+    """SHA-256 of a file, or None if it cannot be read."""
+    try:
+        return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+    except OSError:
+        return None
+
+
+def suite_version(tests_dir=TESTS_DIR):
+    """Short hash of every Python file in tests/ (names and contents)."""
+    h = hashlib.sha256()
+    for path in sorted(Path(tests_dir).glob("*.py")):
+        h.update(path.name.encode())
+        h.update(b"\0")
+        h.update(path.read_bytes())
+        h.update(b"\0")
+    return h.hexdigest()[:16]
+
+
+class ResultCache:
+    """LRU-bounded cache of per-test outcomes, keyed by main.py hash."""
+
+    def __init__(self, directory, version=None,
+                 max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES):
+        self.root = Path(directory)
+        self.version = version or suite_version()
+        self.directory = self.root / self.version
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+        self._make_directory()
+        self.prune_stale()
+        self._entries, self._bytes = self._usage()
+        if self._entries > max_entries or self._bytes > max_bytes:
+            self.evict()
+
+    # -- maintenance -------------------------------------------------------
+    def _make_directory(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        (self.directory / MARKER).touch()
+
+    def _version_directories(self):
+        """Version directories under root that this cache wrote."""
+        for path in self.root.iterdir():
+            if (path.is_dir() and VERSION_NAME.fullmatch(path.name)
+                    and (path / MARKER).is_file()):
+                yield path
+
+    def prune_stale(self):
+        """Delete caches written by other test-suite versions."""
+        for path in self._version_directories():
+            if path.name != self.version:
+                shutil.rmtree(path, ignore_errors=True)
+
+    def clear(self):
+        """Delete every cached entry for every version (root is kept)."""
+        for path in self._version_directories():
+            shutil.rmtree(path, ignore_errors=True)
+        self._make_directory()
+        self._entries, self._bytes = 0, 0
+
+    def _usage(self):
+        entries = size = 0
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith(".json"):
+                    entries += 1
+                    size += entry.stat().st_size
+        return entries, size
+
+    def evict(self):
+        """Remove least recently used entries until both bounds hold."""
+        files = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith(".json"):
+                    stat = entry.stat()
+                    files.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        files.sort()
+
+        entries = len(files)
+        size = sum(f[1] for f in files)
+        for _, file_size, path in files:
+            if entries <= self.max_entries and size <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            entries -= 1
+            size -= file_size
+        self._entries, self._bytes = entries, size
+
+    # -- lookups -----------------------------------------------------------
+    def _path(self, digest):
+        return self.directory / f"{digest}.json"
+
+    def get(self, digest):
+        """Cached milestone results for this main.py hash, or None."""
+        path = self._path(digest)
+        try:
+            data = json.loads(path.read_text())
+            os.utime(path)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return data
+
+    def put(self, digest, milestones):
+        """Store milestone results for this main.py hash."""
+        path = self._path(digest)
+        tmp = path.with_suffix(".tmp")
+        payload = json.dumps(milestones, ensure_ascii=False)
+        try:
+            previous = path.stat().st_size  # same digest twice: replaced, not added
+        except OSError:
+            previous = None
+        tmp.write_text(payload)
+        os.replace(tmp, path)
+
+        if previous is None:
+            self._entries += 1
+        else:
+            self._bytes -= previous
+        self._bytes += len(payload.encode())
+        if self._entries > self.max_entries or self._bytes > self.max_bytes:
+            self.evict()
@@ -0,0 +1,131 @@
+"""
+Shared source model for the milestone tests
+===========================================
+
+Every milestone test inspects the same student file (main.py). Instead of
+reading and parsing it once per test, the file is loaded once and kept in a
+small cache: raw text, AST, token stream and an index of AST nodes by type.
+
+The cache is validated against the file's mtime/size, then against a hash of
+its content, so reruns in watch mode always see the current file.
+"""
+
+import ast
+import hashlib
+import io
+import tokenize
+from pathlib import Path
+
+
+# ---------------------------------------------------------------------------
+# Helper: Get repository root
+# ---------------------------------------------------------------------------
+def get_repo_root():
+    """Find the repository root by looking for .github folder."""
+    current = Path(__file__).parent.parent
+    if (current / ".github").exists():
+        return current
+    return current
+
+
+REPO_ROOT = get_repo_root()
+
+
+# ---------------------------------------------------------------------------
+# Source Model
+# ---------------------------------------------------------------------------
+class SourceModel:
+    """Parsed view of one Python source file, built once and shared."""
+
+    def __init__(self, path, text=None, digest=None):
+        self.path = Path(path)
+        self.text = text
+        self.digest = digest
+        self.tree = None
+        self.syntax_error = None
+        self._tokens = None
+        self._index = None
+        self._facts = None
+
+        if text is not None:
+            try:
+                self.tree = ast.parse(text)
+            except SyntaxError as e:
+                self.syntax_error = e
+
+    @property
+    def exists(self):
+        return self.text is not None
+
+    @property
+    def tokens(self):
+        """Token stream of the file (empty if it cannot be tokenized)."""
+        if self._tokens is None:
+            self._tokens = []
+            if self.text is not None:
+                try:
+                    reader = io.StringIO(self.text).readline
+                    self._tokens = list(tokenize.generate_tokens(reader))
+                except (tokenize.TokenError, SyntaxError):
+                    pass
+        return self._tokens
+
+    def nodes(self, node_type):
+        """Return every AST node of the given type, in walk order."""
+        if self._index is None:
+            self._index = {}
+            if self.tree is not None:
+                for node in ast.walk(self.tree):
+                    self._index.setdefault(type(node), []).append(node)
+        return self._index.get(node_type, [])
+
+
+# ---------------------------------------------------------------------------
+# Cache
+# ---------------------------------------------------------------------------
+_CACHE = {}
+
+
+def load_source(path):
+    """
+    Return the SourceModel for path, reusing the cached one when possible.
+
+    The entry is reused as-is when mtime and size are unchanged. When they
+    differ, the content hash decides whether the file really changed.
+    """
+    path = Path(path).resolve()
+
+    try:
+        stat = path.stat()
+    except OSError:
+        _CACHE.pop(path, None)
+        return SourceModel(path)
+
+    signature = (stat.st_mtime_ns, stat.st_size)
+    cached = _CACHE.get(path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    data = path.read_bytes()
+    digest = hashlib.sha256(data).hexdigest()
+    if cached is not None and cached[1].digest == digest:
+        model = cached[1]
+    else:
+        model = _build(path, data, digest)
+
+    _CACHE[path] = (signature, model)
+    return model
+
+
+def read_source(path):
+    """Build a SourceModel for path without keeping it in the cache."""
+    path = Path(path).resolve()
+    try:
+        data = path.read_bytes()
+    except OSError:
+        return SourceModel(path)
+    return _build(path, data, hashlib.sha256(data).hexdigest())
+
+
+def _build(path, data, digest):
+    return SourceModel(path, data.decode("utf-8", errors="replace"), digest)
@@ -0,0 +1,169 @@
+"""
+tests.analyzer (analyze, require_facts)
+
+Each case pairs code that must produce a fact with comments or strings
+that mention the same thing and must not.
+"""
+
+import textwrap
+
+import pytest
+
+from .analyzer import analyze, require_facts
+from .source_model import SourceModel
+
+
+def facts_of(text):
+    return analyze(SourceModel("main.py", textwrap.dedent(text)))
+
+
+# Everything a milestone looks for, only in comments and strings.
+MENTIONS = '''
+"""
+import time, digitalio
+if __name__ == "__main__": main()
+"""
+# import time
+# from time import monotonic
+# now = time.monotonic()
+# while True:
+#     if now - last >= INTERVAL: break
+# try: ... except KeyboardInterrupt: ...
+# button.value
+HELP = "time.monotonic() and button.value; press to break; except KeyboardInterrupt"
+
+def show():
+    print("while True: if time.monotonic() - previous >= INTERVAL: break")
+'''
+
+
+# ---------------------------------------------------------------------------
+# Comments and strings
+# ---------------------------------------------------------------------------
+def test_comments_and_strings_are_not_code():
+    facts = facts_of(MENTIONS)
+    assert facts.imports == set()
+    assert not facts.imports_module("time")
+    assert not facts.imports_module("digitalio")
+    assert not facts.has_main_guard
+    assert facts.monotonic_calls == []
+    assert facts.interval_comparisons == []
+    assert facts.breaks == []
+    assert facts.tries == [] and facts.except_handlers == []
+    assert facts.value_reads == []
+    assert not facts.references("KeyboardInterrupt")
+    assert facts.constants == ["HELP"]
+    assert facts.functions == ["show"]
+
+
+def test_the_same_checks_find_real_code():
+    facts = facts_of('''
+        import time
+        import digitalio
+
+        INTERVAL = 2.0
+
+        def main():
+            previous = time.monotonic()
+            try:
+                while True:
+                    now = time.monotonic()
+                    if now - previous >= INTERVAL:
+                        previous = now
+                    if not button.value:
+                        break
+            except KeyboardInterrupt:
+                pass
+
+        if __name__ == "__main__":
+            main()
+    ''')
+    assert facts.imports_module("time") and facts.imports_module("digitalio")
+    assert facts.has_main_guard
+    assert len(facts.monotonic_calls) == 2
+    assert facts.interval_comparisons == [12]
+    assert facts.breaks == [15]
+    assert facts.except_handlers == ["KeyboardInterrupt"]
+    assert facts.value_reads == [("button", 14)]
+    assert facts.constants == ["INTERVAL"]
+    assert facts.functions == ["main"]
+
+
+def test_code_next_to_a_comment_is_still_code():
+    facts = facts_of('''
+        import time
+        label = "no timer here"; start = time.monotonic()  # time.monotonic()
+    ''')
+    assert facts.monotonic_calls == [3]
+
+
+# ---------------------------------------------------------------------------
+# Names
+# ---------------------------------------------------------------------------
+def test_aliases_resolve_to_the_imported_name():
+    facts = facts_of('''
+        from time import monotonic as now
+        import time as t
+        a = now()
+        b = t.monotonic_ns()
+    ''')
+    assert facts.monotonic_calls == [4, 5]
+
+
+def test_async_and_nested_functions_are_recorded():
+    facts = facts_of('''
+        async def poll_button():
+            LOCAL = 1
+        def main():
+            def helper():
+                pass
+    ''')
+    assert facts.functions == ["poll_button", "main", "helper"]
+    assert facts.constants == []  # LOCAL is not module-level
+
+
+def test_breaks_in_for_and_while_loops():
+    facts = facts_of('''
+        for pin in pins:
+            break
+        while True:
+            break
+    ''')
+    assert facts.breaks == [3, 5]
+
+
+def test_nested_try_statements_keep_their_depth():
+    facts = facts_of('''
+        try:
+            try:
+                read()
+            except (OSError, RuntimeError):
+                pass
+        except KeyboardInterrupt:
+            pass
+        finally:
+            cleanup()
+    ''')
+    assert [(t.lineno, t.depth, t.has_finally) for t in facts.tries] == [
+        (2, 0, True), (3, 1, False),
+    ]
+    assert facts.except_handlers == ["KeyboardInterrupt", "OSError", "RuntimeError"]
+
+
+# ---------------------------------------------------------------------------
+# require_facts
+# ---------------------------------------------------------------------------
+def test_missing_main_skips():
+    with pytest.raises(pytest.skip.Exception):
+        require_facts(SourceModel("main.py"))
+
+
+def test_syntax_error_fails_instead_of_skipping():
+    with pytest.raises(pytest.fail.Exception) as excinfo:
+        require_facts(SourceModel("main.py", "while True\n    pass\n"))
+    assert "SyntaxError on line 1" in str(excinfo.value.msg)
+
+
+def test_facts_are_computed_once_per_source():
+    source = SourceModel("main.py", "import time\n")
+    assert require_facts(source) is require_facts(source)
@@ -0,0 +1,129 @@
+"""
+tests.grading (run_test, grade_submission, grade_all)
+
+Submissions are variants of loopkit/reference.py, a known full-marks
+main.py, written to temporary checkouts.
+"""
+
+import pytest
+
+from .grading import MILESTONES, grade_all, grade_submission, make_record, run_test
+from .result_cache import ResultCache
+from .source_model import REPO_ROOT
+
+
+REFERENCE = (REPO_ROOT / "loopkit" / "reference.py").read_text()
+
+
+def submission(tmp_path, name, text=None):
+    root = tmp_path / name
+    root.mkdir()
+    if text is not None:
+        (root / "main.py").write_text(text)
+    return root
+
+
+def outcomes(record, number):
+    milestone = record["milestones"][number - 1]
+    return {t["name"]: t["outcome"] for t in milestone["tests"]}
+
+
+# ---------------------------------------------------------------------------
+# One test
+# ---------------------------------------------------------------------------
+def test_passed():
+    def test_ok(source):
+        assert source == "main"
+    assert run_test(test_ok, "main") == ("passed", "")
+
+
+def test_skipped():
+    def test_skip(source):
+        pytest.skip("  not applicable  ")
+    assert run_test(test_skip, "main") == ("skipped", "not applicable")
+
+
+def test_failed_by_pytest_fail_or_assert():
+    def test_fail(source):
+        pytest.fail("expected X, found Y")
+
+    def test_assert(source):
+        assert False, "expected X"
+    assert run_test(test_fail, "main") == ("failed", "expected X, found Y")
+    outcome, message = run_test(test_assert, "main")
+    assert outcome == "failed" and message.startswith("expected X")
+
+
+def test_other_exceptions_are_errors():
+    def test_crash(source):
+        raise KeyError("line")
+    assert run_test(test_crash, "main") == ("error", "KeyError: 'line'")
+
+
+def test_unknown_fixture_is_an_error():
+    def test_needs_tmp(tmp_path):
+        pass
+    outcome, message = run_test(test_needs_tmp, "main")
+    assert outcome == "error" and "tmp_path" in message
+
+
+# ---------------------------------------------------------------------------
+# Points per milestone
+# ---------------------------------------------------------------------------
+def test_reference_earns_full_marks(tmp_path):
+    record = grade_submission(submission(tmp_path, "alice", REFERENCE))
+    assert (record["submission"], record["total"], record["max"]) == ("alice", 100, 100)
+    assert [m["earned"] for m in record["milestones"]] == [m.points for m in MILESTONES]
+    assert all(o == "passed" for m in (1, 2, 3) for o in outcomes(record, m).values())
+
+
+def test_one_failed_test_costs_its_milestone(tmp_path):
+    text = REFERENCE.replace("time.monotonic()", "time.time()")
+    record = grade_submission(submission(tmp_path, "bob", text))
+    assert [m["passed"] for m in record["milestones"]] == [True, False, True]
+    assert record["total"] == 25 + 40
+    assert outcomes(record, 2)["test_time_monotonic_usage"] == "failed"
+    assert outcomes(record, 2)["test_time_import"] == "passed"
+
+
+def test_missing_main_fails_milestone_1(tmp_path):
+    record = grade_submission(submission(tmp_path, "carol"))
+    assert record["milestones"][0]["earned"] == 0
+    assert outcomes(record, 1)["test_main_script_exists"] == "failed"
+    # As with the original per-file checks, the other tests skip.
+    assert set(outcomes(record, 3).values()) == {"skipped"}
+
+
+def test_syntax_error_fails_every_milestone(tmp_path):
+    record = grade_submission(submission(tmp_path, "erin", REFERENCE + "\ndef broken(:\n"))
+    assert record["total"] == 0
+    assert outcomes(record, 1)["test_main_script_syntax"] == "failed"
+    assert set(outcomes(record, 2).values()) == {"failed"}
+    assert set(outcomes(record, 3).values()) == {"failed"}
+
+
+def test_make_record_sums_the_earned_points(tmp_path):
+    milestones = [{"earned": 25}, {"earned": 0}, {"earned": 40}]
+    record = make_record(tmp_path / "dave", milestones)
+    assert (record["submission"], record["total"], record["max"]) == ("dave", 65, 100)
+
+
+# ---------------------------------------------------------------------------
+# Batch and cache
+# ---------------------------------------------------------------------------
+def test_grade_all_keeps_the_order_and_caches_by_content(tmp_path):
+    roots = [
+        submission(tmp_path, "a", REFERENCE),
+        submission(tmp_path, "b"),
+        submission(tmp_path, "c", REFERENCE),
+    ]
+    cache = ResultCache(tmp_path / "cache")
+    records = list(grade_all(roots, jobs=1, cache=cache))
+    assert [(r["submission"], r["milestones"][0]["passed"]) for r in records] == [
+        ("a", True), ("b", False), ("c", True),
+    ]
+    assert records[0]["total"] == records[2]["total"] == 100
+
+    again = list(grade_all(roots, jobs=1, cache=cache))
+    assert again[0] == records[0] and again[2] == records[2]
+    assert cache.hits == 2  # a and c; b has no main.py and is never cached
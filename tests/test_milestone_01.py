@@ -7,36 +7,16 @@ This milestone verifies that the student has:
 2. Used proper Python structure (functions + main guard)
 3. Defined configuration constants
 
-These tests analyze code structure via AST/regex.
-Tests analyze code structure via AST/regex, not execution.
+These tests analyze code structure via the AST fact sheet, not execution.
 """
 
-import os
-import ast
-import re
-from pathlib import Path
-
 import pytest
 
 
-# ---------------------------------------------------------------------------
-# Helper: Get repository root
-# ---------------------------------------------------------------------------
-def get_repo_root():
-    """Find the repository root by looking for .github folder."""
-    current = Path(__file__).parent.parent
-    if (current / ".github").exists():
-        return current
-    return current
-
-
-REPO_ROOT = get_repo_root()
-
-
 # ---------------------------------------------------------------------------
 # Test 1.1: Script Exists (5 points)
 # ---------------------------------------------------------------------------
-def test_main_script_exists():
+def test_main_script_exists(source):
     """
     Verify that main.py exists in the repository.
 
@@ -45,12 +25,10 @@ def test_main_script_exists():
     Suggestion: Create a file named main.py at the repository root.
     This will be your main program with timer and button polling.
     """
-    script_path = REPO_ROOT / "main.py"
-
-    assert script_path.exists(), (
+    assert source.exists, (
         f"\n\n"
         f"Expected: main.py file in repository root\n"
-        f"Actual: File not found at {script_path}\n\n"
+        f"Actual: File not found at {source.path}\n\n"
         f"Suggestion: Create main.py with your timer and button polling code.\n"
     )
 
@@ -58,7 +36,7 @@ def test_main_script_exists():
 # ---------------------------------------------------------------------------
 # Test 1.2: Script Has Valid Python Syntax (5 points)
 # ---------------------------------------------------------------------------
-def test_main_script_syntax():
+def test_main_script_syntax(source):
     """
     Verify that main.py has valid Python syntax.
 
@@ -66,16 +44,11 @@ def test_main_script_syntax():
 
     Suggestion: Run 'python3 -m py_compile main.py' locally to find errors.
     """
-    script_path = REPO_ROOT / "main.py"
-
-    if not script_path.exists():
+    if not source.exists:
         pytest.skip("main.py not found - skipping syntax check")
 
-    content = script_path.read_text()
-
-    try:
-        ast.parse(content)
-    except SyntaxError as e:
+    e = source.syntax_error
+    if e is not None:
         pytest.fail(
             f"\n\n"
             f"Expected: Valid Python syntax\n"
@@ -88,7 +61,7 @@ def test_main_script_syntax():
 # ---------------------------------------------------------------------------
 # Test 1.3: Main Guard Present (5 points)
 # ---------------------------------------------------------------------------
-def test_main_guard():
+def test_main_guard(facts):
     """
     Verify that the script has the __name__ == "__main__" guard.
 
@@ -98,14 +71,7 @@ def test_main_guard():
         if __name__ == "__main__":
             main()
     """
-    script_path = REPO_ROOT / "main.py"
-
-    if not script_path.exists():
-        pytest.skip("main.py not found")
-
-    content = script_path.read_text()
-
-    has_guard = '__name__' in content and '__main__' in content
+    has_guard = facts.has_main_guard
 
     if not has_guard:
         pytest.fail(
@@ -127,7 +93,7 @@ def test_main_guard():
 # ---------------------------------------------------------------------------
 # Test 1.4: Function Definitions Present (5 points)
 # ---------------------------------------------------------------------------
-def test_function_definitions():
+def test_function_definitions(facts):
     """
     Verify that the script has function definitions.
 
@@ -140,41 +106,28 @@ def test_function_definitions():
         def publish_data(data):
             # Publishing logic
     """
-    script_path = REPO_ROOT / "main.py"
-
-    if not script_path.exists():
-        pytest.skip("main.py not found")
-
-    content = script_path.read_text()
-
-    # Parse AST to count function definitions
-    try:
-        tree = ast.parse(content)
-        func_defs = [node for node in ast.walk(tree) if isinstance(node, ast.FunctionDef)]
-        func_names = [f.name for f in func_defs]
-
-        if len(func_defs) < 2:
-            pytest.fail(
-                f"\n\n"
-                f"Expected: At least 2 function definitions\n"
-                f"Actual: Found {len(func_defs)} function(s): {func_names}\n\n"
-                f"Suggestion: Organize your code with functions:\n"
-                f"  def read_sensor(sensor):\n"
-                f"      \"\"\"Read data from sensor.\"\"\"\n"
-                f"      ...\n"
-                f"\n"
-                f"  def publish_data(client, data):\n"
-                f"      \"\"\"Publish data to MQTT.\"\"\"\n"
-                f"      ...\n"
-            )
-    except SyntaxError:
-        pytest.skip("Syntax error - cannot parse AST")
+    func_names = facts.functions
+
+    if len(func_names) < 2:
+        pytest.fail(
+            f"\n\n"
+            f"Expected: At least 2 function definitions\n"
+            f"Actual: Found {len(func_names)} function(s): {func_names}\n\n"
+            f"Suggestion: Organize your code with functions:\n"
+            f"  def read_sensor(sensor):\n"
+            f"      \"\"\"Read data from sensor.\"\"\"\n"
+            f"      ...\n"
+            f"\n"
+            f"  def publish_data(client, data):\n"
+            f"      \"\"\"Publish data to MQTT.\"\"\"\n"
+            f"      ...\n"
+        )
 
 
 # ---------------------------------------------------------------------------
 # Test 1.5: Config Constants Present (5 points)
 # ---------------------------------------------------------------------------
-def test_config_constants():
+def test_config_constants(facts):
     """
     Verify that configuration constants are defined at module level.
 
@@ -183,20 +136,8 @@ def test_config_constants():
     Suggestion: Define constants at the top of your script:
         SENSOR_INTERVAL = 5  # seconds between readings
     """
-    script_path = REPO_ROOT / "main.py"
-
-    if not script_path.exists():
-        pytest.skip("main.py not found")
-
-    content = script_path.read_text()
-
-    # Look for UPPERCASE constants
-    has_constants = any([
-        re.search(r'^[A-Z][A-Z_0-9]+\s*=', content, re.MULTILINE),
-        "INTERVAL" in content,
-        "SENSOR" in content and "=" in content,
-        "GPIO" in content and "=" in content,
-    ])
+    # Look for UPPERCASE constants assigned at module level
+    has_constants = bool(facts.constants)
 
     if not has_constants:
         pytest.fail(
@@ -11,32 +11,13 @@ This milestone verifies that the student has:
 IMPORTANT: We test code STRUCTURE, not execution.
 """
 
-import os
-import ast
-import re
-from pathlib import Path
-
 import pytest
 
 
-# ---------------------------------------------------------------------------
-# Helper: Get repository root
-# ---------------------------------------------------------------------------
-def get_repo_root():
-    """Find the repository root by looking for .github folder."""
-    current = Path(__file__).parent.parent
-    if (current / ".github").exists():
-        return current
-    return current
-
-
-REPO_ROOT = get_repo_root()
-
-
 # ---------------------------------------------------------------------------
 # Test 2.1: time Import (10 points)
 # ---------------------------------------------------------------------------
-def test_time_import():
+def test_time_import(facts):
     """
     Verify that the script imports the time module.
 
@@ -45,17 +26,7 @@ def test_time_import():
     Suggestion: Add at the top of your script:
         import time
     """
-    script_path = REPO_ROOT / "main.py"
-
-    if not script_path.exists():
-        pytest.skip("main.py not found")
-
-    content = script_path.read_text()
-
-    has_time = any([
-        "import time" in content,
-        "from time import" in content,
-    ])
+    has_time = facts.imports_module("time")
 
     if not has_time:
         pytest.fail(
@@ -74,7 +45,7 @@ def test_time_import():
 # ---------------------------------------------------------------------------
 # Test 2.2: time.monotonic Usage (10 points)
 # ---------------------------------------------------------------------------
-def test_time_monotonic_usage():
+def test_time_monotonic_usage(facts):
     """
     Verify that the script uses time.monotonic().
 
@@ -89,14 +60,7 @@ def test_time_monotonic_usage():
                 previous_time = current_time
             time.sleep(0.05)
     """
-    script_path = REPO_ROOT / "main.py"
-
-    if not script_path.exists():
-        pytest.skip("main.py not found")
-
-    content = script_path.read_text()
-
-    has_monotonic = "time.monotonic" in content or "monotonic()" in content
+    has_monotonic = bool(facts.monotonic_calls)
 
     if not has_monotonic:
         pytest.fail(
@@ -118,7 +82,7 @@ def test_time_monotonic_usage():
 # ---------------------------------------------------------------------------
 # Test 2.3: Timer-in-Loop Pattern (7 points)
 # ---------------------------------------------------------------------------
-def test_timer_in_loop_pattern():
+def test_timer_in_loop_pattern(facts):
     """
     Verify that the timer-in-loop pattern is used.
 
@@ -129,25 +93,15 @@ def test_timer_in_loop_pattern():
             # Action a executer periodiquement
             previous_time = current_time
     """
-    script_path = REPO_ROOT / "main.py"
-
-    if not script_path.exists():
-        pytest.skip("main.py not found")
-
-    content = script_path.read_text()
-
-    has_monotonic = "time.monotonic" in content or "monotonic()" in content
+    has_monotonic = bool(facts.monotonic_calls)
 
     # Check for interval comparison patterns
     has_interval_check = any([
-        # Subtraction pattern: current - previous >= INTERVAL
-        re.search(r'\w+\s*-\s*\w+\s*>=\s*\w+', content),
-        # Subtraction pattern: current - previous > INTERVAL
-        re.search(r'\w+\s*-\s*\w+\s*>\s*\w+', content),
+        # Comparison in a while loop: current - previous >= INTERVAL,
+        # or elapsed >= INTERVAL with elapsed = current - previous
+        facts.interval_comparisons,
         # INTERVAL constant defined
-        re.search(r'INTERVAL\s*=', content, re.IGNORECASE),
-        # Common pattern: elapsed = current - previous
-        re.search(r'elapsed\s*=\s*\w+\s*-\s*\w+', content, re.IGNORECASE),
+        any("INTERVAL" in name.upper() for name in facts.assigned_names),
     ])
 
     if not has_monotonic:
@@ -186,7 +140,7 @@ def test_timer_in_loop_pattern():
 # ---------------------------------------------------------------------------
 # Test 2.4: No threading.Thread (8 points)
 # ---------------------------------------------------------------------------
-def test_no_threading():
+def test_no_threading(facts):
     """
     Verify that the student does NOT use threading.Thread or queue.Queue.
 
@@ -195,22 +149,9 @@ def test_no_threading():
 
     Expected: No threading or queue imports
     """
-    script_path = REPO_ROOT / "main.py"
+    has_threading = facts.imports_module("threading")
 
-    if not script_path.exists():
-        pytest.skip("main.py not found")
-
-    content = script_path.read_text()
-
-    has_threading = any([
-        "import threading" in content,
-        "from threading import" in content,
-    ])
-
-    has_queue = any([
-        "import queue" in content,
-        "from queue import" in content,
-    ])
+    has_queue = facts.imports_module("queue")
 
     if has_threading:
         pytest.fail(
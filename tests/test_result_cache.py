@@ -0,0 +1,50 @@
+"""
+tests.result_cache (ResultCache)
+"""
+
+from .result_cache import MARKER, ResultCache
+
+
+V1 = "0123456789abcdef"
+V2 = "fedcba9876543210"
+
+
+def test_get_returns_what_put_stored(tmp_path):
+    cache = ResultCache(tmp_path, version=V1)
+    assert cache.get("a" * 64) is None
+    cache.put("a" * 64, [{"number": 1, "passed": True}])
+    assert cache.get("a" * 64) == [{"number": 1, "passed": True}]
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_new_version_prunes_the_old_one(tmp_path):
+    ResultCache(tmp_path, version=V1).put("a" * 64, [])
+    ResultCache(tmp_path, version=V2)
+    assert sorted(p.name for p in tmp_path.iterdir()) == [V2]
+
+
+def test_foreign_directories_survive_prune_and_clear(tmp_path):
+    (tmp_path / "notes").mkdir()
+    (tmp_path / "notes" / "todo.txt").write_text("keep me")
+    unmarked = tmp_path / "aaaaaaaaaaaaaaaa"  # version-like name, no marker
+    unmarked.mkdir()
+    (tmp_path / "README").write_text("keep me too")
+
+    ResultCache(tmp_path, version=V1).put("a" * 64, [])
+    cache = ResultCache(tmp_path, version=V2)
+    cache.clear()
+
+    assert (tmp_path / "notes" / "todo.txt").read_text() == "keep me"
+    assert unmarked.is_dir()
+    assert (tmp_path / "README").exists()
+    assert not (tmp_path / V1).exists()
+    assert (tmp_path / V2 / MARKER).is_file()
+    assert cache.get("a" * 64) is None
+
+
+def test_eviction_keeps_the_entry_bound(tmp_path):
+    cache = ResultCache(tmp_path, version=V1, max_entries=3)
+    for i in range(5):
+        cache.put(f"{i:064x}", [i])
+    assert cache._usage()[0] == 3
+    assert cache.get(f"{4:064x}") == [4]
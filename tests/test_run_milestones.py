@@ -0,0 +1,139 @@
+"""
+tests.run_milestones (MilestoneReport, exit status)
+
+The plugin runs in a nested pytest session over small stand-in milestone
+modules, so each per-test outcome is known in advance.
+"""
+
+import json
+
+import pytest
+
+from . import run_milestones
+from .grading import MILESTONES
+from .run_milestones import MilestoneReport, exit_status, markdown_summary
+
+
+MODULES = {
+    "test_milestone_01": """
+def test_ok():
+    pass
+
+def test_also_ok():
+    pass
+""",
+    "test_milestone_02": """
+import pytest
+
+def test_ok():
+    pass
+
+def test_wrong():
+    assert False, "expected a timer"
+
+def test_not_applicable():
+    pytest.skip("no loop found")
+""",
+    "test_milestone_03": """
+import pytest
+
+@pytest.fixture
+def broken():
+    raise RuntimeError("fixture failed")
+
+def test_skipped():
+    pytest.skip("optional")
+
+def test_setup_error(broken):
+    pass
+""",
+}
+
+
+def collect(tmp_path, modules):
+    for name, text in modules.items():
+        (tmp_path / f"{name}.py").write_text(text)
+    report = MilestoneReport()
+    pytest.main([str(tmp_path), "-q", "-p", "no:cacheprovider", "--import-mode=importlib",
+                 "--rootdir", str(tmp_path)], plugins=[report])
+    return {m["number"]: m for m in report.milestones()}
+
+
+def record(*passed):
+    return {"milestones": [
+        {"number": m.number, "title": m.title, "points": m.points,
+         "earned": m.points if ok else 0, "passed": ok, "tests": []}
+        for m, ok in zip(MILESTONES, passed)
+    ]}
+
+
+# ---------------------------------------------------------------------------
+# Per-test outcomes to milestone points
+# ---------------------------------------------------------------------------
+def test_outcomes_are_grouped_by_milestone(tmp_path):
+    milestones = collect(tmp_path, MODULES)
+
+    first = milestones[1]
+    assert [t["outcome"] for t in first["tests"]] == ["passed", "passed"]
+    assert (first["passed"], first["earned"], first["points"]) == (True, 25, 25)
+
+    second = milestones[2]
+    outcomes = {t["name"]: (t["outcome"], t["message"]) for t in second["tests"]}
+    assert outcomes["test_ok"] == ("passed", "")
+    assert outcomes["test_wrong"][0] == "failed"
+    assert "expected a timer" in outcomes["test_wrong"][1]
+    assert outcomes["test_not_applicable"] == ("skipped", "no loop found")
+    assert (second["passed"], second["earned"]) == (False, 0)
+
+    third = milestones[3]
+    outcomes = {t["name"]: t["outcome"] for t in third["tests"]}
+    assert outcomes == {"test_skipped": "skipped", "test_setup_error": "error"}
+    assert (third["passed"], third["earned"]) == (False, 0)
+
+
+def test_skipped_tests_do_not_cost_points(tmp_path):
+    milestones = collect(tmp_path, {"test_milestone_01": "import pytest\n"
+                                                         "def test_a():\n"
+                                                         "    pytest.skip('n/a')\n"})
+    assert (milestones[1]["passed"], milestones[1]["earned"]) == (True, 25)
+
+
+def test_a_milestone_without_tests_earns_nothing(tmp_path):
+    milestones = collect(tmp_path, {"test_milestone_01": "def test_a():\n    pass\n"})
+    assert milestones[1]["earned"] == 25
+    assert milestones[2]["tests"] == [] and milestones[2]["earned"] == 0
+
+
+def test_other_modules_are_ignored(tmp_path):
+    milestones = collect(tmp_path, {"test_helpers": "def test_a():\n    assert False\n"})
+    assert all(m["tests"] == [] for m in milestones.values())
+
+
+# ---------------------------------------------------------------------------
+# Job outcome
+# ---------------------------------------------------------------------------
+@pytest.mark.parametrize("passed, status", [
+    ((True, True, True), 0),
+    ((False, True, True), 0),
+    ((True, False, True), 0),
+    ((False, False, True), 0),
+    ((True, True, False), 1),
+    ((False, False, False), 1),
+])
+def test_only_milestone_3_fails_the_job(passed, status):
+    assert exit_status(record(*passed)) == status
+
+
+def test_main_writes_the_reports_and_returns_the_gating_status(tmp_path, monkeypatch):
+    monkeypatch.setattr(run_milestones, "run", lambda extra: record(False, True, True))
+    output = tmp_path / "milestones.json"
+    summary = tmp_path / "summary.md"
+    assert run_milestones.main(["--json", str(output), "--summary", str(summary)]) == 0
+    assert [m["passed"] for m in json.loads(output.read_text())["milestones"]] == [
+        False, True, True,
+    ]
+    assert summary.read_text() == markdown_summary(record(False, True, True))
+    assert "| 1. Code Structure | 25 | FAIL |" in summary.read_text()
+
+    monkeypatch.setattr(run_milestones, "run", lambda extra: record(True, True, False))
+    assert run_milestones.main(["--summary", ""]) == 1
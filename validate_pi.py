@@ -15,6 +15,9 @@ It creates marker files that GitHub Actions will verify.
 
 Usage:
     python3 validate_pi.py
+    python3 validate_pi.py --edge   # wait for the button on the GPIO edge
+    python3 validate_pi.py --startup-report   # slowest imports of board/digitalio
+    python3 validate_pi.py --log-format json  # JSON lines instead of colored text
 
 The script will:
 1. Verify digitalio (adafruit-blinka) is installed
@@ -22,15 +25,19 @@ The script will:
 3. Verify your main.py script (timer pattern)
 4. Create marker files for GitHub Actions
 
+Blinka's platform detection result is cached
+(~/.cache/loopkit/platform.json), so later runs import board faster.
+
 After running successfully, commit and push the .test_markers/ folder.
 """
 
-import os
+import argparse
 import sys
-import time
 from pathlib import Path
 from datetime import datetime
 
+from loopkit.log import FAIL, INFO, PASS, WARN, Logger
+
 
 # ---------------------------------------------------------------------------
 # Terminal Colors
@@ -44,23 +51,51 @@ class Colors:
     END = '\033[0m'
 
 
+# [PASS]/[FAIL]/[WARN]/[INFO] lines; --log-format json switches to JSON lines.
+log = Logger(color=True)
+
+
 def success(msg):
-    print(f"{Colors.GREEN}[PASS] {msg}{Colors.END}")
+    log.write(PASS, msg)
 
 
 def fail(msg):
-    print(f"{Colors.RED}[FAIL] {msg}{Colors.END}")
+    log.write(FAIL, msg)
 
 
 def warn(msg):
-    print(f"{Colors.YELLOW}[WARN] {msg}{Colors.END}")
+    log.write(WARN, msg)
 
 
 def info(msg):
-    print(f"{Colors.BLUE}[INFO] {msg}{Colors.END}")
+    log.write(INFO, msg)
+
+
+def detail(*lines):
+    """Indented hint lines under a result (INFO records in JSON mode)."""
+    for line in lines:
+        if log.format == "json":
+            if line.strip():
+                log.write(INFO, line.strip())
+        else:
+            print(line)
+
+
+def banner(level, color, msg):
+    if log.format == "json":
+        log.write(level, msg)
+        return
+    print(f"{color}{Colors.BOLD}")
+    print("=" * 60)
+    print(f" {msg}")
+    print("=" * 60)
+    print(f"{Colors.END}")
 
 
 def header(msg):
+    if log.format == "json":
+        log.write(INFO, msg)
+        return
     print(f"\n{Colors.BOLD}{'='*60}")
     print(f" {msg}")
     print(f"{'='*60}{Colors.END}\n")
@@ -89,9 +124,16 @@ def check_digitalio():
     header("DIGITALIO VERIFICATION")
 
     try:
+        from loopkit.startup import apply_platform_cache, store_platform_cache
+
+        cached = apply_platform_cache()
         import board
         import digitalio
         success("digitalio imported successfully")
+        if cached:
+            info("Platform detection: cached result used")
+        elif store_platform_cache():
+            info("Platform detection: result cached for next runs")
 
         # GPIO smoke test: verify GPIO backend works (catches Pi 4 + rpi-lgpio)
         try:
@@ -100,54 +142,71 @@ def check_digitalio():
             success("GPIO backend working (smoke test D4)")
         except RuntimeError as e:
             warn(f"GPIO initialization failed - likely Raspberry Pi 4")
-            print(f"\n  Erreur: {e}")
-            print("  Sur Pi 4, remplacez \"rpi-lgpio\" par \"rpi.gpio\" :")
-            print("    pip install rpi.gpio")
-            print("  Puis relancez validate_pi.py")
+            detail(f"\n  Erreur: {e}",
+                   "  Sur Pi 4, remplacez \"rpi-lgpio\" par \"rpi.gpio\" :",
+                   "    pip install rpi.gpio",
+                   "  Puis relancez validate_pi.py")
             return False
 
         create_marker("digitalio_verified", "digitalio available")
         return True
     except ImportError as e:
         fail(f"digitalio import failed: {e}")
-        print("\n  Install with:")
-        print("    uv run validate_pi.py")
-        print("    # ou: pip install adafruit-blinka rpi-lgpio")
-        print("\n  Note: adafruit-blinka provides digitalio and board modules")
+        detail("\n  Install with:",
+               "    uv run validate_pi.py",
+               "    # ou: pip install adafruit-blinka rpi-lgpio",
+               "\n  Note: adafruit-blinka provides digitalio and board modules")
         return False
 
 
 # ---------------------------------------------------------------------------
 # Test: Button (Optional)
 # ---------------------------------------------------------------------------
-def check_button():
-    """Test button connection (optional)."""
+def check_button(edge=False):
+    """Test button connection (optional).
+
+    With edge=True, wait on the GPIO falling edge (libgpiod v2) and fall
+    back to digitalio polling when edge events are unavailable.
+    """
     header("BUTTON TEST (Optional)")
 
     try:
-        import board
-        import digitalio
+        from loopkit.edge import PollingWaiter, open_edge_waiter, wait_for_press
 
-        button = digitalio.DigitalInOut(board.D17)
-        button.direction = digitalio.Direction.INPUT
-        button.pull = digitalio.Pull.UP
+        button = None
+        waiter = open_edge_waiter(17) if edge else None
 
-        info("Button initialized on GPIO 17 (digitalio polling)")
-        info("Press the button within 5 seconds to test...")
+        if waiter is not None:
+            info("Button initialized on GPIO 17 (edge detection)")
+        else:
+            if edge:
+                warn("GPIO edge events unavailable - using digitalio polling")
+
+            import board
+            import digitalio
 
-        pressed = False
-        start_time = time.time()
+            button = digitalio.DigitalInOut(board.D17)
+            button.direction = digitalio.Direction.INPUT
+            button.pull = digitalio.Pull.UP
+
+            # Pull-up: False = appuye
+            waiter = PollingWaiter(lambda: button.value)
+            info("Button initialized on GPIO 17 (digitalio polling)")
+
+        info("Press the button within 5 seconds to test...")
 
         try:
-            while time.time() - start_time < 5 and not pressed:
-                if not button.value:  # Pull-up: False = appuye
-                    pressed = True
-                    success("Button press detected!")
-                time.sleep(0.05)
+            result = wait_for_press(waiter, 5)
         finally:
-            button.deinit()
+            waiter.close()
+            if button is not None:
+                button.deinit()
 
+        pressed = result.detected
         if pressed:
+            success("Button press detected!")
+            info(f"Button: {result.describe()}")
+
             create_marker("button_verified", "Button GPIO 17 working")
             return True
         else:
@@ -156,10 +215,10 @@ def check_button():
 
     except RuntimeError as e:
         warn(f"GPIO initialization failed - likely Raspberry Pi 4")
-        print(f"\n  Erreur: {e}")
-        print("  Sur Pi 4, remplacez \"rpi-lgpio\" par \"rpi.gpio\" :")
-        print("    pip install rpi.gpio")
-        print("  Puis relancez validate_pi.py")
+        detail(f"\n  Erreur: {e}",
+               "  Sur Pi 4, remplacez \"rpi-lgpio\" par \"rpi.gpio\" :",
+               "    pip install rpi.gpio",
+               "  Puis relancez validate_pi.py")
         return True  # Optional, don't fail
 
     except Exception as e:
@@ -179,7 +238,7 @@ def check_main_script():
 
     if not script_path.exists():
         fail("main.py not found")
-        print("\n  Create your main.py script in the same folder.")
+        detail("\n  Create your main.py script in the same folder.")
         return False
 
     success("main.py exists")
@@ -228,18 +287,64 @@ def check_main_script():
     return all_present
 
 
+# ---------------------------------------------------------------------------
+# Startup Report
+# ---------------------------------------------------------------------------
+def startup_report(modules=("board", "digitalio"), top=15):
+    """Print the slowest imports of modules (python -X importtime)."""
+    from loopkit.startup import apply_platform_cache, import_report, platform_cache_path
+
+    header("STARTUP REPORT")
+
+    if apply_platform_cache():
+        info(f"Platform detection cache used: {platform_cache_path()}")
+    else:
+        warn("No platform detection cache yet - run validate_pi.py once")
+
+    try:
+        total, rows = import_report(modules, top=top)
+    except ImportError as e:
+        fail(f"Import failed: {e}")
+        return 1
+
+    info(f"import {', '.join(modules)}: {total / 1000:.1f} ms")
+    detail(f"\n  {'cumulative':>12} {'self':>10}  module")
+    for cumulative, self_time, name in rows:
+        detail(f"  {cumulative / 1000:>10.1f}ms {self_time / 1000:>8.1f}ms  {name}")
+    detail("")
+    return 0
+
+
 # ---------------------------------------------------------------------------
 # Main
 # ---------------------------------------------------------------------------
-def main():
-    print(f"\n{Colors.BOLD}Formatif F4 - Local Hardware Validation{Colors.END}")
-    print(f"{'='*60}\n")
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Formatif F4 - Local Hardware Validation")
+    parser.add_argument("--edge", action="store_true",
+                        help="wait for the button on the GPIO falling edge (libgpiod v2)")
+    parser.add_argument("--startup-report", action="store_true",
+                        help="show the slowest imports of board/digitalio and exit")
+    parser.add_argument("--log-format", choices=("text", "json"), default="text",
+                        help="colored [PASS]/[FAIL] text (default) or JSON lines")
+    args = parser.parse_args(argv)
+    log.format = args.log_format
+    log.color = args.log_format == "text"
+
+    if args.startup_report:
+        return startup_report()
+
+    if log.format == "json":
+        log.write(INFO, "Formatif F4 - Local Hardware Validation")
+    else:
+        print(f"\n{Colors.BOLD}Formatif F4 - Local Hardware Validation{Colors.END}")
+        print(f"{'='*60}\n")
 
     results = {}
 
-    # Run all checks
+    # The script check only parses main.py (milliseconds): it runs after
+    # the button test rather than alongside it.
     results["digitalio"] = check_digitalio()
-    results["Button"] = check_button()
+    results["Button"] = check_button(edge=args.edge)
     results["Script"] = check_main_script()
 
     # Summary
@@ -255,28 +360,20 @@ def main():
         else:
             fail(f"{test}: FAILED")
 
-    print()
+    detail("")
 
     if all_required_passed:
-        print(f"{Colors.GREEN}{Colors.BOLD}")
-        print("=" * 60)
-        print(" ALL REQUIRED TESTS PASSED!")
-        print("=" * 60)
-        print(f"{Colors.END}")
+        banner(PASS, Colors.GREEN, "ALL REQUIRED TESTS PASSED!")
 
         create_marker("all_tests_passed", "All required validations completed")
 
-        print("\nNext steps:")
-        print("  git add .test_markers/")
-        print("  git commit -m \"feat: validation locale completee\"")
-        print("  git push")
+        detail("\nNext steps:",
+               "  git add .test_markers/",
+               "  git commit -m \"feat: validation locale completee\"",
+               "  git push")
         return 0
     else:
-        print(f"{Colors.RED}{Colors.BOLD}")
-        print("=" * 60)
-        print(" SOME TESTS FAILED - Fix issues and run again")
-        print("=" * 60)
-        print(f"{Colors.END}")
+        banner(FAIL, Colors.RED, "SOME TESTS FAILED - Fix issues and run again")
         return 1
 
 